@@ -3,8 +3,6 @@ import sys
 from asyncio import subprocess
 from datetime import time, datetime
 import os
-import markdown
-import ollama
 import json
 from PyQt6.QtWidgets import (
     QWidget,
@@ -26,51 +24,39 @@ from PyQt6.QtWidgets import (
     QMenu,
     QToolButton,
     QFileDialog,)
-from PyQt6.QtCore import QThread, pyqtSignal, QFileInfo, QTimer, Qt, pyqtSlot
-from typing import Dict, Generator
-from PyQt6.QtPrintSupport import QPrinter
+from PyQt6.QtCore import QFileInfo, QTimer, Qt, pyqtSlot
 from PyQt6.QtGui import QCloseEvent, QAction, QFont
-from textblob import TextBlob
-from textstat import textstat
 from QtOllama.ui.stats_dialog import HistoricalStatsDialog
-from QtOllama.ui.wordcloud_dialog import WordCloudDialog
 import QtOllama.utility.capabilities as capabilities
+from QtOllama.utility.capability_registry import get_registry
 from QtOllama.ui.frameless_window import FramelessWindow
 from QtOllama.utility.logger_setup import create_logger
 from QtOllama.utility.constants import CONTEXT_LENGTH_DEFAULT
+from QtOllama.utility.lazy_imports import LazyModule, Prewarmer, load
+from QtOllama.utility.async_engine import get_engine
+from QtOllama.utility.model_catalog import ModelCatalog
+from QtOllama.utility.conversation_engine import ConversationEngine
+from QtOllama.utility.context_window import ContextWindow, MESSAGE_TEMPLATE_TOKENS
+from QtOllama.utility.compaction import ConversationCompactor
+from QtOllama.utility.chat_statistics import ChatStatistics
+from QtOllama.utility.request_scheduler import get_scheduler, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from QtOllama.utility.response_cache import get_response_cache, set_model_digests
+from QtOllama.utility.request_metrics import get_metrics_store, format_metrics
 from QtOllama.utility.utils import handle_exception
 from QtOllama.ui.ui_components import UIComponents
 from QtOllama.ui.signal_connector import SignalConnector
 from QtOllama.ui.menu_creator import MenuCreator
 from QtOllama.ui.chat_tables import SavedChatsDialog
-from QtOllama.utility.stats import StatsDialog
+from QtOllama.ui.batch_analysis_dialog import BatchAnalysisDialog
+from QtOllama.ui.command_palette import CommandPalette
+from QtOllama.ui.stream_renderer import StreamRenderer, text_edit_sink
 # main_window.py
 from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
-
-def messages_to_prompt(messages):
-    """
-    Converts a list of message dictionaries into a single prompt string.
-
-    Args:
-        messages (list): A list of message dictionaries with 'role' and 'content' keys.
-
-    Returns:
-        str: A formatted prompt string for the Ollama API.
-    """
-    prompt = ""
-    for message in messages:
-        role = message["role"]
-        content = message["content"]
-        if role == "system":
-            prompt += content.strip() + "\n\n"
-        elif role == "user":
-            prompt += "User: " + content.strip() + "\n"
-        elif role == "assistant":
-            prompt += "Assistant: " + content.strip() + "\n"
-    prompt += "Assistant: "
-    return prompt
+# Heavy stacks load on first use or when pre-warmed; see lazy_imports
+markdown = LazyModule("markdown")
+text_analysis = LazyModule("QtOllama.utility.text_analysis")
 
 
 class MainWindow(FramelessWindow, QMainWindow):
@@ -88,13 +74,16 @@ class MainWindow(FramelessWindow, QMainWindow):
             self.progress_bar = None
             self.toolbar = None
             self.info_label = None
+            self.queue_label = None
+            self.metrics_label = None
             self.status_widget = None
             self.word_cloud_btn = None
             self.historical_stats_button = None
             self.stats_button = None
             self.stats_dialog = None
             self.assistant_response = ""
-            self.thread = None
+            self.active_request = None
+            self.sent_tokens = 0
             self.restart_button = None
             self.analytics_button = None
             self.stop_button = None
@@ -106,108 +95,49 @@ class MainWindow(FramelessWindow, QMainWindow):
             self.word_cloud_dialog = None
             self.historical_stats_dialog = None
             self.context_length_spinner = None
+            self.compaction_checkbox = None
+            self.command_palette_shortcut = None
+            self.command_palette = None
             self.selected_model = ""
             self.messages = []
+            # Indices of the user messages in self.messages that are analysis prompts
+            self.analysis_turns = set()
+            self.chat_statistics = ChatStatistics(self)
             self.context_length = CONTEXT_LENGTH_DEFAULT
+            self.context = ContextWindow(self.context_length)
+            self.conversation = ConversationEngine(options={"num_ctx": self.context_length})
+            self.compactor = ConversationCompactor(self.context)
+            self.compactor.compacted.connect(self.show_compaction)
+            self.chat_lane = f"main-chat-{id(self)}"
+            self.response_cache = get_response_cache()
+            self.cache_keys = {}
+            self.model_catalog = ModelCatalog()
 
             ui_components = UIComponents(self)
             ui_components.init_ui()
 
+            self.stream_renderer = StreamRenderer(text_edit_sink(self.chat_display), parent=self)
+            self.stream_renderer.rate_updated.connect(self.show_stream_rate)
+            get_engine().bridge.first_chunk.connect(self.show_first_token)
+            self.scheduler = get_scheduler()
+            self.scheduler.queue_changed.connect(self.show_queue_status)
+
             self.load_models()
 
-            # Initialize menus before creating MenuCreator
-            capabilities_instance = capabilities.Capabilities()
-            self.menus = {
-                "Analyze": {
-                    "Prose": {
-                        "Textual": capabilities_instance.get_prose_textual_analysis_types(),
-                        "Semantic": capabilities_instance.get_prose_semantic_analysis_types(),
-                        "Linguistic": capabilities_instance.get_prose_linguistic_analysis_types(),
-                        "Cognitive": capabilities_instance.get_prose_cognitive_analysis_types(),
-                        "Contextual": capabilities_instance.get_prose_contextual_analysis_types(),
-                        "Stylistic": capabilities_instance.get_prose_stylistic_analysis_types(),
-                        "Narrative": capabilities_instance.get_prose_narrative_analysis_types()
-                    },
-                    "Critical": capabilities_instance.get_critical_analysis_types(),
-                    "Psychoanalytical": capabilities_instance.get_psychoanalytical_analysis_types(),
-                    "Scientific": capabilities_instance.get_scientific_analysis_types(),
-                    "Philosophical": capabilities_instance.get_philosophical_analysis_types(),
-                    "Statistical": capabilities_instance.get_statistical_analysis_types(),
-                    "Opposition": capabilities_instance.get_opposition_analysis_types(),
-                    "Code": capabilities_instance.get_code_analysis_types(),
-                    "Prompt": capabilities_instance.get_prompt_analysis_types(),
-                    "Art Prompt": capabilities_instance.get_art_prompt_analysis_types(),
-                    "Poetry": capabilities_instance.get_poetry_analysis_types(),
-                },
-                "Generate": {
-                    "Prose": {
-                        "Textual": capabilities_instance.get_prose_textual_generation_types(),
-                        "Semantic": capabilities_instance.get_prose_semantic_generation_types(),
-                        "Cognitive": capabilities_instance.get_prose_cognitive_generation_types(),
-                        "Contextual": capabilities_instance.get_prose_contextual_generation_types(),
-                        "Stylistic": capabilities_instance.get_prose_stylistic_generation_types(),
-                        "Narrative": capabilities_instance.get_prose_narrative_generation_types(),
-                    },
-                    "Documentation": capabilities_instance.get_documentation_generation_types(),
-                    "Prompt": capabilities_instance.get_prompt_generation_types(),
-                    "Art Prompt": capabilities_instance.get_art_prompt_generation_types(),
-                    "Poetry": capabilities_instance.get_poetry_generation_types(),
-                    "Code": capabilities_instance.get_code_generation_types(),
-                },
-                "Transform": {
-                    "Prose": {
-                        "Textual": capabilities_instance.get_prose_textual_transformation_types(),
-                        "Semantic": capabilities_instance.get_prose_semantic_transformation_types(),
-                        "Cognitive": capabilities_instance.get_prose_cognitive_transformation_types(),
-                        "Contextual": capabilities_instance.get_prose_contextual_transformation_types(),
-                        "Stylistic": capabilities_instance.get_prose_stylistic_transformation_types(),
-                        "Narrative": capabilities_instance.get_prose_narrative_transformation_types(),
-                    },
-                    "Scaling": capabilities_instance.get_text_scaling_types(),
-                    "Enhancement": capabilities_instance.get_text_enhancement_types(),
-                    "Prompt": capabilities_instance.get_prompt_transformation_types(),
-                    "Art Prompt": capabilities_instance.get_art_prompt_transformation_types(),
-                    "Poetry": capabilities_instance.get_poetry_transformation_types(),
-                    "Code": capabilities_instance.get_code_transformation_types(),
-                },
-            }
+            # The capability taxonomy drives the menus
+            self.menus = get_registry().menu_tree()
 
-            menu_creator = MenuCreator(self)
-            menu_creator.create_menus()
+            self.menu_creator = MenuCreator(self)
+            self.menu_creator.create_menus()
 
             signal_connector = SignalConnector(self)
             signal_connector.connect_signals()
+
+            self.prewarmer = Prewarmer()
+            self.prewarmer.start()
         except Exception as e:
             logger.error(f"{e}")
     
-    class ResponseThread(QThread):
-        response_chunk_received = pyqtSignal(str)
-        response_finished = pyqtSignal(str)
-        error_occurred = pyqtSignal(str)
-        
-        def __init__(self,
-                     model_name,
-                     messages):
-            super().__init__()
-            self.model_name = model_name
-            self.messages = messages.copy()
-        
-        def run(self):
-            response = ""
-            try:
-                prompt = messages_to_prompt(self.messages)
-                logger.debug(f"Prompt sent to Ollama:\n{prompt}")
-                for chunk in ollama.generate(model=self.model_name, prompt=prompt):
-                    # Since chunk is a string, we can use it directly
-                    logger.debug(f"Chunk received: {chunk}")
-                    content = chunk  # chunk is a string
-                    response += content
-                    self.response_chunk_received.emit(content)
-                self.response_finished.emit(response)
-            except Exception as e:
-                logger.error(f"Error in response thread: {e}")
-                self.error_occurred.emit(str(e))
-                
     def connect_signals(self):
         try:
             # ///////////////////////////////////////////////////////////////////
@@ -233,7 +163,7 @@ class MainWindow(FramelessWindow, QMainWindow):
         """
         Starts the simulation by creating and displaying a SimulationDialog.
         """
-        from QtOllama.utility.simulation import SimulationDialog
+        SimulationDialog = load("QtOllama.utility.simulation").SimulationDialog
 
         # Pass the selected model to the SimulationDialog
         self.simulation_dialog = SimulationDialog(
@@ -302,6 +232,7 @@ class MainWindow(FramelessWindow, QMainWindow):
         and shows the dialog to the user.
         """
         try:
+            WordCloudDialog = load("QtOllama.ui.wordcloud_dialog").WordCloudDialog
             self.word_cloud_dialog = WordCloudDialog(self.chat_display, self)
             self.word_cloud_dialog.show()
         except Exception as e:
@@ -328,27 +259,64 @@ class MainWindow(FramelessWindow, QMainWindow):
     # /////////////////////////////////////////////////////////////////////////////////////
     def load_models(self):
         """
-        Loads available models from the Ollama API and populates the model combo box.
+        Fills the model combo box from the model catalog and refreshes it in the background.
 
-        This method retrieves a list of models from the Ollama API, extracts their names,
-        and adds them to the model combo box. If models are successfully loaded, the first
-        model is selected by default, and a signal is connected to handle model changes.
-        Logs the loaded model names or an error message if the loading fails.
+        The last known model list is read from disk, so the combo box is populated at
+        once even if the Ollama server is slow or not running. The live list is then
+        requested from /api/tags on the async engine; models_loaded reconciles it with
+        the catalog and only touches the combo box when something changed.
+        """
+        set_model_digests(self.model_catalog.models)
+        self.populate_models(self.model_catalog.names())
+        self.model_combo.currentTextChanged.connect(self.model_changed)
+        get_engine().request("GET", "/api/tags", on_finished=self.models_loaded, on_error=self.models_failed)
 
-        Raises:
-            Exception: If there is an error while loading models from the Ollama API.
+    def populate_models(self, model_names):
         """
-        try:
-            models = ollama.list()["models"]
-            model_names = [model["name"] for model in models]
-            self.model_combo.addItems(model_names)
-            if model_names:
-                self.selected_model = model_names[0]
-                self.model_combo.currentTextChanged.connect(self.model_changed)
-            logger.info(f"Loaded models: {model_names}")
-        except Exception as e:
-            logger.error(f"Error loading models: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to load models: {str(e)}")
+        Replaces the entries of the model combo box, keeping the selected model if it still exists.
+
+        Args:
+            model_names (list): The model names to show.
+        """
+        selected_model = self.selected_model
+        self.model_combo.blockSignals(True)
+        self.model_combo.clear()
+        self.model_combo.addItems(model_names)
+        if selected_model in model_names:
+            self.model_combo.setCurrentText(selected_model)
+        self.model_combo.blockSignals(False)
+        self.selected_model = self.model_combo.currentText()
+        if self.selected_model != selected_model:
+            logger.info(f"Selected model changed to: {self.selected_model}")
+
+    def models_loaded(self, handle):
+        """
+        Reconciles the model catalog with the live model list from /api/tags.
+
+        Args:
+            handle (StreamHandle): The finished request; handle.result holds the response.
+        """
+        models = (handle.result or {}).get("models", [])
+        set_model_digests(models)
+        if self.model_catalog.update(models):
+            self.populate_models(self.model_catalog.names())
+            logger.info(f"Loaded models: {self.model_catalog.names()}")
+        else:
+            logger.info("Model list unchanged")
+
+    def models_failed(self, handle, error_message):
+        """
+        Reports a failed model refresh; the cached model list stays in place.
+
+        Args:
+            handle (StreamHandle): The failed request.
+            error_message (str): The error reported by the engine.
+        """
+        logger.error(f"Error loading models: {error_message}")
+        if self.model_catalog.models:
+            self.update_status(f"Ollama unreachable, showing the last known models: {error_message}")
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to load models: {error_message}")
 
     # /////////////////////////////////////////////////////////////////////////////////////
     # MODEL_CHANGED
@@ -372,36 +340,89 @@ class MainWindow(FramelessWindow, QMainWindow):
         """
         Handles the event of sending a message from the user.
 
-        This method retrieves the text from the input field, appends it to the messages list,
-        displays the message in the chat display, and clears the input field. It then starts
-        a new thread to get the assistant's response and connects the thread's signals to the
-        appropriate handler methods.
+        This method retrieves the text from the input field, appends it to the messages list once
+        its turn starts, displays the message in the chat display, and clears the input field. The turn is
+        queued on the request scheduler with interactive priority, ahead of queued analyses.
 
         Attributes:
             prompt (str): The text input from the user.
             messages (list): The list of messages exchanged in the chat.
             assistant_response (str): The response from the assistant.
-            thread (ResponseThread): The thread responsible for fetching the assistant's response.
-
-        Signals:
-            response_chunk_received: Emitted when a chunk of the assistant's response is received.
-            response_finished: Emitted when the assistant's response is fully received.
-            error_occurred: Emitted when an error occurs during the response fetching process.
+            active_request (StreamHandle): The streaming request fetching the assistant's response.
+            sent_tokens (int): The context window's token count when that request was sent.
         """
         prompt = self.input_field.text()
         if prompt:
-            self.messages.append({"role": "user", "content": prompt})
-            self.display_message("user", prompt)
             self.input_field.clear()
             logger.info(f"Sending message: {prompt}")
-            self.assistant_response = ""
+            self.queue_turn(prompt, PRIORITY_INTERACTIVE, "chat message")
+
+    def queue_turn(self, prompt, priority, label, cache_key=None, cached_reply=None, analysis=False):
+        """
+        Queues a chat turn on the request scheduler.
+
+        The prompt joins the transcript only when the turn starts, so turns queued
+        behind each other never interleave; all turns of this chat share one lane.
+        The context window is trimmed to the context length before the request is sent.
+
+        Args:
+            prompt (str): The user message of the turn.
+            priority (int): PRIORITY_INTERACTIVE for chat, PRIORITY_BACKGROUND for analyses.
+            label (str): Shown in logs and kept in the request metrics.
+            cache_key (str, optional): Response cache key the reply is stored under.
+            cached_reply (str, optional): A cached reply to show instead of asking the model.
+            analysis (bool): The prompt is an analysis prompt rather than a message the user typed.
+
+        Returns:
+            ScheduledRequest: The queued turn.
+        """
+        def start():
+            user_message = {"role": "user", "content": prompt}
+            if analysis:
+                self.analysis_turns.add(len(self.messages))
+            self.messages.append(user_message)
+            self.context.append(user_message)
+            self.chat_statistics.add(user_message)
+            self.display_message("user", prompt)
+            if cached_reply is not None:
+                assistant_message = {"role": "assistant", "content": cached_reply}
+                self.messages.append(assistant_message)
+                self.context.append(assistant_message)
+                self.chat_statistics.add(assistant_message)
+                self.display_message("assistant", cached_reply)
+                return None
             self.chat_display.append("<b>Assistant:</b> ")
-            # Start a thread to get the assistant's response
-            self.thread = ResponseThread(self.selected_model, self.messages)
-            self.thread.response_chunk_received.connect(self.handle_response_chunk)
-            self.thread.response_finished.connect(self.handle_response_finished)
-            self.thread.error_occurred.connect(self.handle_error)
-            self.thread.start()
+            self.trim_messages()
+            handle = self.start_response(label)
+            if cache_key is not None:
+                self.cache_keys[handle.request_id] = cache_key
+            return handle
+
+        return self.scheduler.submit(start, priority=priority, label=label, lane=self.chat_lane)
+
+    def start_response(self, label=None):
+        """
+        Streams the assistant's reply to the current messages on the shared streaming engine
+        and returns the request's StreamHandle.
+
+        The reply's text travels through the request's stream channel, which the stream
+        renderer drains once per frame; completion and errors come back as callbacks on
+        the GUI thread.
+
+        Args:
+            label (str, optional): The capability or "chat message", kept in the request metrics.
+        """
+        self.assistant_response = ""
+        self.sent_tokens = self.context.total_tokens
+        self.active_request = self.conversation.start_turn(
+            self.selected_model,
+            self.context.window(),
+            on_finished=self.handle_response_finished,
+            on_error=self.handle_response_error,
+            label=label,
+        )
+        self.stream_renderer.attach(self.active_request.channel)
+        return self.active_request
     
     def save_chat_to_history(self):
         try:
@@ -439,33 +460,107 @@ class MainWindow(FramelessWindow, QMainWindow):
         except Exception as e:
             logger.error(f"Error opening SavedChatsDialog: {e}")
             
-    def handle_response_chunk(self, chunk):
+    def show_queue_status(self, queued, running, longest_wait):
         """
-        Handles a chunk of response from the assistant.
+        Shows the request queue depth and the longest current wait in the status bar.
 
-        This method appends the given chunk to the assistant's response,
-        updates the chat display with the new chunk, and ensures that the
-        cursor is visible in the chat display.
+        Args:
+            queued (int): Requests waiting for a slot.
+            running (int): Requests currently streaming.
+            longest_wait (float): Seconds the oldest queued request has waited.
+        """
+        if queued:
+            self.queue_label.setText(f"Queue: {queued} waiting ({longest_wait:.0f}s), {running} running")
+        elif running:
+            self.queue_label.setText(f"Queue: {running} running")
+        else:
+            average_wait = self.scheduler.stats()["average_wait"]
+            self.queue_label.setText(f"Queue: idle, avg wait {average_wait:.1f}s")
+
+    def show_stream_rate(self, chunks_per_second, frames_per_second):
+        """
+        Shows the streaming throughput against the UI refresh rate in the status bar.
 
         Args:
-            chunk (str): A piece of the response from the assistant.
+            chunks_per_second (float): Chunks received from the model per second.
+            frames_per_second (float): Flushes to the chat display per second.
         """
-        self.assistant_response += chunk
-        self.chat_display.insertPlainText(chunk)
-        self.chat_display.ensureCursorVisible()
+        self.status_message.setText(f"Streaming: {self.stream_renderer.rate_text()}")
     
-    def handle_response_finished(self):
+    def show_first_token(self, request_id):
+        """
+        Shows the time to first token of the chat reply as soon as the first token arrives.
+
+        Args:
+            request_id (int): The request that received its first chunk.
+        """
+        handle = self.active_request
+        if handle is None or handle.request_id != request_id or handle.first_chunk_at is None:
+            return
+        self.metrics_label.setText(f"TTFT {handle.first_chunk_at - handle.submitted_at:.2f}s")
+
+    def handle_response_finished(self, handle):
         """
         Handles the completion of a response from the assistant.
 
         This method appends the assistant's response to the messages list with the role 
-        set to "assistant" and logs that the response has finished.
+        set to "assistant", adds its statistics to the chat statistics, shows how many prompt tokens were reused from the server's
+        cache and logs that the response has finished. A reply stopped before its first
+        token adds no message. Complete analysis replies are
+        stored in the response cache. Replies of a request that was discarded by
+        restart_chat are otherwise ignored.
 
-        Attributes:
-            self.assistant_response (str): The response content from the assistant.
-        """
-        self.messages.append({"role": "assistant", "content": self.assistant_response})
+        Args:
+            handle (StreamHandle): The finished request; handle.text holds the reply.
+        """
+        cache_key = self.cache_keys.pop(handle.request_id, None)
+        if cache_key is not None and handle.text and not handle.cancelled:
+            self.response_cache.put(cache_key, handle.text, {"model": self.selected_model})
+        if handle is not self.active_request:
+            return
+        self.active_request = None
+        self.stream_renderer.finish()
+        if handle.cancelled and not handle.text:
+            # Stopped before the first token: there is no reply to keep or resend
+            self.update_status("Generation stopped before the reply began.")
+            logger.info("Response stopped before the first token")
+            return
+        self.assistant_response = handle.text
+        assistant_message = {"role": "assistant", "content": self.assistant_response}
+        self.messages.append(assistant_message)
+        self.chat_statistics.add(assistant_message)
+        turn = self.conversation.last_turn
+        if turn and not turn.get("cancelled"):
+            # Replace the estimates with the server's counts
+            self.context.calibrate(turn["prompt_tokens"], self.sent_tokens)
+            self.context.append(assistant_message, tokens=turn["eval_count"] + MESSAGE_TEMPLATE_TOKENS)
+        else:
+            self.context.append(assistant_message)
+        if turn.get("cancelled"):
+            self.update_status("Generation stopped; the partial reply was kept.")
+        elif turn:
+            self.update_status(
+                f"Prompt tokens evaluated: {turn['prompt_tokens_evaluated']}, "
+                f"reused from cache: {turn['prompt_tokens_skipped']}"
+            )
+        if handle.metrics is not None:
+            self.metrics_label.setText(format_metrics(handle.metrics))
+        self.compactor.maybe_compact(self.selected_model, self.conversation.options)
         logger.info("Response finished")
+
+    def handle_response_error(self, handle, error_message):
+        """
+        Handles a failed streaming request unless it was discarded by restart_chat.
+
+        Args:
+            handle (StreamHandle): The failed request.
+            error_message (str): The error reported by the engine.
+        """
+        self.cache_keys.pop(handle.request_id, None)
+        if handle is not self.active_request:
+            return
+        self.active_request = None
+        self.handle_error(error_message)
     
     def handle_error(self, error_message):
         """
@@ -474,7 +569,8 @@ class MainWindow(FramelessWindow, QMainWindow):
         Args:
             error_message (str): The error message to be logged and displayed.
         """
-        logger.error(f"Error in response thread: {error_message}")
+        logger.error(f"Error in response request: {error_message}")
+        self.stream_renderer.finish()
         QMessageBox.critical(self, "Error", f"An error occurred: {error_message}")
     
     def display_message(self, role, content):
@@ -522,6 +618,7 @@ class MainWindow(FramelessWindow, QMainWindow):
                 file_extension = "txt"
             
             if file_extension == "pdf":
+                QPrinter = load("PyQt6.QtPrintSupport").QPrinter
                 printer = QPrinter(QPrinter.PrinterMode.HighResolution)
                 printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
                 printer.setOutputFileName(filename)
@@ -538,9 +635,11 @@ class MainWindow(FramelessWindow, QMainWindow):
         """
         Toggles the visibility of the statistics dialog.
 
-        If the statistics dialog is currently visible, it will be closed and set to None.
-        If the statistics dialog is not visible, a new instance of StatsDialog will be created
-        and displayed.
+        If the statistics dialog is currently visible, it will be closed. Otherwise it is
+        shown, created on first use. It shows the statistics of the chat display, followed
+        by a breakdown of the chat per role and turn. The dialog is kept while hidden, so
+        its worker thread and last statistics are reused and it only recomputes if the chat
+        changed.
 
         Attributes:
             stats_dialog (StatsDialog): The dialog window displaying statistics.
@@ -548,15 +647,16 @@ class MainWindow(FramelessWindow, QMainWindow):
         """
         if self.stats_dialog is not None and self.stats_dialog.isVisible():
             self.stats_dialog.close()
-            self.stats_dialog = None
         else:
-            self.stats_dialog = StatsDialog(self.chat_display, self)
+            if self.stats_dialog is None:
+                StatsDialog = load("QtOllama.utility.stats").StatsDialog
+                self.stats_dialog = StatsDialog(self.chat_display, self, chat_statistics=self.chat_statistics)
             self.stats_dialog.show()
     
     def update_info(self):
         """
         Updates the information label with various text statistics and interpretations.
-        This method retrieves the text from the text editor, analyzes it using TextBlob and textstat,
+        This method retrieves the text from the text editor, analyzes it with one shared text analysis pass,
         and updates the info label with the following information:
         - Number of characters
         - Number of words
@@ -569,18 +669,18 @@ class MainWindow(FramelessWindow, QMainWindow):
             None
         """
         text = self.text_editor.toPlainText()
-        blob = TextBlob(text)
+        features = text_analysis.analyze_text(text)
         
-        sentiment_polarity = blob.sentiment.polarity
+        sentiment_polarity = features.sentiment.polarity
         sentiment = Interpretations.sentiment_polartiy_interpretation(sentiment_polarity)
-        sentiment_subjectivity = blob.sentiment.subjectivity
+        sentiment_subjectivity = features.sentiment.subjectivity
         subjectivity = Interpretations.sentiment_subjectivity_interpretation(sentiment_subjectivity)
-        flesch_reading_ease = textstat.flesch_reading_ease(text)
+        flesch_reading_ease = features.flesch_reading_ease()
         reading_ease = Interpretations.flesch_reading_ease_interpretation(flesch_reading_ease)
         
-        characters = len(text)
-        words = len(text.split())
-        lines = text.count("\n") + 1 if text else 0
+        characters = features.characters
+        words = features.whitespace_tokens
+        lines = features.lines
         self.info_label.setText(
             f"Characters: {characters}, "
             f"Words: {words}, "
@@ -599,85 +699,172 @@ class MainWindow(FramelessWindow, QMainWindow):
         """
         self.status_bar.showMessage(status)
     
-    def perform_ai_analysis(self, analysis_type):
+    def perform_ai_analysis(self, analysis_type, bypass_cache=False):
         """
         Perform an AI analysis on the selected text or the last user message.
         This method checks if there is any selected text in the chat display. If there is, it uses the selected text;
         otherwise, it retrieves the last message sent by the user. It then creates a prompt for the AI assistant to 
-        perform the specified type of analysis on the text. The prompt is added to the messages list, and the assistant's 
-        response is handled in a separate thread.
+        perform the specified type of analysis on the text. The analysis is queued on the request scheduler with background
+        priority; when it starts, the prompt is added to the messages list and the response is streamed into the chat.
+        A response cached for the same model, prompt and options is shown at once instead.
         Args:
             analysis_type (str): The type of analysis to be performed on the text (e.g., sentiment analysis, summarization).
+            bypass_cache (bool): Ask the model even if a cached response exists; the new one replaces it.
         Returns:
             None
         """
 
-        # Check if there is selected text in the chat_display
-        text_cursor = self.chat_display.textCursor()
-        if text_cursor.hasSelection():
-            text = text_cursor.selectedText()
-        else:
-            # No selection, get the last message from the user
-            text = self.get_last_user_message()
-            if not text:
-                self.update_status("Please select text or send a message first.")
-                return
+        text = self.get_analysis_text()
+        if not text:
+            return
         
         # Create the prompt
-        prompt = f"Please perform {analysis_type} on the following text: '{text}'"
+        prompt = capabilities.build_analysis_prompt(analysis_type, text)
         
-        # Add the message to the messages list
-        self.messages.append({"role": "user", "content": prompt})
-        self.display_message("user", prompt)
-        self.assistant_response = ""
-        self.chat_display.append("<b>Assistant:</b> ")
+        cache_key = self.response_cache.key_for(self.selected_model, prompt, self.conversation.options)
+        cached_reply = None if bypass_cache else self.response_cache.get(cache_key)
+        self.show_cache_status(cached_reply is not None, bypass_cache)
         
-        # Trim messages to fit within context length
-        self.trim_messages()
-        
-        # Start a thread to get the assistant's response
-        self.thread = ResponseThread(self.selected_model, self.messages)
-        self.thread.response_chunk_received.connect(self.handle_response_chunk)
-        self.thread.response_finished.connect(self.handle_response_finished)
-        self.thread.error_occurred.connect(self.handle_error)
-        self.thread.start()
+        # Queue the analysis behind interactive chat
+        self.queue_turn(prompt, PRIORITY_BACKGROUND, analysis_type,
+                        cache_key=cache_key, cached_reply=cached_reply, analysis=True)
+
+    def show_cache_status(self, hit, bypassed=False):
+        """
+        Shows the outcome of a response cache lookup with the cache's hit/miss statistics.
+
+        Args:
+            hit (bool): Whether the lookup was a hit.
+            bypassed (bool): Whether the lookup was skipped to regenerate the response.
+        """
+        stats = self.response_cache.stats()
+        outcome = "bypassed" if bypassed else ("hit" if hit else "miss")
+        self.update_status(
+            f"Response cache {outcome} ({stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['hit_rate']:.0%} hit rate, {stats['entries']} entries)"
+        )
     
-    def trim_messages(self):
+    def get_analysis_text(self):
+        """
+        Returns the text to analyse: the selection in the chat display, or else the last user message.
+
+        Shows a hint in the status bar and returns an empty string when there is neither.
         """
-        Trims the list of messages to ensure the total length of their content does not exceed the context length.
+        text_cursor = self.chat_display.textCursor()
+        if text_cursor.hasSelection():
+            return text_cursor.selectedText()
+        # No selection, get the last message from the user
+        text = self.get_last_user_message()
+        if not text:
+            self.update_status("Please select text or send a message first.")
+        return text
 
-        This method iterates through the messages and removes the oldest messages until the total length of the 
-        remaining messages' content is within the specified context length. It ensures that at least one message 
-        remains in the list.
+    def open_batch_analysis(self, title, analysis_types):
+        """
+        Runs a whole group of analysis types on the selected text concurrently.
 
-        Attributes:
-            self.messages (list): A list of message dictionaries, where each dictionary contains a "content" key 
-                                  with the message text.
-            self.context_length (int): The maximum allowed total length of the messages' content.
+        Each analysis streams into its own pane of a BatchAnalysisDialog; the chat
+        history is left untouched.
+
+        Args:
+            title (str): The name of the capability group, e.g. "Stylistic".
+            analysis_types (list): The analysis types to run.
+        """
+        text = self.get_analysis_text()
+        if not text:
+            return
+        dialog = BatchAnalysisDialog(text, analysis_types, self.selected_model,
+                                     options=self.conversation.options, title=title, parent=self)
+        dialog.show()
+        dialog.start()
+
+    def open_command_palette(self):
+        """
+        Opens the command palette to search and run any capability by name (Ctrl+K).
+
+        The palette and its search index are built on first use.
+        """
+        if self.command_palette is None:
+            self.command_palette = CommandPalette(self)
+        self.command_palette.show_palette()
+
+    def trim_messages(self):
+        """
+        Trims the context window so the prompt fits the context length.
+
+        The window keeps a running token count per message, seeded from the server's
+        prompt_eval_count/eval_count or estimated, so this never re-reads the history.
+        System messages are pinned; the oldest other messages are dropped first. The
+        full history in self.messages is kept for saving and statistics.
 
         Logs:
-            Logs an info message indicating the number of messages remaining after trimming.
+            Logs an info message with the window size after trimming.
+        """
+        dropped = self.context.trim()
+        logger.info(
+            f"Context window: {len(self.context)} messages, {self.context.total_tokens}/"
+            f"{self.context.budget} tokens ({len(dropped)} trimmed)"
+        )
+
+    def compaction_toggled(self, checked):
+        """
+        Turns rolling summarization of old turns on or off.
+
+        Args:
+            checked (bool): The state of the compaction checkbox.
+        """
+        self.compactor.enabled = checked
+        if not checked:
+            self.compactor.cancel()
+        logger.info(f"Compaction {'enabled' if checked else 'disabled'}")
+
+    def show_compaction(self, folded, tokens_before, tokens_after):
+        """
+        Shows the effect of a compaction in the status bar.
+
+        Args:
+            folded (int): Messages folded into the summary.
+            tokens_before (int): Context window tokens before the compaction.
+            tokens_after (int): Context window tokens after it.
+        """
+        self.update_status(
+            f"Compacted {folded} messages into a summary: context {tokens_before} -> "
+            f"{tokens_after} tokens ({tokens_before - tokens_after} saved)"
+        )
+
+    def context_length_changed(self, value):
+        """
+        Applies a new context length from the context length spinner.
+
+        The window is re-trimmed to the new size and num_ctx is sent with the next request.
+        Changing num_ctx reloads the model, so the cached prompt prefix is forgotten.
+
+        Args:
+            value (int): The new context length in tokens.
         """
-        total_length = sum(len(msg["content"]) for msg in self.messages)
-        while total_length > self.context_length and len(self.messages) > 1:
-            removed_message = self.messages.pop(0)
-            total_length -= len(removed_message["content"])
-        logger.info(f"Trimmed messages to fit context length. Current message count: {len(self.messages)}")
+        self.context_length = value
+        self.context.set_limit(value)
+        self.conversation.options["num_ctx"] = value
+        self.conversation.reset()
+        self.trim_messages()
+        logger.info(f"Context length set to {value}")
         
     def get_last_user_message(self):
         """
-        Retrieve the content of the last message sent by the user.
+        Retrieve the content of the last message typed by the user.
 
         This method iterates through the list of messages in reverse order and 
         returns the content of the first message found that has the role 'user'. 
+        Analysis prompts are skipped, so analysing the same message again builds the same prompt.
         If no such message is found, it returns an empty string.
 
         Returns:
             str: The content of the last user message, or an empty string if no user message is found.
         """
 
-        for msg in reversed(self.messages):
-            if msg['role'] == 'user':
+        for index in range(len(self.messages) - 1, -1, -1):
+            msg = self.messages[index]
+            if msg['role'] == 'user' and index not in self.analysis_turns:
                 return msg['content']
         return ""
     
@@ -731,7 +918,7 @@ class MainWindow(FramelessWindow, QMainWindow):
 
     def regenerate_analysis(self, analysis_type):
         """
-        Regenerates the analysis for the specified analysis type.
+        Regenerates the analysis for the specified analysis type, bypassing the response cache.
 
         Parameters:
         - analysis_type (str): The type of analysis to regenerate.
@@ -739,166 +926,80 @@ class MainWindow(FramelessWindow, QMainWindow):
         Returns:
         - None
         """
-        self.perform_ai_analysis(analysis_type)
+        self.perform_ai_analysis(analysis_type, bypass_cache=True)
         
     def show_analytics(self):
         """
         Displays analytics information about the messages exchanged.
 
         This method calculates and shows the total number of messages, the number of user messages,
-        the number of assistant messages, the estimated total number of tokens, and the current context length.
+        the number of assistant messages, the tokens in the context window, and the current context length.
         The information is displayed in a message box.
 
         The following analytics are displayed:
         - Total messages: The total number of messages exchanged.
         - User messages: The number of messages sent by the user.
         - Assistant messages: The number of messages sent by the assistant.
-        - Estimated total tokens: The total number of words in all messages.
+        - Words: Words written by the user and by the assistant, counted as messages are recorded.
+        - Context window tokens: The running token count of the messages sent to the model.
         - Current context length: The current length of the context.
+        - Model performance: Average time to first token and generation speed of the selected
+          model over the stored request metrics.
 
         A log entry is created to indicate that the analytics have been displayed.
         """
         user_messages = [msg['content'] for msg in self.messages if msg['role'] == 'user']
         assistant_messages = [msg['content'] for msg in self.messages if msg['role'] == 'assistant']
         total_messages = len(self.messages)
-        total_tokens = sum(len(msg['content'].split()) for msg in self.messages)
+        words = self.chat_statistics.words
+        total_tokens = self.context.total_tokens
+        model_metrics = get_metrics_store().summary("model").get(self.selected_model)
+        performance = "no requests yet"
+        if model_metrics:
+            performance = f"{model_metrics['count']} requests, " + format_metrics(model_metrics)
         message = f"""
             Total messages: {total_messages}\n
             User messages: {len(user_messages)}\n
             Assistant messages: {len(assistant_messages)}\n
-            Estimated total tokens: {total_tokens}\n
-            Current context length: {self.context_length}
+            Words: {words.get('user', 0)} user, {words.get('assistant', 0)} assistant\n
+            Context window tokens: {total_tokens} ({len(self.context)} messages)\n
+            Current context length: {self.context_length}\n
+            Model performance: {performance}
             """
         QMessageBox.information(self, "Analytics", message)
         logger.info("Analytics displayed")
     
     def stop_chat(self):
         """
-        Stops the chat by terminating the running thread, clearing messages, and updating the chat display.
+        Stops the in-flight generation, keeping the part of the reply already received.
 
-        This method performs the following actions:
-        1. Checks if a thread is running and terminates it.
-        2. Waits for the thread to finish.
-        3. Clears the list of messages.
-        4. Clears the chat display.
-        5. Logs the action of stopping and clearing the chat.
+        Cancelling the request closes its connection so the server stops generating;
+        the partial reply arrives through handle_response_finished like a complete one.
         """
-        if self.thread and self.thread.isRunning():
-            self.thread.terminate()
-            self.thread.wait()
-        self.messages = []
-        self.chat_display.clear()
-        print("Chat stopped and cleared")
-        logger.info("Chat stopped and cleared")
+        if self.active_request is not None:
+            self.active_request.cancel()
+        print("Chat stopped")
+        logger.info("Chat stopped")
     
     def restart_chat(self):
 
         """
-        Restarts the chat session by first stopping the current chat and then logging the restart action.
+        Restarts the chat session by first stopping the current chat and then clearing it.
 
-        This method ensures that any ongoing chat session is properly terminated before initiating a new one.
+        This method ensures that queued turns are dropped and any ongoing generation is
+        cancelled, its late reply discarded, before the messages, the cached prompt prefix and the chat display are cleared.
         """
+        self.scheduler.cancel_lane(self.chat_lane)
+        self.compactor.cancel()
         self.stop_chat()
+        # The cancelled request still reports back; forget it so its reply is dropped
+        self.active_request = None
+        self.stream_renderer.finish()
+        self.messages = []
+        self.analysis_turns.clear()
+        self.chat_statistics.clear()
+        self.context.clear()
+        self.conversation.reset()
+        self.chat_display.clear()
         print("Chat Restarted")
         logger.info("Chat restarted")
-
-
-class ResponseThread(QThread):
-    """
-    Attributes:
-        response_chunk_received (pyqtSignal): Signal emitted when a chunk of the response is received.
-        response_finished (pyqtSignal): Signal emitted when the entire response is finished.
-        error_occurred (pyqtSignal): Signal emitted when an error occurs during the response generation.
-        model_name (str): The name of the model to use for generating responses.
-        messages (list): A list of messages to send to the model.
-    Methods:
-        run():
-            Executes the thread, generating responses from the model and emitting signals for each chunk received and when the response is finished.
-    ResponseThread is a QThread subclass that handles generating responses using a specified model and emits signals during the process.
-    """
-    response_chunk_received = pyqtSignal(str)
-    response_finished = pyqtSignal(str)
-    error_occurred = pyqtSignal(str)
-    
-    def __init__(self, model_name, messages):
-        """
-        Initializes the instance of the class.
-
-        Args:
-            model_name (str): The name of the model.
-            messages (list): A list of messages to be copied.
-
-        """
-        super().__init__()
-        self.model_name = model_name
-        self.messages = messages.copy()
-    
-    def run(self):
-        """
-        Executes the main logic for generating a response using the Ollama model.
-
-        This method constructs a prompt from the provided messages, sends it to the Ollama model,
-        and processes the streamed response chunks. Each chunk is either appended to the final
-        response or handled as an error if it cannot be parsed. The method emits signals for
-        each received chunk and the final response, as well as any errors encountered.
-
-        Emits:
-            response_chunk_received (str): Signal emitted for each chunk of the response received.
-            response_finished (str): Signal emitted when the entire response has been received.
-            error_occurred (str): Signal emitted if an error occurs during the response generation.
-
-        Raises:
-            Exception: If any error occurs during the response generation process.
-        """
-        response = ""
-        try:
-            prompt = messages_to_prompt(self.messages)
-            logger.debug(f"Prompt sent to Ollama:\n{prompt}")
-            for chunk in ollama.generate(model=self.model_name, prompt=prompt, stream=True):
-                logger.debug(f"Type of chunk: {type(chunk)}")
-                logger.debug(f"Chunk received: {chunk}")
-                # Handle chunk
-                if isinstance(chunk, str):
-                    try:
-                        chunk_dict = json.loads(chunk)
-                        content = chunk_dict.get('response', '')
-                    except json.JSONDecodeError:
-                        logger.error(f"Failed to parse chunk as JSON: {chunk}")
-                        content = chunk  # Use as is
-                elif isinstance(chunk, dict):
-                    content = chunk.get('response', '')
-                else:
-                    logger.error(f"Unexpected chunk type: {type(chunk)}")
-                    content = ''
-                response += content
-                self.response_chunk_received.emit(content)
-            self.response_finished.emit(response)
-        except Exception as e:
-            logger.error(f"Error in response thread: {e}", exc_info=True)
-            self.error_occurred.emit(str(e))
-            
-
-    def ollama_generator(model_name: str, messages: Dict) -> Generator:
-        """
-        Generates a stream of messages from the Ollama chat model.
-    
-        Args:
-            model_name (str): The name of the chat model to use.
-            messages (Dict): A dictionary containing the messages to send to the model.
-    
-        Yields:
-            str: The content of each message chunk from the stream.
-    
-        Raises:
-            Exception: If an error occurs during the generation process, it logs the error and raises the exception.
-        """
-        try:
-            stream = ollama.chat(
-                model=model_name, messages=messages, stream=True
-            )
-            for chunk in stream:
-                yield chunk['message']['content']
-        except Exception as e:
-            logger.error(f"Error in ollama_generator: {str(e)}", exc_info=True)
-            raise
-    
@@ -0,0 +1,205 @@
+# batch_analysis_dialog.py
+import time
+
+from PyQt6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QGridLayout,
+    QGroupBox,
+    QLabel,
+    QPushButton,
+    QScrollArea,
+    QTextEdit,
+    QWidget,
+)
+
+from QtOllama.ui.stream_renderer import StreamRenderer, text_edit_sink
+from QtOllama.utility.async_engine import get_engine
+from QtOllama.utility.capabilities import build_analysis_prompt
+from QtOllama.utility.constants import OLLAMA_KEEP_ALIVE
+from QtOllama.utility.request_scheduler import get_scheduler, PRIORITY_BACKGROUND
+from QtOllama.utility.response_cache import get_response_cache
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+PANE_COLUMNS = 2
+
+
+class BatchAnalysisDialog(QDialog):
+    """
+    Runs a set of analysis types on one text concurrently, one pane per analysis.
+
+    Every analysis is an independent single-turn request, so they are queued on the
+    request scheduler at background priority without a lane and run as many at a time
+    as the server's parallelism allows. Each result streams into its own pane; when
+    the batch ends its wall time is compared with the summed server time of the replies,
+    an upper bound on running them one after another, and its generation throughput is
+    shown. Analyses found
+    in the response cache are shown at once and completed ones are stored there, under
+    the same key as a single analysis with the same model, prompt and options.
+
+    Attributes:
+        text (str): The text being analysed.
+        analysis_types (list): The analysis types to run.
+        model_name (str): The model used for every analysis.
+        options (dict): Model options sent with every analysis (e.g. num_ctx).
+    Methods:
+        start():
+            Shows cached analyses and queues the others.
+        cancel_all():
+            Cancels the analyses still queued or running.
+    """
+    def __init__(self, text, analysis_types, model_name, options=None, title="Batch Analysis", parent=None):
+        super().__init__(parent)
+        self.text = text
+        self.analysis_types = list(dict.fromkeys(analysis_types))
+        self.model_name = model_name
+        self.options = dict(options or {})
+        self.scheduler = get_scheduler()
+        self.response_cache = get_response_cache()
+        self._panes = {}
+        self._cache_keys = {}
+        self._requests = {}
+        self._durations = {}
+        self._eval_counts = {}
+        self._server_times = {}
+        self._started_at = None
+        self._finished_at = None
+
+        self.setWindowTitle(f"{title} ({len(self.analysis_types)} analyses)")
+        self.resize(900, 700)
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel(self)
+        layout.addWidget(self.summary_label)
+
+        scroll_area = QScrollArea(self)
+        scroll_area.setWidgetResizable(True)
+        container = QWidget(scroll_area)
+        grid = QGridLayout(container)
+        for position, analysis_type in enumerate(self.analysis_types):
+            box = QGroupBox(analysis_type, container)
+            box_layout = QVBoxLayout(box)
+            edit = QTextEdit(box)
+            edit.setReadOnly(True)
+            edit.setMinimumHeight(180)
+            edit.setPlaceholderText("Queued...")
+            box_layout.addWidget(edit)
+            grid.addWidget(box, position // PANE_COLUMNS, position % PANE_COLUMNS)
+            self._panes[analysis_type] = (box, edit, StreamRenderer(text_edit_sink(edit), parent=self))
+        scroll_area.setWidget(container)
+        layout.addWidget(scroll_area)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.cancel_button = QPushButton("Cancel Remaining", self)
+        self.cancel_button.clicked.connect(self.cancel_all)
+        button_layout.addWidget(self.cancel_button)
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.finished.connect(lambda result: self.cancel_all())
+
+    def start(self):
+        """
+        Fills the panes of cached analyses and queues the others on the request scheduler.
+        """
+        self._started_at = time.perf_counter()
+        for analysis_type in self.analysis_types:
+            prompt = build_analysis_prompt(analysis_type, self.text)
+            cache_key = self.response_cache.key_for(self.model_name, prompt, self.options)
+            self._cache_keys[analysis_type] = cache_key
+            cached_reply = self.response_cache.get(cache_key)
+            if cached_reply is not None:
+                box, edit, renderer = self._panes[analysis_type]
+                edit.setPlainText(cached_reply)
+                box.setTitle(f"{analysis_type} (cached)")
+                self._durations[analysis_type] = 0.0
+                continue
+            self._requests[analysis_type] = self.scheduler.submit(
+                lambda t=analysis_type: self._start_analysis(t),
+                priority=PRIORITY_BACKGROUND,
+                label=f"batch: {analysis_type}",
+            )
+        self._update_summary()
+        logger.info(f"Queued batch of {len(self.analysis_types)} analyses on {self.model_name}")
+
+    def _start_analysis(self, analysis_type):
+        box, edit, renderer = self._panes[analysis_type]
+        edit.setPlaceholderText("Running...")
+        handle = get_engine().chat(
+            self.model_name,
+            [{"role": "user", "content": build_analysis_prompt(analysis_type, self.text)}],
+            options=self.options,
+            keep_alive=OLLAMA_KEEP_ALIVE,
+            label=analysis_type,
+            on_finished=lambda h, t=analysis_type: self._on_finished(t, h),
+            on_error=lambda h, message, t=analysis_type: self._on_error(t, h, message),
+        )
+        renderer.attach(handle.channel)
+        return handle
+
+    def _on_finished(self, analysis_type, handle):
+        box, edit, renderer = self._panes[analysis_type]
+        renderer.finish()
+        duration = handle.finished_at - handle.submitted_at
+        self._durations[analysis_type] = duration
+        self._eval_counts[analysis_type] = handle.final.get("eval_count", 0)
+        self._server_times[analysis_type] = handle.final.get("total_duration", 0) / 1e9
+        if handle.text and not handle.cancelled:
+            self.response_cache.put(self._cache_keys[analysis_type], handle.text, {"model": self.model_name})
+        state = "cancelled" if handle.cancelled else f"{duration:.1f}s"
+        box.setTitle(f"{analysis_type} ({state})")
+        self._update_summary()
+
+    def _on_error(self, analysis_type, handle, message):
+        box, edit, renderer = self._panes[analysis_type]
+        renderer.finish()
+        edit.append(f"\nError: {message}")
+        self._durations[analysis_type] = handle.finished_at - handle.submitted_at
+        box.setTitle(f"{analysis_type} (failed)")
+        self._update_summary()
+
+    def cancel_all(self):
+        """
+        Cancels every analysis that is still queued or running.
+        """
+        for analysis_type, request in self._requests.items():
+            if analysis_type in self._durations:
+                continue
+            request.cancel()
+            if request.handle is None:
+                # Never started, so no completion will arrive
+                box, edit, renderer = self._panes[analysis_type]
+                edit.setPlaceholderText("Cancelled.")
+                self._durations[analysis_type] = 0.0
+        self._update_summary()
+
+    def _update_summary(self):
+        done = len(self._durations)
+        total = len(self.analysis_types)
+        if done < total:
+            self.summary_label.setText(f"{done}/{total} analyses finished on {self.model_name}...")
+            return
+        if self._finished_at is None:
+            self._finished_at = time.perf_counter()
+        wall_time = self._finished_at - self._started_at
+        # The client-side durations overlap and include queueing, so the sequential
+        # estimate sums the server's own time per reply instead. Sharing the server
+        # slows every reply down, so the sum is an upper bound on a sequential run.
+        sequential_time = sum(self._server_times.values())
+        speedup = sequential_time / wall_time if wall_time > 0 else 0.0
+        generated = len(self._eval_counts)
+        tokens = sum(self._eval_counts.values())
+        throughput = tokens / wall_time if wall_time > 0 else 0.0
+        self.summary_label.setText(
+            f"{total} analyses in {wall_time:.1f}s wall time vs at most {sequential_time:.1f}s "
+            f"sequential (up to {speedup:.1f}× faster): {generated} generated, "
+            f"{tokens} tokens at {throughput:.1f} tokens/s"
+        )
+        self.cancel_button.setEnabled(False)
+        logger.info(f"Batch finished: {wall_time:.1f}s wall, at most {sequential_time:.1f}s sequential, "
+                    f"{tokens} tokens, {throughput:.1f} tokens/s")
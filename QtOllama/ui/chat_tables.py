@@ -1,7 +1,8 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QLabel
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableView, QLabel
 import json
 import os
 from datetime import datetime
+from QtOllama.ui.table_models import RowTableModel
 from QtOllama.utility.logger_setup import create_logger
 
 logger = create_logger(__name__)
@@ -12,7 +13,8 @@ class SavedChatsDialog(QDialog):
     A dialog window that displays saved chat histories in a table format.
     Attributes:
         label (QLabel): A label displaying instructions.
-        table (QTableWidget): A table widget to display the saved chats.
+        model (RowTableModel): The saved chats, one (timestamp, chat) row each.
+        table (QTableView): A table view to display the saved chats.
     Methods:
         __init__(parent=None):
             Initializes the SavedChatsDialog with a title, size, layout, and loads the saved chats.
@@ -27,7 +29,8 @@ class SavedChatsDialog(QDialog):
             parent (QWidget, optional): The parent widget. Defaults to None.
         Attributes:
             label (QLabel): A label displaying instructions.
-            table (QTableWidget): A table widget to display saved chats with two columns: "Timestamp" and "Chat".
+            model (RowTableModel): The saved chats, with two columns: "Timestamp" and "Chat".
+            table (QTableView): A table view to display the saved chats.
         Methods:
             load_chats(): Loads and displays the saved chats in the table.
         """
@@ -41,8 +44,9 @@ class SavedChatsDialog(QDialog):
         layout.addWidget(self.label)
         
         # Table to display the chats
-        self.table = QTableWidget(0, 2)
-        self.table.setHorizontalHeaderLabels(["Timestamp", "Chat"])
+        self.model = RowTableModel(["Timestamp", "Chat"], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.table)
         
@@ -78,18 +82,15 @@ class SavedChatsDialog(QDialog):
                 logger.info(f"Loaded {len(saved_chats)} chat entries from {chats_file}.")
             
             # Populate the table with the saved chats
+            rows = []
             for entry in saved_chats:
                 timestamp = entry.get("timestamp", "Unknown Time")
                 chat = entry.get("chat", [])
-                chat_content = ""
-                for msg in chat:
-                    role = msg.get("role", "")
-                    content = msg.get("content", "")
-                    chat_content += f"{role.capitalize()}: {content}\n"
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-                self.table.setItem(row, 0, QTableWidgetItem(timestamp))
-                self.table.setItem(row, 1, QTableWidgetItem(chat_content))
+                chat_content = "".join(
+                    f"{msg.get('role', '').capitalize()}: {msg.get('content', '')}\n" for msg in chat
+                )
+                rows.append((timestamp, chat_content))
+            self.model.set_rows(rows)
             logger.info("Successfully populated the table with chat entries.")
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error while loading chats: {e}")
@@ -0,0 +1,93 @@
+# command_palette.py
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+
+from QtOllama.utility.capability_search import CapabilityIndex
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+PALETTE_RESULTS = 50
+
+
+class CommandPalette(QDialog):
+    """
+    A keyboard-driven search over every capability of the Analyze, Generate and Transform menus.
+
+    Every keystroke queries the precomputed CapabilityIndex, which answers in well
+    under a frame, so the list follows the typing directly. Up/Down move through the
+    results, Enter runs the selected capability through `perform_ai_analysis` and
+    counts the use, so frequently used capabilities rank higher next time.
+
+    Methods:
+        show_palette():
+            Clears the query and shows the palette.
+    """
+    def __init__(self, main_window, index=None):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.index = index or CapabilityIndex()
+        self.setWindowTitle("Run Capability")
+        self.setWindowFlags(self.windowFlags() | Qt.WindowType.FramelessWindowHint)
+        self.resize(560, 420)
+
+        layout = QVBoxLayout(self)
+        self.query_field = QLineEdit(self)
+        self.query_field.setPlaceholderText("Type to search analyses, generators and transforms...")
+        self.query_field.textChanged.connect(self.update_results)
+        self.query_field.returnPressed.connect(self.run_selected)
+        self.query_field.installEventFilter(self)
+        layout.addWidget(self.query_field)
+
+        self.results_list = QListWidget(self)
+        self.results_list.itemActivated.connect(lambda item: self.run_selected())
+        layout.addWidget(self.results_list)
+
+    def show_palette(self):
+        self.query_field.clear()
+        self.update_results("")
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.query_field.setFocus()
+
+    def update_results(self, query):
+        """
+        Replaces the result list with the best matches for the query.
+
+        Args:
+            query (str): The text typed so far.
+        """
+        self.results_list.setUpdatesEnabled(False)
+        self.results_list.clear()
+        for result in self.index.search(query, PALETTE_RESULTS):
+            capability = result.capability
+            item = QListWidgetItem(f"{capability.name}    —  {' › '.join(capability.path)}")
+            item.setData(Qt.ItemDataRole.UserRole, capability)
+            self.results_list.addItem(item)
+        if self.results_list.count():
+            self.results_list.setCurrentRow(0)
+        self.results_list.setUpdatesEnabled(True)
+
+    def run_selected(self):
+        """
+        Runs the selected capability on the current text and closes the palette.
+        """
+        item = self.results_list.currentItem()
+        if item is None:
+            return
+        capability = item.data(Qt.ItemDataRole.UserRole)
+        self.index.record_use(capability)
+        self.hide()
+        logger.info(f"Running {capability.id} from the command palette")
+        self.main_window.perform_ai_analysis(capability.name)
+
+    def eventFilter(self, watched, event):
+        if watched is self.query_field and event.type() == event.Type.KeyPress:
+            key = event.key()
+            if key in (Qt.Key.Key_Down, Qt.Key.Key_Up, Qt.Key.Key_PageDown, Qt.Key.Key_PageUp):
+                self.results_list.keyPressEvent(event)
+                return True
+            if key == Qt.Key.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(watched, event)
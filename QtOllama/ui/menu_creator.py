@@ -1,6 +1,7 @@
 # menu_creator.py
 from PyQt6.QtGui import QAction
 from PyQt6.QtWidgets import QMenu
+from QtOllama.utility.capability_registry import get_registry
 from QtOllama.utility.logger_setup import create_logger
 
 logger = create_logger(__name__)
@@ -13,12 +14,25 @@ class MenuCreator:
     __init__(main_window)
         Initializes the MenuCreator with the given main window.
     create_menus()
-        Creates the menus and submenus for the main window based on the provided menu structure.
+        Creates the top-level menus for the main window based on the provided menu structure.
+    defer(menu, path, node)
+        Registers a menu to be filled when it is first shown.
+    populate(menu)
+        Fills a deferred menu with its submenus or actions.
+    register(path, option)
+        Returns the capability id of an option.
+    dispatch(action)
+        Runs the capability or batch of a triggered action.
+    add_batch_action(menu, path, options)
+        Adds an entry running every option of a menu at once.
     """
 
     def __init__(self, main_window):
         try:
             self.main_window = main_window
+            self.registry = get_registry()
+            self._pending = {}
+            self._batches = {}
             logger.info("MenuCreator initialized successfully.")
         except Exception as e:
             logger.error(f"Error constructing MenuCreator: {e}")
@@ -28,9 +42,10 @@ class MenuCreator:
         """
         Creates the menu structure for the main window.
 
-        This method iterates through the `menus` dictionary of the main window,
-        creating the main menus, submenus, and actions dynamically. The structure
-        of the `menus` dictionary should be as follows:
+        Only the top-level menus are created here; every menu fills itself with its
+        submenus or actions the first time it is about to be shown, so startup never
+        walks the whole capability taxonomy. The structure of the `menus` dictionary
+        of the main window should be as follows:
         
         {
             "Main Menu Name": {
@@ -43,8 +58,10 @@ class MenuCreator:
             ...
         }
 
-        Each option in the submenus and subsubmenus is connected to the 
-        `perform_ai_analysis` method of the main window.
+        Every option becomes an action carrying its capability id as data; a single
+        connection to the menu bar's `triggered` signal dispatches all of them to
+        `perform_ai_analysis` of the main window. Every list of options also gets a
+        "Run All in Batch" entry, dispatched to `open_batch_analysis`.
 
         Example:
         {
@@ -59,34 +76,96 @@ class MenuCreator:
         }
         """
         try:
+            menu_bar = self.main_window.menuBar()
+            menu_bar.triggered.connect(self.dispatch)
             for main_menu_name, main_submenus in self.main_window.menus.items():
-                main_menu = self.main_window.menuBar().addMenu(main_menu_name)
-                logger.info(f"Created main menu: {main_menu_name}")
-                for submenu_name, submenus in main_submenus.items():
-                    if isinstance(submenus, dict):
-                        submenu = main_menu.addMenu(submenu_name)
-                        logger.info(f"Created submenu: {submenu_name}")
-                        for subsubmenu_name, options in submenus.items():
-                            subsubmenu = submenu.addMenu(subsubmenu_name)
-                            logger.info(f"Created subsubmenu: {subsubmenu_name}")
-                            for option in options:
-                                action = QAction(option, self.main_window)
-                                action.triggered.connect(
-                                    lambda checked, o=option: self.main_window.perform_ai_analysis(o)
-                                )
-                                subsubmenu.addAction(action)
-                                logger.info(f"Added action: {option} to subsubmenu: {subsubmenu_name}")
-                    else:
-                        submenu = main_menu.addMenu(submenu_name)
-                        logger.info(f"Created submenu: {submenu_name}")
-                        for option in submenus:
-                            action = QAction(option, self.main_window)
-                            action.triggered.connect(
-                                lambda checked, o=option: self.main_window.perform_ai_analysis(o)
-                            )
-                            submenu.addAction(action)
-                            logger.info(f"Added action: {option} to submenu: {submenu_name}")
+                main_menu = menu_bar.addMenu(main_menu_name)
+                self.defer(main_menu, (main_menu_name,), main_submenus)
+            logger.info(f"Created {len(self.main_window.menus)} menus")
         except Exception as e:
             logger.error(f"Error creating menus in MenuCreator: {e}")
             self.main_window.statusBar().showMessage("Failed to create menus. Check logs for details.")
             raise
+
+    def defer(self, menu, path, node):
+        """
+        Fills a menu with its entries the first time it is about to be shown.
+
+        Args:
+            menu (QMenu): The empty menu.
+            path (tuple): The menu names leading to it.
+            node (dict or list): Its submenus, or its options.
+        """
+        self._pending[menu] = (path, node)
+        menu.aboutToShow.connect(lambda m=menu: self.populate(m))
+
+    def populate(self, menu):
+        """
+        Adds the submenus or actions of a deferred menu; later calls do nothing.
+
+        Args:
+            menu (QMenu): A menu registered with defer().
+        """
+        entry = self._pending.pop(menu, None)
+        if entry is None:
+            return
+        path, node = entry
+        if isinstance(node, dict):
+            for submenu_name, child in node.items():
+                self.defer(menu.addMenu(submenu_name), path + (submenu_name,), child)
+            return
+        for option in node:
+            action = QAction(option, menu)
+            action.setData(self.register(path, option))
+            menu.addAction(action)
+        self.add_batch_action(menu, path, node)
+
+    def register(self, path, option):
+        """
+        Returns the capability id of an option.
+
+        Options that are not in the capability registry are dispatched by name.
+
+        Args:
+            path (tuple): The menu names leading to the option.
+            option (str): The analysis type.
+
+        Returns:
+            str: The capability id, or the option itself.
+        """
+        capability = self.registry.lookup(path, option)
+        return capability.id if capability is not None else option
+
+    def dispatch(self, action):
+        """
+        Runs the capability or batch of a triggered menu action.
+
+        Args:
+            action (QAction): The triggered action; its data is a capability or batch id.
+        """
+        capability_id = action.data()
+        if not isinstance(capability_id, str):
+            return
+        if capability_id in self._batches:
+            self.main_window.open_batch_analysis(*self._batches[capability_id])
+            return
+        capability = self.registry.get(capability_id)
+        self.main_window.perform_ai_analysis(capability.name if capability is not None else capability_id)
+
+    def add_batch_action(self, menu, path, options):
+        """
+        Adds a "Run All in Batch" entry that runs every option of the menu concurrently.
+
+        Args:
+            menu (QMenu): The menu listing the options.
+            path (tuple): The menu names leading to it; the last one is the batch title.
+            options (list): The analysis types of the menu.
+        """
+        if not options:
+            return
+        batch_id = "batch:" + "/".join(path)
+        self._batches[batch_id] = (path[-1], list(options))
+        menu.addSeparator()
+        action = QAction("Run All in Batch", menu)
+        action.setData(batch_id)
+        menu.addAction(action)
@@ -25,6 +25,9 @@ class SignalConnector:
             - view_saved_chats_button.clicked -> view_saved_chats
             - save_chat_button.clicked -> save_chat_to_history
             - simulation_btn.clicked -> start_simulation
+            - context_length_spinner.valueChanged -> context_length_changed
+            - compaction_checkbox.toggled -> compaction_toggled
+            - command_palette_shortcut.activated -> open_command_palette
     """
     def __init__(self, main_window):
         """
@@ -52,6 +55,9 @@ class SignalConnector:
         - view_saved_chats_button: Connects to view_saved_chats method.
         - save_chat_button: Connects to save_chat_to_history method.
         - simulation_btn: Connects to start_simulation method.
+        - context_length_spinner (on value changed): Connects to context_length_changed method.
+        - compaction_checkbox (on toggled): Connects to compaction_toggled method.
+        - command_palette_shortcut (on activated): Connects to open_command_palette method.
         """
         try:
             self.main_window.stats_button.clicked.connect(self.main_window.show_statistics)
@@ -90,6 +96,15 @@ class SignalConnector:
             self.main_window.simulation_btn.clicked.connect(self.main_window.start_simulation)
             logger.info("Connected simulation_btn to start_simulation")
 
+            self.main_window.context_length_spinner.valueChanged.connect(self.main_window.context_length_changed)
+            logger.info("Connected context_length_spinner valueChanged to context_length_changed")
+
+            self.main_window.compaction_checkbox.toggled.connect(self.main_window.compaction_toggled)
+            logger.info("Connected compaction_checkbox toggled to compaction_toggled")
+
+            self.main_window.command_palette_shortcut.activated.connect(self.main_window.open_command_palette)
+            logger.info("Connected command_palette_shortcut to open_command_palette")
+
         except AttributeError as e:
             logger.error(f"AttributeError while connecting signals: {e}")
         except Exception as e:
@@ -1,7 +1,8 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QLabel
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableView, QLabel
 import json
 import os
 from datetime import datetime
+from QtOllama.ui.table_models import RowTableModel
 from QtOllama.utility.logger_setup import create_logger
 
 logger = create_logger(__name__)
@@ -11,7 +12,8 @@ class HistoricalStatsDialog(QDialog):
     A dialog window that displays historical statistics in a table format.
     Attributes:
         label (QLabel): A label to display instructions.
-        table (QTableWidget): A table to display the historical stats.
+        model (RowTableModel): The historical stats, one (timestamp, statistic, value) row each.
+        table (QTableView): A table view to display the historical stats.
     Methods:
         __init__(parent=None):
             Initializes the HistoricalStatsDialog with a title, size, and layout.
@@ -37,8 +39,9 @@ class HistoricalStatsDialog(QDialog):
             layout.addWidget(self.label)
             
             # Table to display the stats
-            self.table = QTableWidget(0, 3)
-            self.table.setHorizontalHeaderLabels(["Timestamp", "Statistic", "Value"])
+            self.model = RowTableModel(["Timestamp", "Statistic", "Value"], self)
+            self.table = QTableView()
+            self.table.setModel(self.model)
             layout.addWidget(self.table)
             
             self.setLayout(layout)
@@ -56,7 +59,7 @@ class HistoricalStatsDialog(QDialog):
         the label to indicate that no historical stats are available. 
         Otherwise, it populates a table with the historical stats, where 
         each entry includes a timestamp and associated key-value pairs.
-        The table is updated with each entry's timestamp, key, and value.
+        The rows are collected first and handed to the model at once.
         Raises:
             json.JSONDecodeError: If the JSON file contains invalid JSON.
             OSError: If there is an issue opening or reading the file.
@@ -72,15 +75,13 @@ class HistoricalStatsDialog(QDialog):
                 historical_stats = json.load(f)
             
             # Populate the table with the historical stats
+            rows = []
             for entry in historical_stats:
                 timestamp = entry.get("timestamp", "Unknown Time")
                 for key, value in entry.items():
                     if key != "timestamp":
-                        row = self.table.rowCount()
-                        self.table.insertRow(row)
-                        self.table.setItem(row, 0, QTableWidgetItem(timestamp))
-                        self.table.setItem(row, 1, QTableWidgetItem(key))
-                        self.table.setItem(row, 2, QTableWidgetItem(str(value)))
+                        rows.append((timestamp, key, value))
+            self.model.set_rows(rows)
         except json.JSONDecodeError as e:
             self.label.setText("Error loading stats: Invalid JSON format.")
             logger.error(f"JSONDecodeError while loading stats from {stats_file}: {e}", exc_info=True)
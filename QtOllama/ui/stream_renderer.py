@@ -0,0 +1,157 @@
+# stream_renderer.py
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QTextCursor
+
+from QtOllama.utility.constants import STREAM_RENDER_FPS
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+
+def text_edit_sink(text_edit):
+    """
+    Creates a sink that appends text to the end of a QTextEdit.
+
+    The text is inserted with a private cursor, so a selection the user is making is
+    left alone, and the view only follows the stream while it is scrolled to the bottom.
+
+    Args:
+        text_edit (QTextEdit): The widget receiving the streamed text.
+
+    Returns:
+        callable: A function taking the text to append.
+    """
+    def append(text):
+        scrollbar = text_edit.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        cursor = QTextCursor(text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+    return append
+
+
+class StreamRenderer(QObject):
+    """
+    Buffers streamed chunks and flushes them to a widget at a bounded frame rate.
+
+    Workers may deliver hundreds of chunks per second; instead of touching the widget
+    for every chunk, the renderer joins whatever arrived since the last frame and
+    hands it to the sink once per frame. Chunks either arrive through feed() or are
+    pulled from an attached StreamChannel on every frame.
+
+    Signals:
+        rate_updated (float, float): Emitted about once a second with the chunks per
+            second received and the frames per second rendered.
+
+    Attributes:
+        sink (callable): Function that appends a piece of text to the target widget.
+        fps (int): The maximum number of flushes per second.
+    Methods:
+        feed(chunk):
+            Queues a chunk for the next frame.
+        attach(channel):
+            Drains a StreamChannel on every frame until its stream ends.
+        flush():
+            Writes everything buffered to the sink.
+        finish():
+            Flushes the remaining text and stops the frame timer.
+        rate_text():
+            Returns the last measured rates formatted for a status bar.
+    """
+    rate_updated = pyqtSignal(float, float)
+
+    def __init__(self, sink, fps=STREAM_RENDER_FPS, parent=None):
+        super().__init__(parent)
+        self.sink = sink
+        self.fps = fps
+        self._buffer = []
+        self._channel = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(1000 / fps)))
+        self._timer.timeout.connect(self.flush)
+        self._window_start = time.perf_counter()
+        self._window_chunks = 0
+        self._window_frames = 0
+        self.chunks_per_second = 0.0
+        self.frames_per_second = 0.0
+
+    def feed(self, chunk):
+        """
+        Queues a chunk; it reaches the widget on the next frame.
+
+        Args:
+            chunk (str): The streamed text.
+        """
+        if not chunk:
+            return
+        if not self._timer.isActive():
+            if not self._window_chunks:
+                self._window_start = time.perf_counter()
+            self._timer.start()
+        self._buffer.append(chunk)
+        self._window_chunks += 1
+
+    def attach(self, channel):
+        """
+        Pulls chunks from a StreamChannel on every frame until the stream ends.
+
+        Args:
+            channel (StreamChannel): The channel filled by a worker thread.
+        """
+        self._channel = channel
+        if not self._timer.isActive():
+            if not self._window_chunks:
+                self._window_start = time.perf_counter()
+            self._timer.start()
+
+    def flush(self):
+        """
+        Writes the buffered text to the sink in a single call.
+        """
+        if self._channel is not None:
+            chunks, ended = self._channel.drain()
+            self._buffer.extend(chunks)
+            self._window_chunks += len(chunks)
+            if ended:
+                self._channel = None
+        if self._buffer:
+            text = "".join(self._buffer)
+            self._buffer.clear()
+            try:
+                self.sink(text)
+            except Exception as e:
+                logger.error("Error rendering streamed text: %s", e, exc_info=True)
+            self._window_frames += 1
+        elif self._channel is None:
+            self._timer.stop()
+        self._update_rates()
+
+    def finish(self):
+        """
+        Flushes what is left of the stream and stops the frame timer.
+        """
+        self.flush()
+        self._channel = None
+        self._timer.stop()
+        self._update_rates(force=True)
+
+    def _update_rates(self, force=False):
+        elapsed = time.perf_counter() - self._window_start
+        if elapsed < 1.0 and not force:
+            return
+        if elapsed > 0 and (self._window_chunks or self._window_frames):
+            self.chunks_per_second = self._window_chunks / elapsed
+            self.frames_per_second = self._window_frames / elapsed
+            self.rate_updated.emit(self.chunks_per_second, self.frames_per_second)
+        self._window_start = time.perf_counter()
+        self._window_chunks = 0
+        self._window_frames = 0
+
+    def rate_text(self):
+        """
+        Returns the last measured rates, e.g. "85 tok/s → 30 fps".
+        """
+        return f"{self.chunks_per_second:.0f} tok/s → {self.frames_per_second:.0f} fps"
@@ -0,0 +1,84 @@
+# table_models.py
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+
+class RowTableModel(QAbstractTableModel):
+    """
+    A table model holding rows of plain values, shown as text.
+
+    Views read only the cells they paint, so a table of hundreds of thousands of
+    rows costs no more to show than the rows on screen. Replacing the rows compares
+    them with the current ones: rows are inserted or removed only at the end, and
+    dataChanged is emitted only for the cells whose values changed, so a periodic
+    refresh with mostly equal values leaves the view alone.
+
+    Attributes:
+        headers (list): The column titles.
+    Methods:
+        set_rows(rows):
+            Replaces the rows, notifying views of the differences only.
+        rows():
+            Returns the current rows.
+    """
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return str(self._rows[index.row()][index.column()])
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def rows(self):
+        return self._rows
+
+    def set_rows(self, rows):
+        """
+        Replaces the rows of the table.
+
+        Args:
+            rows (list): Tuples with one value per column.
+        """
+        rows = [tuple(row) for row in rows]
+        if not self._rows or not rows:
+            # Nothing to keep: one reset is cheaper than per-row notifications
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+            return
+
+        common = min(len(self._rows), len(rows))
+        if len(rows) < len(self._rows):
+            self.beginRemoveRows(QModelIndex(), common, len(self._rows) - 1)
+            del self._rows[common:]
+            self.endRemoveRows()
+        elif len(rows) > len(self._rows):
+            self.beginInsertRows(QModelIndex(), common, len(rows) - 1)
+            self._rows.extend(rows[common:])
+            self.endInsertRows()
+
+        for row in range(common):
+            old, new = self._rows[row], rows[row]
+            if old == new:
+                continue
+            changed = [column for column, (a, b) in enumerate(zip(old, new)) if a != b]
+            self._rows[row] = new
+            self.dataChanged.emit(self.index(row, changed[0]), self.index(row, changed[-1]),
+                                  [Qt.ItemDataRole.DisplayRole])
@@ -0,0 +1,430 @@
+# transcript_view.py
+from bisect import bisect_right
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QTimer
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QRegion
+from PyQt6.QtWidgets import QStyledItemDelegate, QAbstractItemView, QFrame, QStyleOptionViewItem
+
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+BUBBLE_MAX_WIDTH = 400
+BUBBLE_PADDING = 8
+BUBBLE_RADIUS = 10
+ROW_MARGIN_H = 10
+ROW_MARGIN_V = 5
+SCROLL_STEP = 20
+
+BUBBLE_COLORS = {
+    "user": (QColor("#48a4f2"), QColor("white")),
+    "assistant": (QColor("#eaeaea"), QColor("black")),
+    "error": (QColor("#ffebee"), QColor("red")),
+}
+MODEL_NAME_COLOR = QColor("#ff007b")
+
+
+class TranscriptModel(QAbstractListModel):
+    """
+    A list model holding the chat transcript, one row per message.
+
+    Streaming replies are appended in pieces; the joined text is built lazily the
+    next time the row is read. Every change bumps a per-row version so the delegate
+    knows when a cached row height is stale.
+
+    Attributes:
+        RoleRole (int): Item role returning "user", "assistant" or "error".
+        ModelNameRole (int): Item role returning the model name shown above a reply.
+        VersionRole (int): Item role returning the row's change counter.
+    Methods:
+        append_message(role, text, model_name=""):
+            Adds a message and returns its row.
+        append_text(row, text):
+            Appends streamed text to a message.
+        set_error(row, text):
+            Replaces a message with an error text.
+        clear():
+            Removes every message.
+    """
+    RoleRole = Qt.ItemDataRole.UserRole + 1
+    ModelNameRole = Qt.ItemDataRole.UserRole + 2
+    VersionRole = Qt.ItemDataRole.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if row["text"] is None:
+                row["text"] = "".join(row["parts"])
+                row["parts"] = [row["text"]]
+            return row["text"]
+        if role == self.RoleRole:
+            return row["role"]
+        if role == self.ModelNameRole:
+            return row["model_name"]
+        if role == self.VersionRole:
+            return row["version"]
+        return None
+
+    def append_message(self, role, text, model_name=""):
+        """
+        Adds a message at the end of the transcript.
+
+        Args:
+            role (str): "user" or "assistant".
+            text (str): The message text.
+            model_name (str, optional): Shown above assistant replies.
+
+        Returns:
+            int: The row of the new message.
+        """
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append({"role": role, "parts": [text], "text": text,
+                           "model_name": model_name, "version": 0})
+        self.endInsertRows()
+        return row
+
+    def append_text(self, row, text):
+        """
+        Appends streamed text to an existing message.
+
+        Args:
+            row (int): The message row.
+            text (str): The text to append.
+        """
+        if not text or not 0 <= row < len(self._rows):
+            return
+        entry = self._rows[row]
+        entry["parts"].append(text)
+        entry["text"] = None
+        self._touch(row)
+
+    def set_error(self, row, text):
+        """
+        Turns a message into an error bubble.
+
+        Args:
+            row (int): The message row.
+            text (str): The error text.
+        """
+        if not 0 <= row < len(self._rows):
+            return
+        entry = self._rows[row]
+        entry.update(role="error", parts=[text], text=text)
+        self._touch(row)
+
+    def _touch(self, row):
+        self._rows[row]["version"] += 1
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def clear(self):
+        """
+        Removes every message from the transcript.
+        """
+        self.beginResetModel()
+        self._rows = []
+        self.endResetModel()
+
+
+class BubbleDelegate(QStyledItemDelegate):
+    """
+    Paints transcript rows as chat bubbles and caches their measured heights.
+
+    A row is measured once per (version, width); scrolling through an unchanged
+    transcript never lays out text again, and only visible rows are painted.
+    """
+    TEXT_FLAGS = Qt.TextFlag.TextWordWrap.value | Qt.TextFlag.TextExpandTabs.value
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cache = {}
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _measure(self, option, index):
+        view = self.parent()
+        width = view.viewport().width() if view is not None else option.rect.width()
+        if width <= 0:
+            width = BUBBLE_MAX_WIDTH + 2 * ROW_MARGIN_H
+        key = (index.data(TranscriptModel.VersionRole), width)
+        cached = self._cache.get(index.row())
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        metrics = QFontMetrics(option.font)
+        available = max(40, min(BUBBLE_MAX_WIDTH, width - 2 * ROW_MARGIN_H) - 2 * BUBBLE_PADDING)
+        text = index.data(Qt.ItemDataRole.DisplayRole) or " "
+        text_rect = metrics.boundingRect(QRect(0, 0, available, 10 ** 7), self.TEXT_FLAGS, text)
+        header_height = metrics.height() + 2 if index.data(TranscriptModel.ModelNameRole) else 0
+        layout = (header_height, min(text_rect.width(), available), text_rect.height())
+        self._cache[index.row()] = (key, layout)
+        return layout
+
+    def sizeHint(self, option, index):
+        header_height, _, text_height = self._measure(option, index)
+        return QSize(max(option.rect.width(), 1),
+                     header_height + text_height + 2 * BUBBLE_PADDING + 2 * ROW_MARGIN_V)
+
+    def paint(self, painter, option, index):
+        header_height, text_width, text_height = self._measure(option, index)
+        role = index.data(TranscriptModel.RoleRole)
+        background, foreground = BUBBLE_COLORS.get(role, BUBBLE_COLORS["assistant"])
+        rect = option.rect
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        model_name = index.data(TranscriptModel.ModelNameRole)
+        if model_name:
+            header_font = QFont(option.font)
+            header_font.setBold(True)
+            painter.setFont(header_font)
+            painter.setPen(MODEL_NAME_COLOR)
+            painter.drawText(QRect(rect.left() + ROW_MARGIN_H, rect.top() + ROW_MARGIN_V,
+                                   rect.width() - 2 * ROW_MARGIN_H, header_height),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, model_name)
+            painter.setFont(option.font)
+
+        bubble_width = text_width + 2 * BUBBLE_PADDING
+        if role == "user":
+            left = rect.right() - ROW_MARGIN_H - bubble_width
+        else:
+            left = rect.left() + ROW_MARGIN_H
+        bubble = QRectF(left, rect.top() + ROW_MARGIN_V + header_height,
+                        bubble_width, text_height + 2 * BUBBLE_PADDING)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(bubble, BUBBLE_RADIUS, BUBBLE_RADIUS)
+
+        painter.setPen(foreground)
+        alignment = Qt.AlignmentFlag.AlignRight if role == "user" else Qt.AlignmentFlag.AlignLeft
+        painter.drawText(bubble.adjusted(BUBBLE_PADDING, BUBBLE_PADDING, -BUBBLE_PADDING, -BUBBLE_PADDING),
+                         self.TEXT_FLAGS | alignment.value,
+                         index.data(Qt.ItemDataRole.DisplayRole) or "")
+        painter.restore()
+
+
+class TranscriptView(QAbstractItemView):
+    """
+    A virtualized chat transcript.
+
+    The view keeps the height and top offset of every row. A message that grows
+    while streaming is measured again on its own, and only the offsets of the rows
+    below it move; that is none for the last message. Only the visible rows are
+    painted, so the view stays responsive with tens of thousands of messages.
+    Every row is measured again only when the width changes. While the view is
+    scrolled to the bottom it follows new and growing messages.
+
+    Attributes:
+        transcript (TranscriptModel): The model holding the messages.
+        delegate (BubbleDelegate): The delegate painting the bubbles.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.transcript = TranscriptModel(self)
+        self.delegate = BubbleDelegate(self)
+        self._heights = []
+        self._offsets = []
+        self._laid_out_width = None
+        # First row whose height is still to be measured, or None
+        self._unmeasured_from = None
+        self._measure_timer = QTimer(self)
+        self._measure_timer.setSingleShot(True)
+        self._measure_timer.setInterval(0)
+        self._measure_timer.timeout.connect(self._measure_pending)
+        self.setModel(self.transcript)
+        self.setItemDelegate(self.delegate)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+
+        self._follow = True
+        scrollbar = self.verticalScrollBar()
+        scrollbar.setSingleStep(SCROLL_STEP)
+        scrollbar.valueChanged.connect(self._on_scrolled)
+        scrollbar.rangeChanged.connect(self._on_range_changed)
+
+    def _on_scrolled(self, value):
+        self._follow = value >= self.verticalScrollBar().maximum() - 4
+
+    def _on_range_changed(self, minimum, maximum):
+        if self._follow:
+            self.verticalScrollBar().setValue(maximum)
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # ROW GEOMETRY
+    # /////////////////////////////////////////////////////////////////////////////////////
+    def _item_option(self):
+        option = QStyleOptionViewItem()
+        self.initViewItemOption(option)
+        return option
+
+    def _measure_rows(self, start, end):
+        option = self._item_option()
+        return [self.delegate.sizeHint(option, self.transcript.index(row)).height()
+                for row in range(start, end)]
+
+    def _content_height(self):
+        # Only the rows measured so far have offsets
+        return self._offsets[-1] + self._heights[len(self._offsets) - 1] if self._offsets else 0
+
+    def _update_offsets(self, start):
+        # Offsets above `start` are unchanged; recompute the ones from there down
+        top = self._offsets[start - 1] + self._heights[start - 1] if start > 0 else 0
+        del self._offsets[start:]
+        for height in self._heights[start:]:
+            self._offsets.append(top)
+            top += height
+
+    def _layout_all(self):
+        self._laid_out_width = self.viewport().width()
+        self._unmeasured_from = None
+        self._measure_timer.stop()
+        self._heights = self._measure_rows(0, self.transcript.rowCount())
+        self._offsets = []
+        self._update_offsets(0)
+        self.updateGeometries()
+        self.viewport().update()
+
+    def _measure_pending(self):
+        self._measure_timer.stop()
+        start = self._unmeasured_from
+        if start is None:
+            return
+        self._unmeasured_from = None
+        self._heights[start:] = self._measure_rows(start, len(self._heights))
+        self._update_offsets(start)
+        self.updateGeometries()
+        self.viewport().update()
+
+    def reset(self):
+        self.delegate.clear_cache()
+        super().reset()
+        self._layout_all()
+
+    def rowsInserted(self, parent, start, end):
+        super().rowsInserted(parent, start, end)
+        if start < len(self._heights):
+            # Rows below moved; the delegate caches heights by row
+            self.delegate.clear_cache()
+        # Measured together once control returns to the event loop, so a burst of
+        # appends lays out once
+        self._heights[start:start] = [0] * (end + 1 - start)
+        del self._offsets[start:]
+        if self._unmeasured_from is None or start < self._unmeasured_from:
+            self._unmeasured_from = start
+        self._measure_timer.start()
+
+    def rowsAboutToBeRemoved(self, parent, start, end):
+        super().rowsAboutToBeRemoved(parent, start, end)
+        self._measure_pending()
+        self.delegate.clear_cache()
+        del self._heights[start:end + 1]
+        self._update_offsets(start)
+        self.updateGeometries()
+        self.viewport().update()
+
+    def dataChanged(self, top_left, bottom_right, roles=()):
+        super().dataChanged(top_left, bottom_right, roles)
+        self._measure_pending()
+        # A growing message changes its height; measure that row only
+        start, end = top_left.row(), bottom_right.row() + 1
+        heights = self._measure_rows(start, end)
+        if heights != self._heights[start:end]:
+            self._heights[start:end] = heights
+            self._update_offsets(start)
+            self.updateGeometries()
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.viewport().width() != self._laid_out_width:
+            self._layout_all()
+        else:
+            self.updateGeometries()
+
+    def updateGeometries(self):
+        viewport_height = self.viewport().height()
+        scrollbar = self.verticalScrollBar()
+        scrollbar.setPageStep(viewport_height)
+        scrollbar.setRange(0, max(0, self._content_height() - viewport_height))
+        super().updateGeometries()
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # QAbstractItemView INTERFACE
+    # /////////////////////////////////////////////////////////////////////////////////////
+    def visualRect(self, index):
+        if not index.isValid() or not 0 <= index.row() < len(self._offsets):
+            return QRect()
+        row = index.row()
+        return QRect(0, self._offsets[row] - self.verticalOffset(), self.viewport().width(), self._heights[row])
+
+    def indexAt(self, point):
+        y = point.y() + self.verticalOffset()
+        row = bisect_right(self._offsets, y) - 1
+        if 0 <= row < len(self._offsets) and y < self._offsets[row] + self._heights[row]:
+            return self.transcript.index(row)
+        return QModelIndex()
+
+    def scrollTo(self, index, hint=QAbstractItemView.ScrollHint.EnsureVisible):
+        rect = self.visualRect(index)
+        if not rect.isValid():
+            return
+        scrollbar = self.verticalScrollBar()
+        if hint == QAbstractItemView.ScrollHint.PositionAtTop or rect.top() < 0:
+            scrollbar.setValue(scrollbar.value() + rect.top())
+        elif hint == QAbstractItemView.ScrollHint.PositionAtBottom or rect.bottom() > self.viewport().height():
+            scrollbar.setValue(scrollbar.value() + min(rect.top(), rect.bottom() - self.viewport().height()))
+        elif hint == QAbstractItemView.ScrollHint.PositionAtCenter:
+            scrollbar.setValue(scrollbar.value() + rect.center().y() - self.viewport().height() // 2)
+
+    def horizontalOffset(self):
+        return 0
+
+    def verticalOffset(self):
+        return self.verticalScrollBar().value()
+
+    def moveCursor(self, cursor_action, modifiers):
+        return self.currentIndex()
+
+    def isIndexHidden(self, index):
+        return False
+
+    def setSelection(self, rect, command):
+        pass
+
+    def visualRegionForSelection(self, selection):
+        return QRegion()
+
+    def paintEvent(self, event):
+        if not self._offsets:
+            return
+        painter = QPainter(self.viewport())
+        option = self._item_option()
+        top = self.verticalOffset()
+        area = event.rect()
+        row = max(0, bisect_right(self._offsets, top + area.top()) - 1)
+        while row < len(self._offsets) and self._offsets[row] <= top + area.bottom():
+            index = self.transcript.index(row)
+            option.rect = self.visualRect(index)
+            self.delegate.paint(painter, option, index)
+            row += 1
+        painter.end()
+
+    def message_at(self, position):
+        """
+        Returns the text of the message under a viewport position, or an empty string.
+        """
+        index = self.indexAt(position)
+        return index.data(Qt.ItemDataRole.DisplayRole) if index.isValid() else ""
@@ -1,7 +1,10 @@
 # ui_components.py
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTextEdit, QLineEdit, QPushButton, QStatusBar, QProgressBar
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTextEdit, QLineEdit, QPushButton, QStatusBar, QProgressBar,
+    QSpinBox, QCheckBox
 )
+from PyQt6.QtGui import QKeySequence, QShortcut
+from QtOllama.utility.constants import CONTEXT_LENGTH_DEFAULT, CONTEXT_LENGTH_MIN, CONTEXT_LENGTH_MAX
 from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
@@ -37,6 +40,8 @@ class UIComponents:
         Initializes the user interface components for the main window.
         This method sets up the main layout and various UI elements including:
         - A combo box for model selection.
+        - A spin box for the context length.
+        - A check box that turns on compaction of old turns into a summary.
         - A text edit area for chat display.
         - An input field and send button for user input.
         - Multiple buttons for various functionalities such as:
@@ -49,7 +54,9 @@ class UIComponents:
             - Viewing statistics
             - Generating word cloud
             - Viewing historical stats
-        - A status bar with a status message, progress bar, and additional info label.
+        - A Ctrl+K shortcut for the command palette.
+        - A status bar with a status message, progress bar, request queue label, request metrics label
+          and additional info label.
         The layout is organized using QVBoxLayout and QHBoxLayout to structure the widgets.
         """
         try:
@@ -60,6 +67,20 @@ class UIComponents:
             self.main_window.model_combo = QComboBox()
             top_layout.addWidget(model_label)
             top_layout.addWidget(self.main_window.model_combo)
+            context_label = QLabel("Context:")
+            self.main_window.context_length_spinner = QSpinBox()
+            self.main_window.context_length_spinner.setRange(CONTEXT_LENGTH_MIN, CONTEXT_LENGTH_MAX)
+            self.main_window.context_length_spinner.setSingleStep(512)
+            self.main_window.context_length_spinner.setValue(CONTEXT_LENGTH_DEFAULT)
+            self.main_window.context_length_spinner.setSuffix(" tokens")
+            self.main_window.context_length_spinner.setToolTip("Context length (num_ctx) sent to the model")
+            top_layout.addWidget(context_label)
+            top_layout.addWidget(self.main_window.context_length_spinner)
+            self.main_window.compaction_checkbox = QCheckBox("Compact")
+            self.main_window.compaction_checkbox.setToolTip(
+                "Summarize the oldest turns in the background once the context fills up"
+            )
+            top_layout.addWidget(self.main_window.compaction_checkbox)
 
             self.main_window.chat_display = QTextEdit()
 
@@ -110,10 +131,16 @@ class UIComponents:
             self.main_window.status_layout.addWidget(self.main_window.status_message)
             self.main_window.status_layout.addWidget(self.main_window.progress_bar)
             self.main_window.status_bar.addPermanentWidget(self.main_window.status_widget)
+            self.main_window.queue_label = QLabel(self.main_window)
+            self.main_window.status_bar.addPermanentWidget(self.main_window.queue_label)
+            self.main_window.metrics_label = QLabel(self.main_window)
+            self.main_window.status_bar.addPermanentWidget(self.main_window.metrics_label)
             self.main_window.info_label = QLabel(self.main_window)
             self.main_window.status_bar.addPermanentWidget(self.main_window.info_label)
             self.main_window.setStatusBar(self.main_window.status_bar)
 
+            self.main_window.command_palette_shortcut = QShortcut(QKeySequence("Ctrl+K"), self.main_window)
+
             logger.info("UI initialized successfully.")
         except Exception as e:
             logger.error(f"Error initializing UI in ui_component.py: {e}", exc_info=True)
@@ -1,11 +1,14 @@
 import sys
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton, QLabel, QGraphicsView, QGraphicsScene
 from PyQt6.QtGui import QPixmap
-from wordcloud import WordCloud
+from wordcloud import WordCloud, STOPWORDS
 import matplotlib.pyplot as plt
 from io import BytesIO
 from .frameless_dialog_window import FramelessDialog
 from .wrap_style import stylesheet
+from QtOllama.utility.text_analysis import analyze_text
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
 
 
 
@@ -61,7 +64,7 @@ class WordCloudDialog(FramelessDialog, QDialog):
         Generates a word cloud from the text in the text editor and displays it in the graphics view.
         This method performs the following steps:
         1. Retrieves text from the text editor widget.
-        2. Generates a word cloud image using the retrieved text.
+        2. Generates a word cloud image from the word frequencies of the shared text analysis.
         3. Creates a matplotlib figure to display the word cloud.
         4. Saves the figure to a BytesIO object.
         5. Converts the saved image to a QPixmap.
@@ -76,7 +79,8 @@ class WordCloudDialog(FramelessDialog, QDialog):
             logger.debug("Retrieved text from text editor widget.")
             
             # Generate word cloud
-            wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
+            frequencies = analyze_text(text).word_frequencies(STOPWORDS)
+            wordcloud = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(frequencies)
             logger.debug("Generated word cloud.")
             
             # Create a matplotlib figure
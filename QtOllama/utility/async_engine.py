@@ -0,0 +1,596 @@
+# async_engine.py
+import asyncio
+import itertools
+import json
+import os
+import ssl
+import threading
+import time
+import urllib.parse
+from typing import AsyncGenerator, Dict
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from QtOllama.utility.constants import (
+    OLLAMA_HOST_DEFAULT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_POOL_SIZE,
+)
+from QtOllama.utility.stream_channel import StreamChannel
+from QtOllama.utility.request_metrics import request_metrics, get_metrics_store
+from QtOllama.utility.logger_setup import create_logger, LogSampler
+logger = create_logger(__name__)
+chunk_sampler = LogSampler()
+
+
+class OllamaError(Exception):
+    """
+    Raised when the Ollama server answers with an HTTP error status.
+
+    Attributes:
+        status (int): The HTTP status code returned by the server.
+    """
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def chat_text(record):
+    """
+    Returns the streamed text of an /api/chat record.
+    """
+    return record.get("message", {}).get("content", "")
+
+
+def generate_text(record):
+    """
+    Returns the streamed text of an /api/generate record.
+    """
+    return record.get("response", "")
+
+
+class AsyncOllamaClient:
+    """
+    A keep-alive HTTP/1.1 client for the Ollama REST API running on asyncio.
+
+    Idle connections are pooled per client and reused; every in-flight request holds
+    its own connection, so any number of streams run concurrently on one event loop
+    without a thread per request. The client must only be used from its event loop.
+
+    Attributes:
+        host (str): The base URL of the Ollama server.
+        connect_timeout (float): Seconds to wait while establishing a connection.
+        read_timeout (float): Seconds to wait for data on an established connection.
+        pool_size (int): Maximum number of idle connections kept for reuse.
+    Methods:
+        request(method, path, payload=None):
+            Sends a request and returns the decoded JSON body.
+        stream(method, path, payload=None):
+            Sends a request and yields every NDJSON record of the response.
+        close():
+            Closes every idle pooled connection.
+    """
+    def __init__(self,
+                 host=OLLAMA_HOST_DEFAULT,
+                 connect_timeout=HTTP_CONNECT_TIMEOUT,
+                 read_timeout=HTTP_READ_TIMEOUT,
+                 pool_size=HTTP_POOL_SIZE):
+        self.host = host.rstrip("/")
+        parts = urllib.parse.urlsplit(self.host if "://" in self.host else "http://" + self.host)
+        self._ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self._hostname = parts.hostname or "127.0.0.1"
+        self._port = parts.port or (443 if self._ssl else 11434)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_size = pool_size
+        self._idle = []
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # CONNECTION POOL
+    # /////////////////////////////////////////////////////////////////////////////////////
+    async def _acquire(self):
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return (reader, writer), True
+            writer.close()
+        conn = await asyncio.wait_for(
+            asyncio.open_connection(self._hostname, self._port, ssl=self._ssl),
+            self.connect_timeout)
+        return conn, False
+
+    def _release(self, conn):
+        if len(self._idle) < self.pool_size and not conn[1].is_closing():
+            self._idle.append(conn)
+        else:
+            conn[1].close()
+
+    @staticmethod
+    def _discard(conn):
+        conn[1].close()
+
+    async def _read(self, awaitable):
+        return await asyncio.wait_for(awaitable, self.read_timeout)
+
+    async def _send(self, method, path, payload=None):
+        """
+        Writes a request on a pooled connection and reads the response head.
+
+        A pooled connection may have been closed by the server while idle; in that
+        case the request is retried once on a fresh connection.
+
+        Returns:
+            tuple: (connection, status code, lower-cased header dictionary).
+        """
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self._hostname}:{self._port}\r\n"
+                "Connection: keep-alive\r\n"
+                "Accept: application/x-ndjson, application/json\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode("ascii")
+        for attempt in range(2):
+            conn, reused = await self._acquire()
+            reader, writer = conn
+            try:
+                writer.write(head + body)
+                await writer.drain()
+                status_line = await self._read(reader.readline())
+                if not status_line:
+                    raise ConnectionResetError("Connection closed by the server")
+                status = int(status_line.split()[1])
+                headers = {}
+                while True:
+                    line = await self._read(reader.readline())
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                self._discard(conn)
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                self._discard(conn)
+                raise
+            return conn, status, headers
+        raise OllamaError("Unable to reach the Ollama server")
+
+    async def _body_chunks(self, reader, headers) -> AsyncGenerator[bytes, None]:
+        """
+        Yields the raw body of a response, decoding chunked transfer encoding.
+        """
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await self._read(reader.readline())
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await self._read(reader.readline())) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                data = await self._read(reader.readexactly(size))
+                await self._read(reader.readexactly(2))
+                yield data
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining > 0:
+                data = await self._read(reader.read(min(remaining, 65536)))
+                if not data:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(data)
+                yield data
+        else:
+            while True:
+                data = await self._read(reader.read(65536))
+                if not data:
+                    return
+                yield data
+
+    @staticmethod
+    def _reusable(headers):
+        return (headers.get("connection", "").lower() != "close"
+                and ("content-length" in headers
+                     or headers.get("transfer-encoding", "").lower() == "chunked"))
+
+    @staticmethod
+    def _error_message(data, status):
+        try:
+            return json.loads(data.decode("utf-8")).get("error") or f"HTTP {status}"
+        except (ValueError, AttributeError):
+            return f"HTTP {status}"
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # REQUESTS
+    # /////////////////////////////////////////////////////////////////////////////////////
+    async def request(self, method, path, payload=None) -> Dict:
+        """
+        Sends a non-streaming request.
+
+        Returns:
+            dict: The decoded JSON response, or an empty dict for an empty body.
+
+        Raises:
+            OllamaError: If the server answers with an error status.
+        """
+        conn, status, headers = await self._send(method, path, payload)
+        try:
+            data = b"".join([chunk async for chunk in self._body_chunks(conn[0], headers)])
+        except BaseException:
+            self._discard(conn)
+            raise
+        if self._reusable(headers):
+            self._release(conn)
+        else:
+            self._discard(conn)
+        if status >= 400:
+            raise OllamaError(self._error_message(data, status), status=status)
+        return json.loads(data.decode("utf-8")) if data.strip() else {}
+
+    async def stream(self, method, path, payload=None) -> AsyncGenerator[Dict, None]:
+        """
+        Sends a streaming request and yields the NDJSON records as they arrive.
+
+        The connection returns to the pool only when the stream is read to the end;
+        a cancelled stream closes its connection, which tells the server to stop generating.
+
+        Yields:
+            dict: One decoded record per line of the response.
+        """
+        conn, status, headers = await self._send(method, path, payload)
+        completed = False
+        try:
+            if status >= 400:
+                data = b"".join([chunk async for chunk in self._body_chunks(conn[0], headers)])
+                completed = True
+                raise OllamaError(self._error_message(data, status), status=status)
+            pending = b""
+            async for data in self._body_chunks(conn[0], headers):
+                pending += data
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line.decode("utf-8"))
+                    if "error" in record:
+                        raise OllamaError(record["error"])
+                    yield record
+            if pending.strip():
+                record = json.loads(pending.decode("utf-8"))
+                if "error" in record:
+                    raise OllamaError(record["error"])
+                yield record
+            completed = True
+        finally:
+            if completed and self._reusable(headers):
+                self._release(conn)
+            else:
+                self._discard(conn)
+
+    def close(self):
+        """
+        Closes every idle connection held by the pool.
+        """
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+class StreamHandle:
+    """
+    The GUI-side view of one request submitted to the AsyncStreamingEngine.
+
+    Attributes:
+        request_id (int): The id used on the StreamBridge signals.
+        channel (StreamChannel): The bounded channel receiving streamed text, or None
+            when the request was submitted without rendering.
+        text (str): The full streamed text, set when the request ends.
+        final (dict): The last record (the "done" record for generations).
+        result (dict): The decoded response of a non-streaming request.
+        cancelled (bool): Whether the request was cancelled.
+        error (str): The error message if the request failed.
+        status (int): The HTTP status of a failed request, when the server sent one.
+        model (str): The model of a chat or generate request.
+        label (str): What the request is for, e.g. the capability; used in metrics.
+        metrics (dict): The latency and throughput of a finished chat or generate
+            request, see request_metrics().
+        submitted_at, first_chunk_at, finished_at (float): perf_counter timestamps.
+    Methods:
+        cancel():
+            Cancels the request; the partial text is still delivered.
+    """
+    def __init__(self, engine, request_id, render=True):
+        self._engine = engine
+        self.request_id = request_id
+        self.channel = StreamChannel() if render else None
+        self.text = ""
+        self.final = {}
+        self.result = {}
+        self.cancelled = False
+        self.error = None
+        self.status = None
+        self.model = None
+        self.label = None
+        self.metrics = None
+        self.submitted_at = time.perf_counter()
+        self.first_chunk_at = None
+        self.finished_at = None
+        self._task = None
+
+    def cancel(self):
+        """
+        Cancels the request; safe to call more than once and after it ended.
+        """
+        self._engine._cancel(self)
+
+
+class StreamBridge(QObject):
+    """
+    The single bridge carrying engine events from the asyncio thread to the GUI thread.
+
+    Signals are emitted from the engine thread and delivered as queued connections on
+    the GUI thread. Streamed text itself travels through each handle's StreamChannel,
+    which renderers drain once per frame.
+
+    Signals:
+        started (int): The request was sent to the server.
+        first_chunk (int): The first piece of text arrived.
+        finished (int): The request ended (completed or cancelled).
+        failed (int, str): The request failed with an error message.
+    """
+    started = pyqtSignal(int)
+    first_chunk = pyqtSignal(int)
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(int, str)
+
+
+class AsyncStreamingEngine:
+    """
+    Runs every Ollama request of the application on one asyncio event loop.
+
+    The loop lives in a single background thread and multiplexes any number of
+    concurrent streams over pooled keep-alive connections; results reach the widgets
+    through one StreamBridge. Callbacks passed at submission run on the GUI thread.
+
+    Methods:
+        stream(path, payload, ...):
+            Starts a streaming request and returns its StreamHandle.
+        chat(model, messages, ...), generate(model, prompt, ...):
+            Convenience wrappers around stream().
+        request(method, path, payload=None, ...):
+            Starts a non-streaming request and returns its StreamHandle.
+        active_count():
+            Returns the number of requests still running.
+        shutdown():
+            Cancels everything and stops the event loop.
+    """
+    def __init__(self):
+        self.bridge = StreamBridge()
+        self.bridge.finished.connect(self._dispatch_finished)
+        self.bridge.failed.connect(self._dispatch_failed)
+        self._ids = itertools.count(1)
+        self._requests = {}
+        self._clients = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="ollama-async-engine", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _client(self, host):
+        host = (host or os.environ.get("OLLAMA_HOST") or OLLAMA_HOST_DEFAULT).rstrip("/")
+        client = self._clients.get(host)
+        if client is None:
+            client = AsyncOllamaClient(host)
+            self._clients[host] = client
+            logger.info("Created async Ollama client for %s", host)
+        return client
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # SUBMISSION (GUI THREAD)
+    # /////////////////////////////////////////////////////////////////////////////////////
+    def _submit(self, coroutine_factory, render, on_finished, on_error, model=None, label=None):
+        handle = StreamHandle(self, next(self._ids), render=render)
+        handle.model = model
+        handle.label = label
+        self._requests[handle.request_id] = (handle, on_finished, on_error)
+        asyncio.run_coroutine_threadsafe(coroutine_factory(handle), self._loop)
+        return handle
+
+    def stream(self, path, payload, host=None, text_of=chat_text, render=True,
+               on_finished=None, on_error=None, model=None, label=None) -> StreamHandle:
+        """
+        Starts a streaming request.
+
+        Args:
+            path (str): The API path, e.g. "/api/chat".
+            payload (dict): The JSON body; "stream" is forced to True.
+            host (str, optional): The server URL. Defaults to $OLLAMA_HOST or OLLAMA_HOST_DEFAULT.
+            text_of (callable): Extracts the streamed text from a record.
+            render (bool): Whether the text is also queued on the handle's channel.
+            on_finished (callable, optional): Called with the handle when the stream ends.
+            on_error (callable, optional): Called with the handle and the message on failure.
+            model (str, optional): The model generating; requests with a model get metrics.
+            label (str, optional): What the request is for, e.g. the capability.
+
+        Returns:
+            StreamHandle: The handle of the request.
+        """
+        payload = dict(payload, stream=True)
+        return self._submit(lambda handle: self._run_stream(handle, host, path, payload, text_of),
+                            render, on_finished, on_error, model=model, label=label)
+
+    def chat(self, model, messages, options=None, host=None, **kwargs) -> StreamHandle:
+        """
+        Streams /api/chat. Keyword arguments other than the stream() ones go into the payload.
+        """
+        stream_kwargs = self._stream_kwargs(kwargs)
+        payload = {"model": model, "messages": messages, **kwargs}
+        if options:
+            payload["options"] = options
+        return self.stream("/api/chat", payload, host=host, text_of=chat_text, model=model, **stream_kwargs)
+
+    def generate(self, model, prompt, options=None, host=None, **kwargs) -> StreamHandle:
+        """
+        Streams /api/generate. Keyword arguments other than the stream() ones go into the payload.
+        """
+        stream_kwargs = self._stream_kwargs(kwargs)
+        payload = {"model": model, "prompt": prompt, **kwargs}
+        if options:
+            payload["options"] = options
+        return self.stream("/api/generate", payload, host=host, text_of=generate_text, model=model, **stream_kwargs)
+
+    @staticmethod
+    def _stream_kwargs(kwargs):
+        return {name: kwargs.pop(name) for name in ("render", "on_finished", "on_error", "label") if name in kwargs}
+
+    def request(self, method, path, payload=None, host=None,
+                on_finished=None, on_error=None) -> StreamHandle:
+        """
+        Starts a non-streaming request; the decoded body ends up in handle.result.
+        """
+        return self._submit(lambda handle: self._run_request(handle, host, method, path, payload),
+                            False, on_finished, on_error)
+
+    def active_count(self):
+        """
+        Returns the number of submitted requests whose completion was not yet delivered.
+        """
+        return len(self._requests)
+
+    def _cancel(self, handle):
+        handle.cancelled = True
+        self._loop.call_soon_threadsafe(self._cancel_in_loop, handle)
+
+    @staticmethod
+    def _cancel_in_loop(handle):
+        # A request whose task did not start yet sees the flag when it does
+        if handle._task is not None and not handle._task.done():
+            handle._task.cancel()
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # EXECUTION (ENGINE THREAD)
+    # /////////////////////////////////////////////////////////////////////////////////////
+    async def _run_stream(self, handle, host, path, payload, text_of):
+        handle._task = asyncio.current_task()
+        parts = []
+        try:
+            if not handle.cancelled:
+                self.bridge.started.emit(handle.request_id)
+                records = self._client(host).stream("POST", path, payload)
+                try:
+                    async for record in records:
+                        text = text_of(record)
+                        if text:
+                            if handle.first_chunk_at is None:
+                                handle.first_chunk_at = time.perf_counter()
+                                self.bridge.first_chunk.emit(handle.request_id)
+                            parts.append(text)
+                            chunk_sampler.debug(logger, "Request %d: chunk of %d chars", handle.request_id, len(text))
+                            if handle.channel is not None:
+                                await self._offer(handle.channel, text)
+                        if record.get("done"):
+                            handle.final = record
+                finally:
+                    # Closes the connection at once if we stopped reading early
+                    await records.aclose()
+        except asyncio.CancelledError:
+            handle.cancelled = True
+        except Exception as e:
+            handle.status = getattr(e, "status", None)
+            self._end(handle, parts)
+            self.bridge.failed.emit(handle.request_id, str(e) or type(e).__name__)
+            return
+        self._end(handle, parts)
+        self.bridge.finished.emit(handle.request_id)
+
+    async def _run_request(self, handle, host, method, path, payload):
+        handle._task = asyncio.current_task()
+        try:
+            if not handle.cancelled:
+                self.bridge.started.emit(handle.request_id)
+                handle.result = await self._client(host).request(method, path, payload)
+        except asyncio.CancelledError:
+            handle.cancelled = True
+        except Exception as e:
+            handle.status = getattr(e, "status", None)
+            self._end(handle, [])
+            self.bridge.failed.emit(handle.request_id, str(e) or type(e).__name__)
+            return
+        self._end(handle, [])
+        self.bridge.finished.emit(handle.request_id)
+
+    @staticmethod
+    async def _offer(channel, text):
+        # Backpressure without blocking the loop: only this stream waits for its consumer
+        if channel.try_put(text):
+            return
+        stalled_at = time.perf_counter()
+        while not channel.try_put(text):
+            await asyncio.sleep(0.005)
+        channel.add_stall(time.perf_counter() - stalled_at)
+
+    @staticmethod
+    def _end(handle, parts):
+        handle.text = "".join(parts)
+        handle.finished_at = time.perf_counter()
+        if handle.channel is not None:
+            handle.channel.close()
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # DELIVERY (GUI THREAD)
+    # /////////////////////////////////////////////////////////////////////////////////////
+    def _dispatch_finished(self, request_id):
+        handle, on_finished, _ = self._requests.pop(request_id, (None, None, None))
+        if handle is not None and handle.model is not None:
+            handle.metrics = request_metrics(handle)
+            if handle.metrics is not None:
+                get_metrics_store().record(handle.metrics)
+        if handle is not None and on_finished is not None:
+            try:
+                on_finished(handle)
+            except Exception as e:
+                logger.error("Error in completion callback of request %d: %s", request_id, e, exc_info=True)
+
+    def _dispatch_failed(self, request_id, message):
+        handle, _, on_error = self._requests.pop(request_id, (None, None, None))
+        if handle is None:
+            return
+        handle.error = message
+        logger.error("Request %d failed: %s", request_id, message)
+        if on_error is not None:
+            try:
+                on_error(handle, message)
+            except Exception as e:
+                logger.error("Error in error callback of request %d: %s", request_id, e, exc_info=True)
+
+    def shutdown(self):
+        """
+        Cancels every running request and stops the event loop thread.
+        """
+        for handle, _, _ in list(self._requests.values()):
+            handle.cancel()
+
+        def stop():
+            for client in self._clients.values():
+                client.close()
+            self._loop.stop()
+        self._loop.call_soon_threadsafe(stop)
+        self._thread.join(timeout=2.0)
+
+
+_engine = None
+
+
+def get_engine() -> AsyncStreamingEngine:
+    """
+    Returns the application-wide streaming engine, starting it on first use.
+
+    Must first be called from the GUI thread so the bridge lives there.
+    """
+    global _engine
+    if _engine is None:
+        _engine = AsyncStreamingEngine()
+    return _engine
@@ -0,0 +1,181 @@
+# capability_registry.py
+import json
+import os
+import re
+import sys
+from types import MappingProxyType
+from typing import NamedTuple, Optional, Tuple
+
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+CAPABILITIES_FILE = os.path.join(os.path.dirname(__file__), "capabilities.json")
+
+
+class Capability(NamedTuple):
+    """
+    One entry of the capability taxonomy.
+
+    Attributes:
+        id (str): Stable identifier derived from the category path and name,
+            e.g. "analyze.prose.textual.sentiment-analysis".
+        name (str): The display name, also the analysis type put into prompts.
+        path (tuple): The category path, e.g. ("Analyze", "Prose", "Textual").
+        template (str): The prompt template, with {name} and {text} placeholders.
+    """
+    id: str
+    name: str
+    path: Tuple[str, ...]
+    template: str
+
+    def prompt(self, text):
+        return self.template.format(name=self.name, text=text)
+
+
+def slug(value):
+    """
+    Returns the lowercase, dash-separated form of a name used in capability ids.
+    """
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+
+
+class CapabilityRegistry:
+    """
+    An immutable, indexed view of the capability taxonomy.
+
+    The taxonomy is read once from a JSON data file; every string is interned and
+    every collection is a tuple or a read-only mapping, so the registry can be
+    shared freely. Lookups by id, by category path and by name go through indexes
+    built at load time, and menu trees, searches and prompts are built from them
+    without copying the data.
+
+    Attributes:
+        default_template (str): The prompt template of categories without their own.
+        capabilities (tuple): Every Capability in taxonomy order.
+        categories (tuple): Every category path in taxonomy order.
+    Methods:
+        get(capability_id):
+            Returns a capability by id, or None.
+        lookup(path, name):
+            Returns the capability with a name in a category, or None.
+        by_name(name):
+            Returns every capability with a name, in any category.
+        category(path):
+            Returns the capabilities of a category.
+        category_for_method(method):
+            Returns the category path served by a legacy Capabilities method.
+        menu_tree():
+            Returns the taxonomy as nested dictionaries of name lists.
+        prompt(name_or_id, text):
+            Builds the prompt applying a capability to a text.
+    """
+    def __init__(self, data):
+        templates = data.get("templates", {})
+        default_template = sys.intern(templates.get(data.get("default_template"), "{name}: '{text}'"))
+        self.default_template = default_template
+        capabilities = []
+        by_path = {}
+        methods = {}
+        for category in data.get("categories", []):
+            path = tuple(sys.intern(part) for part in category["path"])
+            template = sys.intern(templates.get(category.get("template"), default_template))
+            prefix = ".".join(slug(part) for part in path)
+            entries = tuple(
+                Capability(sys.intern(f"{prefix}.{slug(name)}"), sys.intern(name), path, template)
+                for name in category.get("items", [])
+            )
+            by_path[path] = entries
+            capabilities.extend(entries)
+            if category.get("method"):
+                methods[category["method"]] = path
+        self.capabilities = tuple(capabilities)
+        self.categories = tuple(by_path)
+        self._by_id = MappingProxyType({capability.id: capability for capability in capabilities})
+        self._by_path = MappingProxyType(by_path)
+        self._methods = MappingProxyType(methods)
+        by_name = {}
+        for capability in capabilities:
+            by_name.setdefault(capability.name, []).append(capability)
+        self._by_name = MappingProxyType({name: tuple(entries) for name, entries in by_name.items()})
+
+    @classmethod
+    def load(cls, path=CAPABILITIES_FILE):
+        """
+        Reads a registry from a JSON data file.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            registry = cls(json.load(f))
+        logger.info(f"Loaded {len(registry.capabilities)} capabilities in {len(registry.categories)} categories")
+        return registry
+
+    def __len__(self):
+        return len(self.capabilities)
+
+    def __iter__(self):
+        return iter(self.capabilities)
+
+    def get(self, capability_id) -> Optional[Capability]:
+        return self._by_id.get(capability_id)
+
+    def lookup(self, path, name) -> Optional[Capability]:
+        for capability in self._by_path.get(tuple(path), ()):
+            if capability.name == name:
+                return capability
+        return None
+
+    def by_name(self, name) -> Tuple[Capability, ...]:
+        return self._by_name.get(name, ())
+
+    def category(self, path) -> Tuple[Capability, ...]:
+        return self._by_path.get(tuple(path), ())
+
+    def category_for_method(self, method) -> Optional[Tuple[str, ...]]:
+        return self._methods.get(method)
+
+    def menu_tree(self):
+        """
+        Returns the taxonomy as nested dictionaries, in the shape MenuCreator expects.
+
+        Returns:
+            dict: Category names mapping to sub-dictionaries or to lists of capability names.
+        """
+        tree = {}
+        for path, entries in self._by_path.items():
+            node = tree
+            for part in path[:-1]:
+                node = node.setdefault(part, {})
+            node[path[-1]] = [capability.name for capability in entries]
+        return tree
+
+    def prompt(self, name_or_id, text):
+        """
+        Builds the prompt applying a capability to a text.
+
+        Args:
+            name_or_id (str): A capability id, or a capability name such as "Tone Analysis".
+            text (str): The text to work on.
+
+        Returns:
+            str: The prompt.
+        """
+        capability = self.get(name_or_id)
+        if capability is None:
+            matches = self.by_name(name_or_id)
+            capability = matches[0] if matches else None
+        if capability is None:
+            # Free-form analysis types use the default template
+            return self.default_template.format(name=name_or_id, text=text)
+        return capability.prompt(text)
+
+
+_registry = None
+
+
+def get_registry() -> CapabilityRegistry:
+    """
+    Returns the application-wide capability registry, loading it on first use.
+    """
+    global _registry
+    if _registry is None:
+        _registry = CapabilityRegistry.load()
+    return _registry
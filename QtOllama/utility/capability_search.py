@@ -0,0 +1,162 @@
+# capability_search.py
+import json
+import math
+import os
+import time
+from collections import defaultdict
+from typing import List, NamedTuple
+
+from QtOllama.utility.capability_registry import Capability, get_registry
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+USAGE_FILE = os.path.join(os.path.expanduser('~'), "QtOllama", "capability_usage.json")
+USAGE_WEIGHT = 0.15
+RECENCY_HALF_LIFE = 7 * 24 * 3600
+
+
+def trigrams(text):
+    """
+    Returns the set of trigrams of a lowercase text, each word padded with spaces.
+    """
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def is_subsequence(query, text):
+    characters = iter(text)
+    return all(character in characters for character in query)
+
+
+class SearchResult(NamedTuple):
+    capability: Capability
+    score: float
+
+
+class UsageHistory:
+    """
+    How often and how recently each capability was used, persisted between sessions.
+
+    Methods:
+        record(capability_id):
+            Counts a use of a capability and saves the history.
+        boost(capability_id):
+            Returns the ranking bonus of a capability; recent, frequent use scores higher.
+    """
+    def __init__(self, path=USAGE_FILE):
+        self.path = path
+        self._uses = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._uses = {key: tuple(value) for key, value in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable usage history {self.path}: {e}")
+
+    def record(self, capability_id):
+        count, _ = self._uses.get(capability_id, (0, 0.0))
+        self._uses[capability_id] = (count + 1, time.time())
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._uses, f)
+        except OSError as e:
+            logger.error(f"Error saving usage history: {e}")
+
+    def boost(self, capability_id, now=None):
+        count, last_used = self._uses.get(capability_id, (0, 0.0))
+        if not count:
+            return 0.0
+        age = (now or time.time()) - last_used
+        return USAGE_WEIGHT * math.log1p(count) * (0.5 + 0.5 * 0.5 ** (age / RECENCY_HALF_LIFE))
+
+
+class CapabilityIndex:
+    """
+    A precomputed fuzzy search index over every capability of the registry.
+
+    Each capability is indexed under the trigrams and word prefixes of its name and
+    category path. A query is answered from the posting lists of its own trigrams
+    (or, for one- and two-letter queries, of its prefix) instead of scanning the
+    whole taxonomy, and candidates are ranked by trigram overlap, substring and
+    word-prefix matches in the name, and the usage history.
+
+    Methods:
+        search(query, limit=50):
+            Returns the best matching capabilities as SearchResults, best first.
+        record_use(capability):
+            Counts a use of a capability for future rankings.
+    """
+    def __init__(self, registry=None, usage=None):
+        self.registry = registry or get_registry()
+        self.usage = usage if usage is not None else UsageHistory()
+        self._names = []
+        self._trigram_counts = []
+        self._postings = defaultdict(list)
+        self._prefixes = defaultdict(list)
+        for position, capability in enumerate(self.registry.capabilities):
+            name = capability.name.lower()
+            text = f"{name} {' '.join(capability.path).lower()}"
+            grams = trigrams(text)
+            self._names.append(name)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(position)
+            for word in set(text.split()):
+                for length in (1, 2):
+                    self._prefixes[word[:length]].append(position)
+        logger.info(f"Indexed {len(self._names)} capabilities under {len(self._postings)} trigrams")
+
+    def search(self, query, limit=50) -> List[SearchResult]:
+        """
+        Finds the capabilities matching a query, ranked by fuzzy score and usage.
+
+        Args:
+            query (str): What the user typed; case does not matter.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list: SearchResults, best first. An empty query lists the most used capabilities.
+        """
+        query = " ".join(query.lower().split())
+        capabilities = self.registry.capabilities
+        now = time.time()
+        if not query:
+            ranked = [SearchResult(capability, self.usage.boost(capability.id, now)) for capability in capabilities]
+            ranked = [result for result in ranked if result.score > 0]
+            ranked.sort(key=lambda result: result.score, reverse=True)
+            return ranked[:limit]
+        scores = defaultdict(float)
+        if len(query) < 3:
+            for position in self._prefixes.get(query, ()):
+                scores[position] = 0.5
+        else:
+            query_grams = trigrams(query)
+            for gram in query_grams:
+                for position in self._postings.get(gram, ()):
+                    scores[position] += 1
+            for position, shared in scores.items():
+                # Dice coefficient, so long names do not win on sheer size
+                scores[position] = 2 * shared / (len(query_grams) + self._trigram_counts[position])
+        results = []
+        for position, score in scores.items():
+            name = self._names[position]
+            if name.startswith(query):
+                score += 1.0
+            elif f" {query}" in f" {name}":
+                score += 0.7
+            elif query in name:
+                score += 0.5
+            elif is_subsequence(query.replace(" ", ""), name):
+                score += 0.2
+            capability = capabilities[position]
+            results.append(SearchResult(capability, score + self.usage.boost(capability.id, now)))
+        results.sort(key=lambda result: result.score, reverse=True)
+        return results[:limit]
+
+    def record_use(self, capability):
+        self.usage.record(capability.id)
@@ -0,0 +1,212 @@
+# chat_statistics.py
+from collections import Counter
+from typing import NamedTuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from QtOllama.utility.lazy_imports import LazyModule
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+text_analysis = LazyModule("QtOllama.utility.text_analysis")
+
+
+class MessageStatistics(NamedTuple):
+    """
+    The statistics of one finalized message, computed once.
+    """
+    role: str
+    turn: int
+    counts: object  # TextFeatures
+    token_counts: Counter
+    sentiment: object  # text_analysis.Sentiment
+
+
+class StatisticsTotal:
+    """
+    Running totals over a group of messages: the whole chat, one role or one turn;
+    also the paragraphs of a document, for text_analysis.ParagraphMemo.
+
+    Adding a message merges its counts, so it costs the size of the message and not
+    of the chat; removing one subtracts them again.
+
+    Attributes:
+        messages (int): Messages (or paragraphs) in the totals.
+        counts (TextCounts): The merged text counts; None before the first message.
+        token_counts (Counter): Occurrences of each NLTK token.
+        total_tokens (int): NLTK tokens.
+    """
+    def __init__(self):
+        self.messages = 0
+        self.counts = None
+        self.token_counts = Counter()
+        self.total_tokens = 0
+        self._polarity = 0.0
+        self._subjectivity = 0.0
+        self._assessments = 0
+
+    def add(self, entry: MessageStatistics):
+        if self.counts is None:
+            self.counts = text_analysis.TextCounts()
+        self.messages += 1
+        self.counts += entry.counts
+        self.token_counts.update(entry.token_counts)
+        self.total_tokens += sum(entry.token_counts.values())
+        # TextBlob averages over assessed words and phrases; weighting by their number
+        # gives the average over the whole group
+        self._polarity += entry.sentiment.polarity * entry.sentiment.weight
+        self._subjectivity += entry.sentiment.subjectivity * entry.sentiment.weight
+        self._assessments += entry.sentiment.weight
+
+    def remove(self, entry):
+        """
+        Takes an entry added before out of the totals, e.g. a paragraph that was edited.
+        """
+        self.messages -= 1
+        self.counts -= entry.counts
+        self.token_counts.subtract(entry.token_counts)
+        for token in entry.token_counts:
+            if self.token_counts[token] <= 0:
+                del self.token_counts[token]
+        self.total_tokens -= sum(entry.token_counts.values())
+        self._polarity -= entry.sentiment.polarity * entry.sentiment.weight
+        self._subjectivity -= entry.sentiment.subjectivity * entry.sentiment.weight
+        self._assessments -= entry.sentiment.weight
+
+    @property
+    def unique_tokens(self):
+        return len(self.token_counts)
+
+    @property
+    def lexical_diversity(self):
+        return self.unique_tokens / self.total_tokens if self.total_tokens else 0
+
+    @property
+    def sentiment(self):
+        if not self._assessments:
+            return text_analysis.Sentiment(0.0, 0.0, 0)
+        return text_analysis.Sentiment(self._polarity / self._assessments,
+                                       self._subjectivity / self._assessments, self._assessments)
+
+
+class ChatTotals:
+    """
+    Running totals of a chat, built from its recorded messages.
+
+    Each message is analyzed once, the first time the totals are updated after it was
+    recorded; its counts are kept with it and merged into totals for the whole chat,
+    for each role and for each turn (a user message and the replies to it). The
+    analysis is slow, so the totals are meant to be updated on a worker thread, see
+    stats.StatisticsWorker.
+
+    Attributes:
+        entries (list): One MessageStatistics per analyzed message, in chat order.
+        total (StatisticsTotal): The whole chat.
+        by_role (dict): Maps each role to its StatisticsTotal.
+        turns (list): One StatisticsTotal per turn.
+    Methods:
+        update(epoch, messages):
+            Analyzes the messages recorded since the last update.
+    """
+    def __init__(self):
+        self._reset(None)
+
+    def _reset(self, epoch):
+        self._epoch = epoch
+        self._seen = 0
+        self.entries = []
+        self.total = StatisticsTotal()
+        self.by_role = {}
+        self.turns = []
+
+    def update(self, epoch, messages):
+        """
+        Brings the totals up to date with a chat's messages.
+
+        Args:
+            epoch (int): ChatStatistics.epoch; a new epoch means the chat was cleared
+                and the totals start over.
+            messages (list): (role, content) tuples, in chat order, as recorded by
+                ChatStatistics; only the ones past the last update are analyzed.
+        """
+        if epoch != self._epoch:
+            self._reset(epoch)
+        for role, content in messages[self._seen:]:
+            self._seen += 1
+            try:
+                features = text_analysis.TextFeatures(content)
+                token_counts = Counter(features.tokens)
+                sentiment = features.sentiment
+            except Exception as e:
+                logger.error(f"Error analyzing a {role} message: {e}", exc_info=True)
+                continue
+            if role == "user" or not self.turns:
+                self.turns.append(StatisticsTotal())
+            entry = MessageStatistics(role, len(self.turns) - 1, features, token_counts, sentiment)
+            self.entries.append(entry)
+            self.total.add(entry)
+            self.by_role.setdefault(role, StatisticsTotal()).add(entry)
+            self.turns[-1].add(entry)
+
+
+class ChatStatistics(QObject):
+    """
+    Records the chat's final messages for statistics, without analyzing them.
+
+    A user message is recorded when its turn starts, a reply in
+    handle_response_finished. Recording only keeps the message and counts its words,
+    so sending and receiving never wait for the text analysis; the statistics dialog
+    analyzes the recorded messages on its worker thread, and only while it is open
+    (see ChatTotals).
+
+    Signals:
+        changed (): Emitted after a message was added or the statistics were cleared.
+
+    Attributes:
+        messages (list): (role, content) tuples, in chat order.
+        words (Counter): Whitespace-separated words written by each role.
+        epoch (int): Increases when the chat is cleared.
+        version (int): Increases with every change.
+    Methods:
+        add(message):
+            Records a final message.
+        snapshot():
+            Returns the recorded messages for ChatTotals.update.
+        clear():
+            Forgets every message.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.epoch = 0
+        self.version = 0
+        self.clear()
+
+    def add(self, message):
+        """
+        Records a final message.
+
+        Args:
+            message (dict): A chat message with "role" and "content".
+        """
+        role, content = message["role"], message["content"]
+        self.messages.append((role, content))
+        self.words[role] += len(content.split())
+        self.version += 1
+        self.changed.emit()
+
+    def snapshot(self):
+        """
+        Returns:
+            tuple: The epoch and a copy of the recorded messages, the arguments of
+                ChatTotals.update; safe to hand to another thread.
+        """
+        return self.epoch, list(self.messages)
+
+    def clear(self):
+        self.messages = []
+        self.words = Counter()
+        self.epoch += 1
+        self.version += 1
+        self.changed.emit()
@@ -0,0 +1,162 @@
+# compaction.py
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from QtOllama.utility.async_engine import get_engine
+from QtOllama.utility.constants import COMPACTION_THRESHOLD, COMPACTION_TURNS, OLLAMA_KEEP_ALIVE
+from QtOllama.utility.request_scheduler import get_scheduler, PRIORITY_BACKGROUND
+from QtOllama.utility.response_cache import get_response_cache
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation below for your own later reference. Keep every fact, "
+    "name, number, decision and open question; drop pleasantries and repetition. "
+    "Write compact prose without any preamble."
+)
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def summary_prompt(previous_summary, messages):
+    """
+    Returns the prompt asking the model to fold messages into the running summary.
+
+    Args:
+        previous_summary (str): The current summary text, or an empty string.
+        messages (list): The messages to fold in, oldest first.
+
+    Returns:
+        str: The prompt text.
+    """
+    parts = []
+    if previous_summary:
+        parts.append(f"Earlier summary:\n{previous_summary}\n")
+    parts.extend(f"{message['role'].capitalize()}: {message['content']}" for message in messages)
+    return "\n\n".join(parts)
+
+
+class ConversationCompactor(QObject):
+    """
+    Folds the oldest turns of a context window into a rolling summary in the background.
+
+    Once the window holds more than COMPACTION_THRESHOLD of its token budget, the
+    oldest COMPACTION_TURNS turns and the previous summary are summarized by the model
+    at background priority, and the result replaces them in the window. The summary
+    then sits right after the system messages and only changes at the next compaction,
+    so the prompt prefix stays small and stable between compactions instead of sliding
+    with every trim. Summaries are stored in the response cache, keyed by the model
+    and the summarized text, so compacting the same history again costs nothing.
+
+    If the chat moves on while a summary is being written, the summary is still
+    applied as long as the summarized messages are the oldest ones in the window.
+
+    Signals:
+        compacted (int, int, int): Messages folded into the summary, and the window's
+            token count before and after.
+
+    Attributes:
+        context (ContextWindow): The window being compacted.
+        enabled (bool): Whether compaction runs at all.
+        threshold (float): Fraction of the token budget that triggers a compaction.
+        turns (int): Turns (user and assistant message pairs) folded per compaction.
+    Methods:
+        maybe_compact(model_name, options=None):
+            Starts a compaction if the window has grown past the threshold.
+        cancel():
+            Cancels a compaction in progress.
+    """
+    compacted = pyqtSignal(int, int, int)
+
+    def __init__(self, context, threshold=COMPACTION_THRESHOLD, turns=COMPACTION_TURNS, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.enabled = False
+        self.threshold = threshold
+        self.turns = turns
+        self.response_cache = get_response_cache()
+        self._request = None
+
+    @property
+    def running(self):
+        return self._request is not None
+
+    def maybe_compact(self, model_name, options=None):
+        """
+        Starts a compaction if enabled, idle, and the window has grown past the threshold.
+
+        Args:
+            model_name (str): The model that writes the summary.
+            options (dict, optional): Model options, e.g. num_ctx.
+
+        Returns:
+            bool: True if a compaction was started or applied from the cache.
+        """
+        if not self.enabled or self.running or not model_name:
+            return False
+        if self.context.total_tokens <= self.context.budget * self.threshold:
+            return False
+        count = self.turns * 2
+        # Keep at least the latest turn verbatim
+        if self.context.unpinned_count < count + 2:
+            return False
+        messages = self.context.oldest(count)
+        previous = self.context.summary
+        previous_text = previous["content"][len(SUMMARY_PREFIX):] if previous else ""
+        prompt = summary_prompt(previous_text, messages)
+        cache_key = self.response_cache.key_for(model_name, f"{SUMMARY_INSTRUCTIONS}\n\n{prompt}", options)
+        cached_summary = self.response_cache.get(cache_key)
+        if cached_summary is not None:
+            self._apply(messages, cached_summary)
+            return True
+        logger.info(f"Compacting {len(messages)} messages ({self.context.total_tokens} tokens in window)")
+        self._request = get_scheduler().submit(
+            lambda: self._start(model_name, prompt, options, messages, cache_key),
+            priority=PRIORITY_BACKGROUND,
+            label="compaction",
+        )
+        return True
+
+    def _start(self, model_name, prompt, options, messages, cache_key):
+        return get_engine().chat(
+            model_name,
+            [{"role": "system", "content": SUMMARY_INSTRUCTIONS}, {"role": "user", "content": prompt}],
+            options=options,
+            render=False,
+            keep_alive=OLLAMA_KEEP_ALIVE,
+            label="compaction",
+            on_finished=lambda handle: self._on_finished(handle, messages, cache_key, model_name),
+            on_error=self._on_error,
+        )
+
+    def _on_finished(self, handle, messages, cache_key, model_name):
+        if self._request is None or handle is not self._request.handle:
+            return
+        self._request = None
+        summary = handle.text.strip()
+        if handle.cancelled or not summary:
+            return
+        self.response_cache.put(cache_key, summary, {"model": model_name, "kind": "summary"})
+        self._apply(messages, summary)
+
+    def _on_error(self, handle, error_message):
+        if self._request is None or handle is not self._request.handle:
+            return
+        self._request = None
+        logger.warning(f"Compaction failed: {error_message}")
+
+    def _apply(self, messages, summary):
+        before = self.context.total_tokens
+        summary_message = {"role": "system", "content": f"{SUMMARY_PREFIX}{summary}"}
+        if not self.context.compact(messages, summary_message):
+            logger.info("Compaction dropped; the summarized messages left the window")
+            return
+        after = self.context.total_tokens
+        logger.info(f"Compacted {len(messages)} messages: {before} -> {after} tokens")
+        self.compacted.emit(len(messages), before, after)
+
+    def cancel(self):
+        """
+        Cancels a compaction that is queued or running; its summary is discarded.
+        """
+        if self._request is not None:
+            self._request.cancel()
+            self._request = None
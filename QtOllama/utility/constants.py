@@ -1,2 +1,44 @@
-# constants.py
-CONTEXT_LENGTH_DEFAULT = 8192
\ No newline at end of file
+# constants.py
+CONTEXT_LENGTH_DEFAULT = 8192
+CONTEXT_LENGTH_MIN = 512
+CONTEXT_LENGTH_MAX = 131072
+CONTEXT_RESPONSE_RESERVE = 1024
+
+# Ollama transport
+OLLAMA_HOST_DEFAULT = "http://127.0.0.1:11434"
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_READ_TIMEOUT = 300.0
+HTTP_POOL_SIZE = 8
+OLLAMA_KEEP_ALIVE = "30m"
+STREAM_RENDER_FPS = 30
+STREAM_QUEUE_SIZE = 1024
+
+# Request scheduling
+SCHEDULER_MAX_CONCURRENT = 2
+SCHEDULER_INTERACTIVE_RESERVE = 1
+
+# Response cache
+RESPONSE_CACHE_MAX_ENTRIES = 5000
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Conversation compaction
+COMPACTION_THRESHOLD = 0.75
+COMPACTION_TURNS = 3
+
+# Lazy imports
+PREWARM_DELAY_MS = 3000
+
+# Logging
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_QUEUE_SIZE = 10000
+LOG_SAMPLE_EVERY = 100
+
+# Request metrics
+METRICS_HISTORY = 5000
+METRICS_MAX_BYTES = 2 * 1024 * 1024
+METRICS_BACKUP_COUNT = 1
+
+# Statistics dialog
+STATS_DEBOUNCE_MS = 400
+STATS_MAX_WAIT_MS = 2000
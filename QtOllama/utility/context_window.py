@@ -0,0 +1,206 @@
+# context_window.py
+import itertools
+from collections import deque
+from typing import Dict, List
+
+from QtOllama.utility.constants import CONTEXT_LENGTH_DEFAULT, CONTEXT_RESPONSE_RESERVE
+from QtOllama.utility.conversation_engine import estimate_message_tokens
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+MESSAGE_TEMPLATE_TOKENS = 4
+
+
+class ContextWindow:
+    """
+    The part of a conversation sent to the model, kept within the context length.
+
+    Every message carries a token count, estimated when it is added and replaced by
+    the server's own counts once a turn finishes, and the window keeps their running
+    total, so checking the size never re-reads the history. System messages are pinned
+    and never trimmed. Trimming drops the oldest unpinned messages from a deque, which
+    costs O(1) per dropped message. Compaction replaces the oldest messages with a
+    summary that sits right after the pinned messages.
+
+    Attributes:
+        limit (int): The model context length (num_ctx).
+        reserve (int): Tokens kept free for the reply.
+    Methods:
+        append(message, tokens=None):
+            Adds a message with its known or estimated token count.
+        calibrate(prompt_tokens, sent_tokens=None):
+            Aligns the running total with the prompt size reported by the server.
+        trim():
+            Drops the oldest unpinned messages until the window fits; returns them.
+        oldest(count):
+            Returns the oldest unpinned messages.
+        compact(messages, summary_message, tokens=None):
+            Replaces the oldest messages with a summary.
+        window():
+            Returns the messages to send, pinned ones first.
+        set_limit(limit):
+            Changes the context length.
+        clear():
+            Removes every message.
+    """
+    def __init__(self, limit=CONTEXT_LENGTH_DEFAULT, reserve=CONTEXT_RESPONSE_RESERVE):
+        self.limit = limit
+        self.reserve = reserve
+        self._pinned = []
+        self._pinned_tokens = 0
+        self._summary = None
+        self._entries = deque()
+        self._tokens = 0
+
+    @property
+    def budget(self):
+        """
+        The number of prompt tokens allowed, leaving room for the reply.
+        """
+        return max(self.limit - self.reserve, self.limit // 2)
+
+    @property
+    def total_tokens(self):
+        """
+        The tokens currently in the window, pinned messages included.
+        """
+        return self._pinned_tokens + self._summary_tokens + self._tokens
+
+    @property
+    def _summary_tokens(self):
+        return self._summary[1] if self._summary is not None else 0
+
+    @property
+    def summary(self):
+        """
+        The synthetic summary message of compacted turns, or None.
+        """
+        return self._summary[0] if self._summary is not None else None
+
+    @property
+    def unpinned_count(self):
+        """
+        The number of messages that can be trimmed or compacted.
+        """
+        return len(self._entries)
+
+    def __len__(self):
+        return len(self._pinned) + (self._summary is not None) + len(self._entries)
+
+    def append(self, message: Dict, tokens=None):
+        """
+        Adds a message to the window.
+
+        Args:
+            message (dict): A message dictionary with 'role' and 'content' keys.
+            tokens (int, optional): Its token count if known, e.g. the reply's eval_count
+                plus template overhead; estimated otherwise.
+        """
+        if tokens is None:
+            tokens = estimate_message_tokens(message)
+        if message.get("role") == "system":
+            self._pinned.append([message, tokens])
+            self._pinned_tokens += tokens
+        else:
+            self._entries.append([message, tokens])
+            self._tokens += tokens
+
+    def calibrate(self, prompt_tokens, sent_tokens=None):
+        """
+        Aligns the window with the prompt size the server reported for the last request.
+
+        The difference between the reported size and the window's total when the
+        request was sent is charged to the newest message, the only one whose count
+        is still an estimate. Changes since, e.g. a compaction that finished during
+        the turn, are not part of that difference.
+
+        Args:
+            prompt_tokens (int): The number of prompt tokens the server processed.
+            sent_tokens (int, optional): total_tokens when the request was sent;
+                the current total if omitted.
+        """
+        if not self._entries or not prompt_tokens:
+            return
+        if sent_tokens is None:
+            sent_tokens = self.total_tokens
+        newest = self._entries[-1]
+        corrected = max(1, newest[1] + prompt_tokens - sent_tokens)
+        self._tokens += corrected - newest[1]
+        newest[1] = corrected
+
+    def trim(self) -> List[Dict]:
+        """
+        Drops the oldest unpinned messages until the window fits its budget.
+
+        The newest message is always kept.
+
+        Returns:
+            list: The dropped messages, oldest first.
+        """
+        dropped = []
+        while self.total_tokens > self.budget and len(self._entries) > 1:
+            message, tokens = self._entries.popleft()
+            self._tokens -= tokens
+            dropped.append(message)
+        if dropped:
+            logger.info(f"Trimmed {len(dropped)} messages; window holds {self.total_tokens}/{self.budget} tokens")
+        return dropped
+
+    def oldest(self, count) -> List[Dict]:
+        """
+        Returns the oldest unpinned messages, at most count of them.
+        """
+        return [message for message, _ in itertools.islice(self._entries, count)]
+
+    def compact(self, messages: List[Dict], summary_message: Dict, tokens=None):
+        """
+        Replaces the oldest messages with a summary of them.
+
+        The summary replaces the previous one, which the new summary is expected to
+        fold in. Nothing changes if the given messages are no longer the oldest ones,
+        e.g. because they were trimmed while the summary was being written.
+
+        Args:
+            messages (list): The summarized messages, as returned by oldest().
+            summary_message (dict): The synthetic message holding the summary.
+            tokens (int, optional): Its token count; estimated if omitted.
+
+        Returns:
+            bool: True if the window was compacted.
+        """
+        if not messages or len(messages) >= len(self._entries):
+            return False
+        if any(entry[0] is not message for entry, message in zip(self._entries, messages)):
+            return False
+        for _ in messages:
+            self._tokens -= self._entries.popleft()[1]
+        if tokens is None:
+            tokens = estimate_message_tokens(summary_message)
+        self._summary = [summary_message, tokens]
+        return True
+
+    def window(self) -> List[Dict]:
+        """
+        Returns the messages to send to the model: pinned system messages, the summary
+        of compacted turns, then the recent messages.
+        """
+        head = [message for message, _ in self._pinned]
+        if self._summary is not None:
+            head.append(self._summary[0])
+        return head + [message for message, _ in self._entries]
+
+    def set_limit(self, limit):
+        """
+        Changes the context length; the next trim() applies it.
+        """
+        self.limit = limit
+
+    def clear(self):
+        """
+        Removes every message, pinned ones and the summary included.
+        """
+        self._pinned = []
+        self._pinned_tokens = 0
+        self._summary = None
+        self._entries.clear()
+        self._tokens = 0
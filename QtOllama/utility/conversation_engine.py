@@ -0,0 +1,174 @@
+# conversation_engine.py
+from typing import Dict, List
+
+from QtOllama.utility.constants import OLLAMA_KEEP_ALIVE
+from QtOllama.utility.async_engine import get_engine
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+
+def estimate_tokens(text):
+    """
+    Roughly estimates the number of tokens in a piece of text.
+
+    Args:
+        text (str): The text to estimate.
+
+    Returns:
+        int: The estimated token count (about four characters per token).
+    """
+    return (len(text) + 3) // 4
+
+
+def estimate_message_tokens(message):
+    """
+    Estimates the tokens a chat message occupies once the model template is applied.
+
+    Args:
+        message (dict): A message dictionary with 'role' and 'content' keys.
+
+    Returns:
+        int: The estimated token count including the per-message template overhead.
+    """
+    return estimate_tokens(message.get("content", "")) + 4
+
+
+class ConversationEngine:
+    """
+    Streams chat turns through /api/chat and keeps the prompt prefix stable.
+
+    The full history is sent as structured messages every turn, byte-for-byte
+    identical to the previous turn plus the new messages, so the server can reuse
+    the KV cache of the shared prefix and only evaluates the new turn. The engine
+    tracks what the server already holds and reports how many prompt tokens were
+    skipped thanks to that reuse.
+
+    Attributes:
+        options (dict): Model options sent with every request (e.g. num_ctx).
+        last_turn (dict): Token accounting of the most recent turn.
+    Methods:
+        start_turn(model_name, messages, on_finished=None, on_error=None, host=None, label=None):
+            Streams the reply on the asynchronous engine and returns its StreamHandle.
+        begin_turn(model_name, messages), end_turn(turn, reply, final, cancelled=False):
+            The token accounting around a turn, which start_turn does for you.
+        reset():
+            Forgets the cached prefix, e.g. after the chat was cleared.
+    """
+    def __init__(self, options=None):
+        self.options = options or {}
+        self.last_turn = {}
+        self._model_name = None
+        self._prefix_hashes = []
+        self._cached_tokens = 0
+
+    def reset(self):
+        """
+        Forgets the cached prefix so the next turn is accounted as a cold prompt.
+        """
+        self._model_name = None
+        self._prefix_hashes = []
+        self._cached_tokens = 0
+        self.last_turn = {}
+
+    @staticmethod
+    def _message_hash(message):
+        return hash((message.get("role"), message.get("content")))
+
+    def _reusable_tokens(self, model_name, hashes):
+        """
+        Returns the number of tokens the server should still hold for this history.
+        """
+        prefix_len = len(self._prefix_hashes)
+        if (model_name != self._model_name
+                or prefix_len == 0
+                or len(hashes) < prefix_len
+                or hashes[:prefix_len] != self._prefix_hashes):
+            return 0, 0
+        return self._cached_tokens, prefix_len
+
+    def begin_turn(self, model_name, messages: List[Dict]) -> Dict:
+        """
+        Works out how much of the history the server should still hold.
+
+        Args:
+            model_name (str): The model to chat with.
+            messages (list): The conversation history as message dictionaries.
+
+        Returns:
+            dict: The turn state to pass to end_turn().
+        """
+        hashes = [self._message_hash(message) for message in messages]
+        reusable_tokens, prefix_len = self._reusable_tokens(model_name, hashes)
+        new_tokens = sum(estimate_message_tokens(message) for message in messages[prefix_len:])
+        return {"model_name": model_name, "hashes": hashes,
+                "reusable_tokens": reusable_tokens, "new_tokens": new_tokens}
+
+    def end_turn(self, turn, reply, final, cancelled=False):
+        """
+        Records the outcome of a turn and updates last_turn.
+
+        Args:
+            turn (dict): The state returned by begin_turn().
+            reply (str): The full assistant reply streamed so far.
+            final (dict): The final "done" record, empty if none arrived.
+            cancelled (bool): Whether the generation was cancelled.
+        """
+        if not final and cancelled:
+            # The server state after an aborted generation is unknown; start cold next turn
+            self.reset()
+            self.last_turn = {"cancelled": True, "eval_count": estimate_tokens(reply)}
+            logger.info("Turn cancelled before the server finished")
+            return
+
+        reusable_tokens, new_tokens = turn["reusable_tokens"], turn["new_tokens"]
+        prompt_eval_count = final.get("prompt_eval_count", reusable_tokens + new_tokens)
+        eval_count = final.get("eval_count", estimate_tokens(reply))
+        prompt_tokens = max(prompt_eval_count, reusable_tokens + new_tokens)
+        skipped = prompt_tokens - prompt_eval_count
+
+        self._model_name = turn["model_name"]
+        self._prefix_hashes = turn["hashes"] + [self._message_hash({"role": "assistant", "content": reply})]
+        self._cached_tokens = prompt_tokens + eval_count
+        self.last_turn = {
+            "prompt_tokens": prompt_tokens,
+            "prompt_tokens_evaluated": prompt_eval_count,
+            "prompt_tokens_skipped": skipped,
+            "eval_count": eval_count,
+        }
+        logger.info("Turn finished: %d prompt tokens evaluated, %d reused from cache", prompt_eval_count, skipped)
+
+    def start_turn(self, model_name, messages: List[Dict], on_finished=None, on_error=None, host=None, label=None):
+        """
+        Starts a chat turn on the asynchronous streaming engine.
+
+        The token accounting is updated on the GUI thread before on_finished runs, so
+        last_turn already describes the turn inside the callback.
+
+        Args:
+            model_name (str): The model to chat with.
+            messages (list): The conversation history as message dictionaries.
+            on_finished (callable, optional): Called with the StreamHandle when the turn ends.
+            on_error (callable, optional): Called with the StreamHandle and the error message.
+            host (str, optional): The server URL.
+            label (str, optional): What the turn is for, e.g. the capability; kept in its metrics.
+
+        Returns:
+            StreamHandle: The handle of the streaming request; its channel carries the reply.
+        """
+        # The engine serializes the request on its own thread; give it a private list
+        messages = list(messages)
+        turn = self.begin_turn(model_name, messages)
+
+        def finished(handle):
+            self.end_turn(turn, handle.text, handle.final, cancelled=handle.cancelled)
+            if on_finished is not None:
+                on_finished(handle)
+
+        def failed(handle, message):
+            self.reset()
+            if on_error is not None:
+                on_error(handle, message)
+
+        return get_engine().chat(model_name, messages, options=self.options, host=host,
+                                 keep_alive=OLLAMA_KEEP_ALIVE, label=label,
+                                 on_finished=finished, on_error=failed)
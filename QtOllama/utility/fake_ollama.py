@@ -0,0 +1,460 @@
+# fake_ollama.py
+"""
+A local stand-in for the Ollama server, for offline benchmarks and load tests.
+
+Run it with
+
+    python -m QtOllama.utility.fake_ollama --port 11435 --token-rate 40 --latency 0.2
+
+and point the application at it with OLLAMA_HOST=http://127.0.0.1:11435. Replies are
+deterministic for a given seed and request; timing, load time and failures follow
+the command line settings. --load-test N runs N concurrent chat streams against the
+server through the application's async client and prints latency and throughput.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+VOCABULARY = (
+    "the model reads your text and notes its tone structure argument and style while "
+    "weighing each claim against the evidence offered so that a clear picture of "
+    "intent audience and effect emerges from the analysis of every paragraph"
+).split()
+DEFAULT_MODELS = ("llama3:8b", "mistral:7b", "qwen2:1.5b")
+EMBEDDING_SIZE = 384
+
+
+def _digest(name):
+    return hashlib.sha256(name.encode("utf-8")).hexdigest()
+
+
+def _timestamp(offset=0.0):
+    return (datetime.now(timezone.utc) + timedelta(seconds=offset)).isoformat()
+
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+class FakeOllamaSettings:
+    """
+    How the fake server behaves.
+
+    Attributes:
+        token_rate (float): Generated tokens per second; 0 streams as fast as possible.
+        latency (float): Seconds before the first byte of every response.
+        failure_rate (float): Probability that a generation fails, half of them with an
+            HTTP 500 before streaming and half with an error record mid-stream.
+        load_time (float): Seconds added to the first request of each model, as a cold load.
+        reply_tokens (int): Tokens per reply unless the request sets num_predict.
+        prompt_rate (float): Simulated prompt evaluation speed in tokens per second.
+        seed (int): Seeds the failures and replies, so runs are reproducible.
+    """
+    def __init__(self, token_rate=40.0, latency=0.05, failure_rate=0.0, load_time=0.0,
+                 reply_tokens=64, prompt_rate=2000.0, seed=0):
+        self.token_rate = token_rate
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.load_time = load_time
+        self.reply_tokens = reply_tokens
+        self.prompt_rate = prompt_rate
+        self.seed = seed
+
+
+class FakeOllamaState:
+    """
+    The installed and loaded models of a fake server, shared by its request threads.
+    """
+    def __init__(self, settings, models=DEFAULT_MODELS):
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.models = {name: self._model_entry(name) for name in models}
+        self.loaded = {}
+        self.random = random.Random(settings.seed)
+
+    @staticmethod
+    def _model_entry(name):
+        return {
+            "name": name,
+            "model": name,
+            "modified_at": _timestamp(),
+            "size": 4_000_000_000 + int(_digest(name)[:6], 16),
+            "digest": _digest(name),
+            "details": {"format": "gguf", "family": name.split(":")[0], "parameter_size": name.split(":")[-1]},
+        }
+
+    def roll_failure(self):
+        with self.lock:
+            roll = self.random.random()
+        if roll >= self.settings.failure_rate:
+            return None
+        return "before" if roll < self.settings.failure_rate / 2 else "during"
+
+    def load(self, name):
+        """
+        Marks a model as loaded; returns the simulated load time in seconds.
+        """
+        with self.lock:
+            cold = name not in self.loaded
+            self.loaded[name] = time.time()
+        return self.settings.load_time if cold else 0.0
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeOllama/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self) -> FakeOllamaState:
+        return self.server.state
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # RESPONSES
+    # /////////////////////////////////////////////////////////////////////////////////////
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError:
+            return {}
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, message, status):
+        self._send_json({"error": message}, status)
+
+    def _start_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _send_record(self, record):
+        line = json.dumps(record).encode("utf-8") + b"\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _wait_latency(self):
+        if self.state.settings.latency:
+            time.sleep(self.state.settings.latency)
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # ROUTES
+    # /////////////////////////////////////////////////////////////////////////////////////
+    def do_GET(self):
+        self._wait_latency()
+        if self.path == "/api/tags":
+            with self.state.lock:
+                models = list(self.state.models.values())
+            self._send_json({"models": models})
+        elif self.path == "/api/ps":
+            with self.state.lock:
+                loaded = [dict(self.state.models[name], expires_at=_timestamp(1800), size_vram=0)
+                          for name in self.state.loaded if name in self.state.models]
+            self._send_json({"models": loaded})
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        else:
+            self._send_error("not found", 404)
+
+    def do_DELETE(self):
+        payload = self._read_json()
+        self._wait_latency()
+        if self.path != "/api/delete":
+            self._send_error("not found", 404)
+            return
+        name = payload.get("model") or payload.get("name")
+        with self.state.lock:
+            removed = self.state.models.pop(name, None)
+            self.state.loaded.pop(name, None)
+        if removed is None:
+            self._send_error(f"model '{name}' not found", 404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        payload = self._read_json()
+        self._wait_latency()
+        routes = {
+            "/api/chat": self._generate,
+            "/api/generate": self._generate,
+            "/api/pull": self._pull,
+            "/api/embeddings": self._embeddings,
+        }
+        route = routes.get(self.path)
+        if route is None:
+            self._send_error("not found", 404)
+            return
+        try:
+            route(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled; a real server stops generating too
+            self.close_connection = True
+
+    def _generate(self, payload):
+        model = payload.get("model", "")
+        with self.state.lock:
+            known = model in self.state.models
+        if not known:
+            self._send_error(f"model '{model}' not found, try pulling it first", 404)
+            return
+        failure = self.state.roll_failure()
+        if failure == "before":
+            self._send_error("simulated server failure", 500)
+            return
+        settings = self.state.settings
+        chat = self.path == "/api/chat"
+        if chat:
+            prompt = "\n".join(str(message.get("content", "")) for message in payload.get("messages", []))
+        else:
+            prompt = str(payload.get("prompt", ""))
+        options = payload.get("options") or {}
+        count = int(options.get("num_predict") or settings.reply_tokens)
+        seed = options.get("seed", settings.seed)
+        reply_random = random.Random(f"{seed}:{model}:{prompt}")
+        tokens = [reply_random.choice(VOCABULARY) + " " for _ in range(count)]
+
+        started = time.perf_counter()
+        load_time = self.state.load(model)
+        prompt_tokens = _estimate_tokens(prompt)
+        prompt_time = prompt_tokens / settings.prompt_rate if settings.prompt_rate else 0.0
+        time.sleep(load_time + prompt_time)
+        interval = 1.0 / settings.token_rate if settings.token_rate else 0.0
+
+        def record(text, done=False):
+            data = {"model": model, "created_at": _timestamp(), "done": done}
+            if chat:
+                data["message"] = {"role": "assistant", "content": text}
+            else:
+                data["response"] = text
+            return data
+
+        streaming = payload.get("stream", True)
+        if streaming:
+            self._start_stream()
+        generation_started = time.perf_counter()
+        for position, token in enumerate(tokens):
+            if interval:
+                # Paced against the start, so slow writes do not accumulate drift
+                delay = generation_started + position * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if failure == "during" and position == len(tokens) // 2:
+                if streaming:
+                    self._send_record({"error": "simulated failure during generation"})
+                    self._end_stream()
+                else:
+                    self._send_error("simulated failure during generation", 500)
+                return
+            if streaming:
+                self._send_record(record(token))
+        eval_time = time.perf_counter() - generation_started
+        final = record("" if streaming else "".join(tokens), done=True)
+        final.update({
+            "done_reason": "length" if options.get("num_predict") else "stop",
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+            "load_duration": int(load_time * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_time * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": max(1, int(eval_time * 1e9)),
+        })
+        if not chat:
+            final["context"] = []
+        if streaming:
+            self._send_record(final)
+            self._end_stream()
+        else:
+            self._send_json(final)
+
+    def _pull(self, payload):
+        name = payload.get("model") or payload.get("name") or ""
+        if not name:
+            self._send_error("missing model name", 400)
+            return
+        if self.state.roll_failure() == "before":
+            self._send_error("simulated pull failure", 500)
+            return
+        entry = FakeOllamaState._model_entry(name)
+        self._start_stream()
+        self._send_record({"status": "pulling manifest"})
+        total = entry["size"]
+        steps = 10
+        for step in range(1, steps + 1):
+            time.sleep(self.state.settings.latency / steps if self.state.settings.latency else 0)
+            self._send_record({"status": f"pulling {entry['digest'][:12]}", "digest": entry["digest"],
+                               "total": total, "completed": total * step // steps})
+        for status in ("verifying sha256 digest", "writing manifest", "success"):
+            self._send_record({"status": status})
+        with self.state.lock:
+            self.state.models[name] = entry
+        self._end_stream()
+
+    def _embeddings(self, payload):
+        model = payload.get("model", "")
+        with self.state.lock:
+            known = model in self.state.models
+        if not known:
+            self._send_error(f"model '{model}' not found, try pulling it first", 404)
+            return
+        vector_random = random.Random(f"{model}:{payload.get('prompt', '')}")
+        vector = [vector_random.gauss(0.0, 1.0) for _ in range(EMBEDDING_SIZE)]
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        self._send_json({"embedding": [value / norm for value in vector]})
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """
+    A threaded HTTP/1.1 server speaking the subset of the Ollama API the application uses.
+
+    Methods:
+        url:
+            The base URL to use as OLLAMA_HOST.
+        start():
+            Serves in a daemon thread and returns the server.
+        stop():
+            Shuts the server down.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, settings=None, models=DEFAULT_MODELS):
+        super().__init__((host, port), FakeOllamaHandler)
+        self.state = FakeOllamaState(settings or FakeOllamaSettings(), models)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+async def _load_test(url, requests, concurrency, model):
+    from QtOllama.utility.async_engine import AsyncOllamaClient, chat_text
+
+    client = AsyncOllamaClient(url, pool_size=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def one(index):
+        async with semaphore:
+            payload = {"model": model, "stream": True,
+                       "messages": [{"role": "user", "content": f"Load test request {index}"}]}
+            started = time.perf_counter()
+            first_token = None
+            tokens = 0
+            try:
+                async for record in client.stream("POST", "/api/chat", payload):
+                    if chat_text(record):
+                        tokens += 1
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+            except Exception as e:
+                results.append({"error": str(e)})
+                return
+            results.append({"ttft": first_token, "time": time.perf_counter() - started, "tokens": tokens})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    wall_time = time.perf_counter() - started
+    client.close()
+    return results, wall_time
+
+
+def load_test(url, requests=20, concurrency=4, model=DEFAULT_MODELS[0]):
+    """
+    Streams concurrent chat requests to a server and summarizes latency and throughput.
+
+    Args:
+        url (str): The server URL.
+        requests (int): The number of requests.
+        concurrency (int): How many run at once.
+        model (str): The model to chat with.
+
+    Returns:
+        dict: requests, failures, wall_time, mean and p95 ttft, tokens and tokens_per_second.
+    """
+    results, wall_time = asyncio.run(_load_test(url, requests, concurrency, model))
+    succeeded = [result for result in results if "error" not in result]
+    ttfts = sorted(result["ttft"] for result in succeeded if result["ttft"] is not None)
+    tokens = sum(result["tokens"] for result in succeeded)
+    return {
+        "requests": requests,
+        "failures": len(results) - len(succeeded),
+        "wall_time": wall_time,
+        "mean_ttft": sum(ttfts) / len(ttfts) if ttfts else None,
+        "p95_ttft": ttfts[min(len(ttfts) - 1, int(len(ttfts) * 0.95))] if ttfts else None,
+        "tokens": tokens,
+        "tokens_per_second": tokens / wall_time if wall_time else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Ollama server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-rate", type=float, default=40.0, help="tokens per second; 0 for unthrottled")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds before every response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability a generation fails")
+    parser.add_argument("--load-time", type=float, default=0.0, help="seconds to load each model once")
+    parser.add_argument("--reply-tokens", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load-test", type=int, metavar="N", help="run N chat streams against the server and exit")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    settings = FakeOllamaSettings(token_rate=args.token_rate, latency=args.latency,
+                                  failure_rate=args.failure_rate, load_time=args.load_time,
+                                  reply_tokens=args.reply_tokens, seed=args.seed)
+    server = FakeOllamaServer(args.host, args.port, settings)
+    if args.load_test:
+        server.start()
+        try:
+            print(json.dumps(load_test(server.url, args.load_test, args.concurrency), indent=2))
+        finally:
+            server.stop()
+        return
+    print(f"Fake Ollama listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
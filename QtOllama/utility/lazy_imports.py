@@ -0,0 +1,125 @@
+# lazy_imports.py
+import importlib
+import sys
+import time
+
+from PyQt6.QtCore import QTimer
+
+from QtOllama.utility.constants import PREWARM_DELAY_MS
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+# Feature modules and the heavy stacks they pull in, in pre-warm order
+PREWARM_MODULES = (
+    "markdown",
+    "PyQt6.QtPrintSupport",
+    "textstat",
+    "textblob",
+    "QtOllama.utility.text_analysis",
+    "QtOllama.utility.stats",
+    "QtOllama.ui.wordcloud_dialog",
+    "QtOllama.utility.simulation",
+)
+
+_import_times = {}
+_process_started = time.perf_counter()
+
+
+def load(module_name):
+    """
+    Imports a module on first use and records how long the import took.
+
+    Args:
+        module_name (str): The dotted module name, e.g. "textblob".
+
+    Returns:
+        module: The imported module.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - started
+    _import_times[module_name] = elapsed
+    logger.info(f"Imported {module_name} in {elapsed * 1000:.0f} ms")
+    return module
+
+
+class LazyModule:
+    """
+    A stand-in for a module that is imported the first time one of its attributes is used.
+
+    Example:
+        textblob = LazyModule("textblob")
+        textblob.TextBlob(text)  # imports textblob here
+    """
+    def __init__(self, module_name):
+        self._module_name = module_name
+
+    def __getattr__(self, name):
+        return getattr(load(self._module_name), name)
+
+    def __repr__(self):
+        state = "loaded" if self._module_name in sys.modules else "not loaded"
+        return f"<LazyModule {self._module_name} ({state})>"
+
+
+class Prewarmer:
+    """
+    Imports the heavy feature modules one at a time while the event loop is idle.
+
+    Each import runs in its own zero-interval timer tick, so input and painting are
+    handled between modules. Modules already imported by a feature are skipped.
+
+    Methods:
+        start(delay_ms=PREWARM_DELAY_MS):
+            Starts pre-warming after the given delay.
+    """
+    def __init__(self, module_names=PREWARM_MODULES):
+        self._pending = list(module_names)
+        self._timer = QTimer()
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._import_next)
+
+    def start(self, delay_ms=PREWARM_DELAY_MS):
+        QTimer.singleShot(delay_ms, self._timer.start)
+
+    def _import_next(self):
+        if not self._pending:
+            self._timer.stop()
+            logger.info(import_report())
+            return
+        module_name = self._pending.pop(0)
+        try:
+            load(module_name)
+        except Exception as e:
+            logger.error(f"Error pre-warming {module_name}: {e}")
+
+
+def mark_startup(stage):
+    """
+    Records how long after process start a startup stage was reached.
+
+    Args:
+        stage (str): A short name, e.g. "window shown".
+    """
+    _import_times[f"[{stage}]"] = time.perf_counter() - _process_started
+    logger.info(f"Startup: {stage} after {_import_times[f'[{stage}]'] * 1000:.0f} ms")
+
+
+def import_report():
+    """
+    Returns the recorded startup stages and lazy import times, slowest imports first.
+
+    Startup stages are measured from the import of this module; run Python with
+    -X importtime for a per-module breakdown of the eager imports.
+    """
+    stages = [(name, seconds) for name, seconds in _import_times.items() if name.startswith("[")]
+    imports = sorted(((name, seconds) for name, seconds in _import_times.items() if not name.startswith("[")),
+                     key=lambda item: item[1], reverse=True)
+    lines = ["Import time report:"]
+    lines += [f"  {name:<32} {seconds * 1000:8.0f} ms" for name, seconds in stages]
+    lines += [f"  {name:<32} {seconds * 1000:8.0f} ms" for name, seconds in imports]
+    lines.append(f"  {'lazy imports total':<32} {sum(s for _, s in imports) * 1000:8.0f} ms")
+    return "\n".join(lines)
@@ -1,56 +1,176 @@
+import atexit
+import copy
+import itertools
 import logging
+import logging.handlers
 import os
-import sys
+import queue
 
+from QtOllama.utility.constants import (
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLE_EVERY,
+)
 
 LOG_DIRECTORY = "QtOllama"
-# LOG_FILE = 'TESTJAN23MAIN.txt'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%d-%b-%y %I:%M:%S %p'
 
-
-log_directory = os.path.join(os.path.expanduser('~'), "QtOllama")
-
-# Create the directory if it doesn't exist
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
+log_directory = os.path.join(os.path.expanduser('~'), LOG_DIRECTORY)
 
 # Path to your log file
 log_file = os.path.join(log_directory, 'QtOllama.log')
 
-logger = logging.getLogger(__name__)
 
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s',
-                    datefmt='%d-%b-%y %I:%M:%S %p',
-                    filename=log_file,
-                    filemode='w')
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    A queue handler that never blocks the logging thread and leaves file output to the writer.
+
+    Records are put on a bounded queue without waiting; when the writer falls behind,
+    records are dropped and counted instead of stalling a streaming or GUI thread.
+    The message is merged with its arguments here, as the standard QueueHandler does:
+    the arguments may be mutable or Qt objects, which must be rendered as they are
+    now and on the thread that owns them. Exception tracebacks are rendered here too,
+    while they still exist. A record that will be dropped is not formatted at all.
+
+    Attributes:
+        dropped (int): Records dropped because the queue was full.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def emit(self, record):
+        if self.queue.full():
+            self.dropped += 1
+            return
+        super().emit(record)
+
+    def prepare(self, record):
+        # A copy, so other handlers of the record still see the original
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogSampler:
+    """
+    Passes on one in every n calls, for debug records on hot paths such as per-chunk logging.
+
+    Example:
+        chunk_sampler = LogSampler()
+        chunk_sampler.debug(logger, "Request %d: chunk of %d chars", request_id, len(text))
+
+    The level check comes first, so with debug logging off a sampled call costs one
+    comparison and no formatting. Records name the caller of debug(), not the sampler.
+    """
+    def __init__(self, every=LOG_SAMPLE_EVERY):
+        self.every = max(1, every)
+        self._calls = itertools.count()
+
+    def debug(self, logger, msg, *args):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        call = next(self._calls)
+        if call % self.every == 0:
+            logger.debug(f"{msg} [sampled 1/{self.every}, call {call + 1}]", *args, stacklevel=2)
 
-# Create the directory if it doesn't exist
-LOG_DIRECTORY = 'QtOllama'
-log_directory = os.path.join(os.path.expanduser('~'), LOG_DIRECTORY)
 
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Waits for room, so stopping writes out every queued record first
+        self.queue.put(self._sentinel)
+
+
+_queue_handler = None
+_listener = None
+
+
+def _log_level():
+    """
+    Returns the level named by QTOLLAMA_LOG_LEVEL, and whether the name was valid.
+
+    Accepts a level name such as DEBUG or a number; anything else means INFO.
+    """
+    name = os.environ.get("QTOLLAMA_LOG_LEVEL", "INFO").strip().upper()
+    if name.isdigit():
+        return int(name), True
+    level = logging.getLevelName(name)
+    if isinstance(level, int):
+        return level, True
+    return logging.INFO, False
+
+
+def _configure():
+    """
+    Sets up the logging pipeline once: a queue handler on the root logger and a
+    single background thread writing to a size-rotated file.
+    """
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        return
+    os.makedirs(log_directory, exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _listener = _QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    level, valid = _log_level()
+    root.setLevel(level)
+    atexit.register(shutdown_logging)
+    if not valid:
+        logging.getLogger(__name__).warning(
+            "Unknown QTOLLAMA_LOG_LEVEL %r; logging at INFO", os.environ.get("QTOLLAMA_LOG_LEVEL"))
+
+
+def shutdown_logging():
+    """
+    Writes out the queued records and stops the writer thread.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    if _queue_handler.dropped:
+        # The queue is gone, so this one is written directly
+        record = logging.getLogger(__name__).makeRecord(
+            __name__, logging.WARNING, __file__, 0, "%d log records were dropped", (_queue_handler.dropped,), None
+        )
+        for handler in _listener.handlers:
+            handler.handle(record)
+    _listener = None
 
 
 def create_logger(module_name):
     """
-    Creates and configures a logger for the specified module.
+    Returns the logger of a module, connected to the application's logging pipeline.
+
+    Every module logs through the same queue and background writer into one rotating
+    log file; calling this again for a module returns the same logger without adding
+    handlers. The level comes from the QTOLLAMA_LOG_LEVEL environment variable
+    (INFO by default, and when the variable does not name a level).
+
     Args:
         module_name (str): The name of the module for which the logger is being created.
     Returns:
         logging.Logger: Configured logger instance for the specified module.
     """
-    logger = logging.getLogger(module_name)
-    logger.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    
-    file_handler = logging.FileHandler(os.path.join(log_directory, f'{module_name}.log'))
-    file_handler.setFormatter(formatter)
-    
-    # stream_handler = logging.StreamHandler(sys.stdout)
-    # stream_handler.setFormatter(formatter)
-    
-    logger.addHandler(file_handler)
-    # logger.addHandler(stream_handler)
-    
-    return logger
+    _configure()
+    return logging.getLogger(module_name)
@@ -0,0 +1,89 @@
+# model_catalog.py
+import json
+import os
+import threading
+from typing import Dict, List
+
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+CATALOG_PATH = os.path.join(os.path.expanduser('~'), "QtOllama", "models.json")
+MODEL_FIELDS = ("name", "digest", "size", "modified_at", "details")
+
+
+def model_signature(models: List[Dict]):
+    """
+    Returns what identifies a model list: every model's name and digest, in order.
+    """
+    return [(model.get("name"), model.get("digest")) for model in models]
+
+
+class ModelCatalog:
+    """
+    The last known list of installed models, persisted between sessions.
+
+    Reading the catalog is a single small file read, so the model combo box can be
+    filled before the Ollama server has answered, or while it is not running at all.
+    The live list from /api/tags is reconciled with it through update(), which only
+    rewrites the file and reports a change when a model was added, removed, reordered
+    or re-pulled under the same name.
+
+    Attributes:
+        path (str): The JSON file holding the catalog.
+        models (list): Model dictionaries with the fields listed in MODEL_FIELDS.
+    Methods:
+        names():
+            Returns the model names.
+        update(models):
+            Replaces the catalog with a live model list; returns True if it changed.
+    """
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self.models = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                models = json.load(f).get("models", [])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable model catalog {self.path}: {e}")
+            return
+        self.models = [model for model in models if isinstance(model, dict) and model.get("name")]
+        logger.info(f"Model catalog loaded with {len(self.models)} models")
+
+    def names(self) -> List[str]:
+        return [model["name"] for model in self.models]
+
+    def update(self, models: List[Dict]):
+        """
+        Reconciles the catalog with the live model list.
+
+        Args:
+            models (list): Model dictionaries as returned by /api/tags.
+
+        Returns:
+            bool: True if the list differs from the stored one and was saved.
+        """
+        models = [{field: model[field] for field in MODEL_FIELDS if field in model}
+                  for model in models if model.get("name")]
+        if model_signature(models) == model_signature(self.models):
+            return False
+        self.models = models
+        self._save()
+        return True
+
+    def _save(self):
+        data = json.dumps({"models": self.models}, ensure_ascii=False, indent=2)
+        temporary_path = f"{self.path}.tmp"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(temporary_path, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(temporary_path, self.path)
+            except OSError as e:
+                logger.error(f"Error saving model catalog: {e}")
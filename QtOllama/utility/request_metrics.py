@@ -0,0 +1,187 @@
+# request_metrics.py
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from QtOllama.utility.constants import METRICS_BACKUP_COUNT, METRICS_HISTORY, METRICS_MAX_BYTES
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+METRICS_FILE = os.path.join(os.path.expanduser('~'), "QtOllama", "request_metrics.jsonl")
+NANOSECONDS = 1e9
+AVERAGED_FIELDS = ("ttft", "total_time", "load_time", "prompt_tps", "gen_tps")
+
+
+def _rate(count, duration_ns):
+    return count / (duration_ns / NANOSECONDS) if count and duration_ns else None
+
+
+def request_metrics(handle) -> Optional[Dict]:
+    """
+    Builds the metrics record of a finished streaming request.
+
+    Client-side times come from the handle's perf_counter timestamps; token counts
+    and durations come from the timing fields of Ollama's final "done" record, which
+    are in nanoseconds.
+
+    Args:
+        handle (StreamHandle): The finished request.
+
+    Returns:
+        dict: time, model, capability, cancelled, ttft, total_time (seconds), load_time,
+            prompt_tokens, prompt_tps, eval_tokens and gen_tps (tokens per second);
+            None for a request that never started.
+    """
+    if handle.finished_at is None:
+        return None
+    final = handle.final or {}
+    ttft = handle.first_chunk_at - handle.submitted_at if handle.first_chunk_at is not None else None
+    return {
+        "time": time.time(),
+        "model": handle.model,
+        "capability": handle.label,
+        "cancelled": handle.cancelled,
+        "ttft": ttft,
+        "total_time": handle.finished_at - handle.submitted_at,
+        "load_time": final["load_duration"] / NANOSECONDS if final.get("load_duration") else None,
+        "prompt_tokens": final.get("prompt_eval_count"),
+        "prompt_tps": _rate(final.get("prompt_eval_count"), final.get("prompt_eval_duration")),
+        "eval_tokens": final.get("eval_count"),
+        "gen_tps": _rate(final.get("eval_count"), final.get("eval_duration")),
+    }
+
+
+def format_metrics(metrics):
+    """
+    Returns a one-line summary of a metrics record for the status bar.
+    """
+    parts = []
+    if metrics.get("ttft") is not None:
+        parts.append(f"TTFT {metrics['ttft']:.2f}s")
+    if metrics.get("prompt_tps"):
+        parts.append(f"prompt {metrics['prompt_tps']:.0f} tok/s")
+    if metrics.get("gen_tps"):
+        parts.append(f"gen {metrics['gen_tps']:.1f} tok/s")
+    if metrics.get("load_time"):
+        parts.append(f"load {metrics['load_time']:.2f}s")
+    return " · ".join(parts)
+
+
+class _MetricsFileHandler(logging.handlers.RotatingFileHandler):
+    def handleError(self, record):
+        logger.error("Error saving request metrics: %s", sys.exc_info()[1])
+
+
+class MetricsStore:
+    """
+    The metrics records of past requests, appended to a size-rotated JSON Lines file.
+
+    The most recent records are kept in memory for the per-model and per-capability
+    summaries. Records are written by a background thread, the same way log records
+    are, so recording never does file I/O on the GUI thread. The file is rotated like
+    the log, which bounds both its size and the time it takes to read it back on
+    first use.
+
+    Methods:
+        record(metrics):
+            Stores a metrics record.
+        summary(key):
+            Returns averages grouped by "model" or "capability".
+        close():
+            Writes out the queued records and stops the writer thread.
+    """
+    def __init__(self, path=METRICS_FILE, history=METRICS_HISTORY,
+                 max_bytes=METRICS_MAX_BYTES, backup_count=METRICS_BACKUP_COUNT):
+        self.path = path
+        self.records = deque(maxlen=history)
+        # Oldest rotated file first, so the newest records end up in the deque
+        for index in range(backup_count, 0, -1):
+            self._load(f"{path}.{index}")
+        self._load(path)
+
+        self._listener = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        except OSError as e:
+            logger.error("Request metrics will not be saved to %s: %s", path, e)
+            return
+        handler = _MetricsFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                      encoding="utf-8", delay=True)
+        self._queue = queue.Queue()
+        self._listener = logging.handlers.QueueListener(self._queue, handler)
+        self._listener.start()
+        atexit.register(self.close)
+
+    def _load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not read request metrics %s: %s", path, e)
+
+    def record(self, metrics):
+        self.records.append(metrics)
+        if self._listener is not None:
+            self._queue.put_nowait(logging.makeLogRecord({"msg": json.dumps(metrics)}))
+
+    def close(self):
+        """
+        Writes out the queued records and stops the writer thread.
+        """
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+
+    def summary(self, key="model"):
+        """
+        Averages the completed requests per model or per capability.
+
+        Args:
+            key (str): "model" or "capability".
+
+        Returns:
+            dict: Maps each model or capability to its request count and the average of
+                every field in AVERAGED_FIELDS (None when never reported).
+        """
+        groups = {}
+        for metrics in self.records:
+            if metrics.get("cancelled"):
+                continue
+            groups.setdefault(metrics.get(key) or "(none)", []).append(metrics)
+        summary = {}
+        for name, group in groups.items():
+            averages = {"count": len(group)}
+            for field in AVERAGED_FIELDS:
+                values = [metrics[field] for metrics in group if metrics.get(field) is not None]
+                averages[field] = sum(values) / len(values) if values else None
+            summary[name] = averages
+        return summary
+
+
+_store = None
+
+
+def get_metrics_store() -> MetricsStore:
+    """
+    Returns the application-wide metrics store, opening it on first use.
+    """
+    global _store
+    if _store is None:
+        _store = MetricsStore()
+    return _store
@@ -0,0 +1,253 @@
+# request_scheduler.py
+import heapq
+import itertools
+import os
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from QtOllama.utility.async_engine import get_engine
+from QtOllama.utility.constants import (
+    SCHEDULER_MAX_CONCURRENT,
+    SCHEDULER_INTERACTIVE_RESERVE,
+)
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+def server_parallelism():
+    """
+    Returns how many requests the Ollama server processes at once.
+
+    The server does not report it over the API; it follows OLLAMA_NUM_PARALLEL when
+    that is set for the client too, and SCHEDULER_MAX_CONCURRENT otherwise.
+    """
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", SCHEDULER_MAX_CONCURRENT)))
+    except ValueError:
+        return SCHEDULER_MAX_CONCURRENT
+
+
+class ScheduledRequest:
+    """
+    A request waiting for, or holding, a slot of the RequestScheduler.
+
+    Attributes:
+        job_id (int): Sequence number; also the FIFO tie-breaker.
+        priority (int): Lower runs first; PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND.
+        label (str): Shown in logs and the status bar.
+        lane (str): Requests sharing a lane run one at a time, in order.
+        handle (StreamHandle): The engine request once started.
+        enqueued_at, started_at (float): perf_counter timestamps.
+    Methods:
+        wait_time():
+            Seconds spent queued so far, or until the request started.
+        cancel():
+            Drops the request from the queue, or cancels it once started.
+    """
+    def __init__(self, scheduler, job_id, start, priority, label, lane):
+        self._scheduler = scheduler
+        self._start = start
+        self.job_id = job_id
+        self.priority = priority
+        self.label = label
+        self.lane = lane
+        self.handle = None
+        self.cancelled = False
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+
+    def wait_time(self):
+        end = self.started_at if self.started_at is not None else time.perf_counter()
+        return end - self.enqueued_at
+
+    def cancel(self):
+        self._scheduler.cancel(self)
+
+
+class RequestScheduler(QObject):
+    """
+    Admits requests to the streaming engine by priority under a concurrency limit.
+
+    Queued requests start in (priority, arrival) order, so interactive chat always
+    goes ahead of queued analyses while requests of equal priority keep FIFO order.
+    Interactive requests may use SCHEDULER_INTERACTIVE_RESERVE slots beyond the limit,
+    so a chat message never waits for a batch of background analyses to drain. A lane
+    serializes requests that share state, such as the turns of one conversation.
+
+    A request is submitted as a callable that starts it on the engine and returns its
+    StreamHandle (or None if it decided not to run); the scheduler learns about its
+    end through the engine's signal bridge.
+
+    Signals:
+        queue_changed (int, int, float): Queued requests, running requests and the
+            longest current wait in seconds.
+
+    Methods:
+        submit(start, priority=PRIORITY_BACKGROUND, label="", lane=None):
+            Queues a request and returns its ScheduledRequest.
+        cancel(request):
+            Cancels a queued or running request.
+        cancel_lane(lane):
+            Cancels every queued and running request of a lane.
+        set_max_concurrent(limit):
+            Changes the concurrency limit.
+        stats():
+            Returns the queue counters as a dictionary.
+    """
+    queue_changed = pyqtSignal(int, int, float)
+
+    def __init__(self, engine=None, max_concurrent=SCHEDULER_MAX_CONCURRENT, parent=None):
+        super().__init__(parent)
+        self.engine = engine or get_engine()
+        self.max_concurrent = max(1, max_concurrent)
+        self._ids = itertools.count(1)
+        self._queue = []
+        self._running = {}
+        self._busy_lanes = set()
+        self._started = 0
+        self._total_wait = 0.0
+        self.engine.bridge.finished.connect(self._on_request_done)
+        self.engine.bridge.failed.connect(self._on_request_done)
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self._emit_queue_changed)
+
+    def submit(self, start, priority=PRIORITY_BACKGROUND, label="", lane=None):
+        """
+        Queues a request.
+
+        Args:
+            start (callable): Starts the request and returns its StreamHandle, or None.
+            priority (int): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND.
+            label (str): A short description for logs and the status bar.
+            lane (str, optional): Requests sharing a lane never run concurrently.
+
+        Returns:
+            ScheduledRequest: The queued request.
+        """
+        request = ScheduledRequest(self, next(self._ids), start, priority, label, lane)
+        heapq.heappush(self._queue, (request.priority, request.job_id, request))
+        logger.debug("Queued request %d (%s), priority %d", request.job_id, label, priority)
+        self._pump()
+        return request
+
+    def cancel(self, request):
+        """
+        Cancels a request; a queued one is dropped, a running one is cancelled on the engine.
+        """
+        if request.cancelled:
+            return
+        request.cancelled = True
+        if request.handle is not None:
+            request.handle.cancel()
+        else:
+            self._queue = [entry for entry in self._queue if entry[2] is not request]
+            heapq.heapify(self._queue)
+            self._emit_queue_changed()
+
+    def cancel_lane(self, lane):
+        """
+        Cancels every queued and running request of a lane.
+        """
+        for _, _, request in list(self._queue):
+            if request.lane == lane:
+                self.cancel(request)
+        for request in list(self._running.values()):
+            if request.lane == lane:
+                self.cancel(request)
+
+    def set_max_concurrent(self, limit):
+        """
+        Changes the concurrency limit; extra queued requests start at once if it grew.
+        """
+        self.max_concurrent = max(1, int(limit))
+        self._pump()
+
+    def _has_slot(self, request):
+        limit = self.max_concurrent
+        if request.priority <= PRIORITY_INTERACTIVE:
+            limit += SCHEDULER_INTERACTIVE_RESERVE
+        return len(self._running) < limit
+
+    def _pump(self):
+        deferred = []
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            request = entry[2]
+            if request.lane is not None and request.lane in self._busy_lanes:
+                deferred.append(entry)
+                continue
+            if not self._has_slot(request):
+                deferred.append(entry)
+                if request.priority > PRIORITY_INTERACTIVE:
+                    # Nothing behind a blocked background request can run either
+                    break
+                continue
+            self._start(request)
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+        self._emit_queue_changed()
+
+    def _start(self, request):
+        request.started_at = time.perf_counter()
+        self._started += 1
+        self._total_wait += request.wait_time()
+        try:
+            handle = request._start()
+        except Exception as e:
+            logger.error("Error starting request %d (%s): %s", request.job_id, request.label, e, exc_info=True)
+            handle = None
+        if handle is None:
+            return
+        request.handle = handle
+        self._running[handle.request_id] = request
+        if request.lane is not None:
+            self._busy_lanes.add(request.lane)
+        logger.info("Started request %d (%s) after %.2fs in queue", request.job_id, request.label, request.wait_time())
+
+    def _on_request_done(self, request_id, *args):
+        request = self._running.pop(request_id, None)
+        if request is None:
+            return
+        self._busy_lanes.discard(request.lane)
+        self._pump()
+
+    def _emit_queue_changed(self):
+        longest_wait = max((entry[2].wait_time() for entry in self._queue), default=0.0)
+        if self._queue and not self._timer.isActive():
+            self._timer.start()
+        elif not self._queue and self._timer.isActive():
+            self._timer.stop()
+        self.queue_changed.emit(len(self._queue), len(self._running), longest_wait)
+
+    def stats(self):
+        """
+        Returns the queue counters.
+
+        Returns:
+            dict: queued, running, started and average_wait (seconds).
+        """
+        return {
+            "queued": len(self._queue),
+            "running": len(self._running),
+            "started": self._started,
+            "average_wait": self._total_wait / self._started if self._started else 0.0,
+        }
+
+
+_scheduler = None
+
+
+def get_scheduler() -> RequestScheduler:
+    """
+    Returns the application-wide request scheduler, creating it on first use with the
+    server's parallelism as its concurrency limit.
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RequestScheduler(max_concurrent=server_parallelism())
+    return _scheduler
@@ -0,0 +1,237 @@
+# response_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from QtOllama.utility.constants import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), "QtOllama", "response_cache")
+
+_model_digests = {}
+
+
+def set_model_digests(models: List[Dict]):
+    """
+    Records the digest of every installed model, as listed by /api/tags.
+
+    Keys built afterwards change when a model is re-pulled under the same name, so
+    a new model version never serves answers of the old one.
+
+    Args:
+        models (list): Model dictionaries with "name" and "digest" keys.
+    """
+    for model in models:
+        if model.get("name") and model.get("digest"):
+            _model_digests[model["name"]] = model["digest"]
+
+
+def model_digest(model_name):
+    """
+    Returns the known digest of a model, or its name when the digest is unknown.
+    """
+    return _model_digests.get(model_name) or f"name:{model_name}"
+
+
+class ResponseCache:
+    """
+    A persistent, content-addressed cache of model responses.
+
+    Each entry is a small JSON file named after the SHA-256 of the model digest,
+    prompt, options and seed, so identical requests map to the same file across
+    sessions. Entries are evicted least recently used first once either the entry
+    count or the total size exceeds its limit; a hit refreshes the file's modification
+    time, which also carries the LRU order over to the next session.
+
+    Attributes:
+        directory (str): Where entries are stored.
+        max_entries (int): Maximum number of entries kept.
+        max_bytes (int): Maximum total size of the entries in bytes.
+        hits, misses, stores, evictions (int): Counters since the cache was opened.
+    Methods:
+        make_key(model_digest, prompt, options=None, seed=None):
+            Returns the content address of a request.
+        key_for(model_name, prompt, options=None):
+            Returns the key of a request using the model's known digest and the options' seed.
+        get(key):
+            Returns the cached response text, or None.
+        put(key, response, metadata=None):
+            Stores a response.
+        stats():
+            Returns the counters, entry count and size.
+        clear():
+            Removes every entry.
+    """
+    def __init__(self, directory=CACHE_DIRECTORY,
+                 max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+        self._evict()
+        logger.info(f"Response cache opened with {len(self._entries)} entries, {self._bytes} bytes")
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def make_key(model_digest, prompt, options=None, seed=None):
+        """
+        Returns the content address of a request.
+
+        Args:
+            model_digest (str): The digest of the model.
+            prompt (str): The full prompt.
+            options (dict, optional): Model options; key order does not matter.
+            seed (int, optional): The sampling seed.
+
+        Returns:
+            str: A hex SHA-256 digest.
+        """
+        material = json.dumps(
+            {"model": model_digest, "prompt": prompt, "options": options or {}, "seed": seed},
+            sort_keys=True, ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def key_for(self, model_name, prompt, options=None):
+        """
+        Returns the key of a request to a model by name.
+        """
+        options = dict(options or {})
+        seed = options.pop("seed", None)
+        return self.make_key(model_digest(model_name), prompt, options, seed)
+
+    def get(self, key) -> Optional[str]:
+        """
+        Looks up a response.
+
+        Args:
+            key (str): The request key.
+
+        Returns:
+            str: The cached response, or None on a miss.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.get("response")
+
+    def put(self, key, response, metadata=None):
+        """
+        Stores a response, replacing an existing entry with the same key.
+
+        Args:
+            key (str): The request key.
+            response (str): The response text.
+            metadata (dict, optional): Extra fields saved with the entry, e.g. the model name.
+        """
+        entry = dict(metadata or {}, response=response, created=time.time())
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        path = self._path(key)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(temporary_path, "wb") as f:
+                    f.write(data)
+                os.replace(temporary_path, path)
+            except OSError as e:
+                logger.error(f"Error writing cache entry {key}: {e}")
+                return
+            self._bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self.stores += 1
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key):
+        self._bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, stores, evictions, hit_rate, entries and bytes.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def clear(self):
+        """
+        Removes every entry from the cache.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+
+_cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Returns the application-wide response cache, opening it on first use.
+    """
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
@@ -1,12 +1,5 @@
 # simulation.py
-import logging
-import time
-import traceback
-import json
-
-import ollama
-from PyQt6.QtCore import QThread, pyqtSignal, pyqtSlot
-from PyQt6.QtGui import QTextCursor
+from PyQt6.QtCore import pyqtSlot
 from PyQt6.QtWidgets import (
     QDialog,
     QTextEdit,
@@ -23,149 +16,19 @@ from PyQt6.QtWidgets import (
     QMessageBox,
 )
 from QtOllama.utility.settings import load_settings
+from QtOllama.utility.conversation_engine import ConversationEngine
+from QtOllama.ui.stream_renderer import StreamRenderer, text_edit_sink
 from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
 
-def messages_to_prompt(messages):
-    """
-    Converts a list of message dictionaries into a formatted prompt string.
-
-    Each message dictionary should contain the keys "role" and "content".
-    The "role" key should have a value of either "system", "user", or "assistant".
-    The "content" key should contain the message text.
-
-    The function concatenates the content of each message into a single string,
-    with specific formatting based on the role:
-    - "system" messages are added as-is with double newlines.
-    - "user" messages are prefixed with "User: " and followed by a newline.
-    - "assistant" messages are prefixed with "Assistant: " and followed by a newline.
-
-    The final prompt string ends with "Assistant: ".
-
-    Args:
-        messages (list): A list of dictionaries, each containing "role" and "content" keys.
-
-    Returns:
-        str: A formatted prompt string.
-
-    Raises:
-        Exception: If an error occurs during the processing of messages.
-    """
-
-    try:
-        prompt = ""
-        for message in messages:
-            role = message["role"]
-            content = message["content"]
-            if role == "system":
-                prompt += content.strip() + "\n\n"
-            elif role == "user":
-                prompt += "User: " + content.strip() + "\n"
-            elif role == "assistant":
-                prompt += "Assistant: " + content.strip() + "\n"
-        prompt += "Assistant: "
-        return prompt
-    except Exception as e:
-        logger.error(f"{e}")
-
-
-class SimWorker(QThread):
-    """
-    SimWorker is a QThread subclass responsible for handling the simulation of message processing
-    using a specified model. It emits signals for new messages, completion, and errors.
-    Attributes:
-        new_message (pyqtSignal): Signal emitted when a new message chunk is received.
-                                  Parameters are the message content (str), a boolean indicating
-                                  if it's the first chunk (bool), and the start time (float).
-        complete_message (pyqtSignal): Signal emitted when the message processing is complete.
-                                       Parameters are the complete message (str) and the start time (float).
-        error (pyqtSignal): Signal emitted when an error occurs. Parameter is the error message (str).
-    Args:
-        messages (list): List of messages to be processed.
-        model_name (str): Name of the model to be used for processing messages.
-    Methods:
-        run(): Executes the message processing simulation, emitting signals for new message chunks,
-               completion, and errors.
-    """
-    new_message = pyqtSignal(str, bool, float)
-    complete_message = pyqtSignal(str, float)
-    error = pyqtSignal(str)
-    
-    def __init__(self,
-                 messages: list,
-                 model_name: str):
-        super().__init__()
-        self.messages = messages
-        self.model_name = model_name  # Store the model name
-    
-    def run(self):
-        """
-        Executes the simulation by generating responses based on the provided messages.
-        This method performs the following steps:
-        1. Converts the messages to a prompt.
-        2. Logs the request details.
-        3. Generates responses from the model in a streaming manner.
-        4. Processes each chunk of the response:
-            - If the chunk is a string, attempts to parse it as JSON to extract the 'response' field.
-            - If the chunk is a dictionary, extracts the 'response' field directly.
-            - Logs and handles unexpected chunk types.
-        5. Emits new messages as they are received.
-        6. Emits a complete message once all chunks are processed.
-        Emits:
-            new_message (str, bool, float): Emitted for each chunk of the response.
-            complete_message (str, float): Emitted after all chunks are processed.
-            error (str): Emitted if an exception occurs during execution.
-        Logs:
-            Various debug and error messages related to the request and response processing.
-        Raises:
-            Exception: If any error occurs during the execution of the simulation.
-        """
-        start_time = time.time()
-        try:
-            prompt = messages_to_prompt(self.messages)
-            logging.debug(f"Ollama Request: model={self.model_name}, prompt={prompt}")
-            
-            responses = ollama.generate(model=self.model_name, prompt=prompt, stream=True)
-            
-            first_chunk = True
-            result = ""
-            
-            for chunk in responses:
-                logger.debug(f"Type of chunk: {type(chunk)}")
-                logger.debug(f"Chunk received: {chunk}")
-                # Handle chunk
-                if isinstance(chunk, str):
-                    try:
-                        chunk_dict = json.loads(chunk)
-                        content = chunk_dict.get('response', '')
-                    except json.JSONDecodeError:
-                        logging.error(f"Failed to parse chunk as JSON: {chunk}")
-                        content = chunk  # Use as is
-                elif isinstance(chunk, dict):
-                    content = chunk.get('response', '')
-                else:
-                    logger.error(f"Unexpected chunk type: {type(chunk)}")
-                    content = ''
-                result += content
-                self.new_message.emit(content, first_chunk, start_time)
-                first_chunk = False
-            
-            # After the loop, the generation is complete
-            self.complete_message.emit(result, start_time)
-        except Exception as e:
-            self.error.emit(
-                f"Error on sim worker: {e}, Trace: {traceback.format_exc()}"
-            )
-
-
 class SimulationDialog(QDialog):
     """    
     SimulationDialog is a QDialog subclass that facilitates a turn-based, role-playing simulation
     with a language model. It provides a user interface for setting up simulation parameters and 
     interacting with the simulation.
     Attributes:
-        sim_worker (SimWorker): The worker responsible for processing simulation interactions.
+        sim_request (StreamHandle): The streaming request generating the current reply.
         character_label (QLabel): Label for the character input field.
         character_edit (QLineEdit): Input field for the character name.
         messages (list): List to store messages exchanged during the simulation.
@@ -187,15 +50,14 @@ class SimulationDialog(QDialog):
         initialize_simulation(self):
         handle_dialog_finished(self, result):
         process_sim_worker(self):
-            Processes the simulation worker with the selected model.
-        handle_worker_error(self, error_message):
+            Streams the next reply with the selected model.
+        handle_worker_error(self, handle, error_message):
         send_user_input(self, user_text=None):
-        update_ai_response(self, ai_response, is_first_chunk, start_time):
-        update_conversation_history(self, full_response, start_time):
+        update_conversation_history(self, handle):
     """
     def __init__(self, text_editor, parent=None, selected_model=None):
         super().__init__(parent)
-        self.sim_worker = None
+        self.sim_request = None
         self.character_label = None
         self.character_edit = None
         self.messages = []
@@ -204,6 +66,7 @@ class SimulationDialog(QDialog):
         self.ai_response_edit = QTextEdit(self)
         self.ai_response_edit.setReadOnly(True)
         self.ai_response_edit.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)
+        self.stream_renderer = StreamRenderer(text_edit_sink(self.ai_response_edit), parent=self)
         
         self.user_input_edit = QLineEdit(self)
 
@@ -233,6 +96,7 @@ class SimulationDialog(QDialog):
         self.resize(600, 400)
         
         self.conversation_history = []
+        self.conversation = ConversationEngine()
         
         self.text_editor = text_editor
         self.selected_model = selected_model  # Store the selected model
@@ -410,16 +274,14 @@ class SimulationDialog(QDialog):
     
     def process_sim_worker(self):
         """
-        Processes the simulation worker by initializing and starting a new SimWorker instance.
+        Streams the next simulated reply on the shared streaming engine.
         This method performs the following steps:
         1. Determines the model to use based on the selected model or defaults to 'llama2'.
         2. Displays the progress bar.
-        3. Cleans up any existing SimWorker instance by quitting, waiting for it to finish, 
-           and disconnecting its signals.
-        4. Creates a new SimWorker instance with the conversation history and the determined model name.
-        5. Connects the new SimWorker's signals to the appropriate slots for handling new messages, 
-           completed messages, and errors.
-        6. Starts the new SimWorker instance.
+        3. Cancels the reply still in flight, if any; its late completion is ignored.
+        4. Starts a chat turn with the conversation history through the conversation engine,
+           which sends the structured history so the server only evaluates the new turn.
+        5. Attaches the stream renderer to the request's channel.
         """
         # Use the selected model
         if self.selected_model:
@@ -429,27 +291,26 @@ class SimulationDialog(QDialog):
         
         self.progress_bar.show()
         
-        # Clean up existing worker if it exists
-        if self.sim_worker:
-            self.sim_worker.quit()
-            self.sim_worker.wait()
-            self.sim_worker.new_message.disconnect()
-            self.sim_worker.error.disconnect()
-            self.sim_worker.complete_message.disconnect()
+        # Cancel the reply still in flight
+        if self.sim_request is not None:
+            self.sim_request.cancel()
         
-        # Create new SimWorker with model_name
-        self.sim_worker = SimWorker(self.conversation_history, model_name)
-        self.sim_worker.new_message.connect(self.update_ai_response)
-        self.sim_worker.complete_message.connect(self.update_conversation_history)
-        self.sim_worker.error.connect(self.handle_worker_error)
-        self.sim_worker.start()
+        self.stream_renderer.feed("\n\n🌐 ")
+        self.sim_request = self.conversation.start_turn(
+            model_name,
+            self.conversation_history,
+            on_finished=self.update_conversation_history,
+            on_error=self.handle_worker_error,
+            label="simulation",
+        )
+        self.stream_renderer.attach(self.sim_request.channel)
     
-    @pyqtSlot(str)
-    def handle_worker_error(self, error_message):
+    def handle_worker_error(self, handle, error_message):
         """
-        Handles errors encountered by a worker thread.
+        Handles errors encountered by the streaming request.
 
         Args:
+            handle (StreamHandle): The failed request.
             error_message (str): The error message to be displayed and logged.
 
         Side Effects:
@@ -457,8 +318,11 @@ class SimulationDialog(QDialog):
             - Updates the status message to indicate an error has occurred.
             - Hides the progress bar.
         """
-
-        print(error_message)
+        if handle is not self.sim_request:
+            return
+        self.sim_request = None
+        print(f"Error on sim request: {error_message}")
+        self.stream_renderer.finish()
         self.status_message.setText("An error occurred. Please view logs.")
         self.progress_bar.hide()
     
@@ -480,39 +344,19 @@ class SimulationDialog(QDialog):
             self.user_input_edit.clear()
             self.process_sim_worker()
     
-    @pyqtSlot(str, bool, float)
-    def update_ai_response(self, ai_response, is_first_chunk, start_time):
-        """
-        Updates the AI response in the text editor.
-
-        Args:
-            ai_response (str): The response generated by the AI.
-            is_first_chunk (bool): Flag indicating if this is the first chunk of the response.
-            start_time (float): The start time of the response generation.
-
-        Returns:
-            None
-        """
-
-        if ai_response.strip() != "":
-            if is_first_chunk:
-                ai_response = "\n\n🌐 " + ai_response
-            self.ai_response_edit.insertPlainText(ai_response)
-            self.ai_response_edit.moveCursor(QTextCursor.MoveOperation.End)
-            self.ai_response_edit.ensureCursorVisible()
-    
-    @pyqtSlot(str, float)
-    def update_conversation_history(self,
-                                    full_response,
-                                    start_time):
+    def update_conversation_history(self, handle):
         """
         Updates the conversation history with the AI response.
 
         Args:
-            full_response (str): The full response content from the assistant.
-            start_time (float): The start time of the response generation.
+            handle (StreamHandle): The finished request; handle.text holds the full reply.
         """
-        new_message = {"role": "assistant", "content": full_response.strip()}
+        if handle is not self.sim_request:
+            return
+        self.sim_request = None
+        # Keep the reply verbatim so the next turn shares the server's cached prefix
+        self.stream_renderer.finish()
+        new_message = {"role": "assistant", "content": handle.text}
         self.conversation_history.append(new_message)
         self.ai_response_edit.ensureCursorVisible()
         self.progress_bar.hide()
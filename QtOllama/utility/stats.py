@@ -1,52 +1,331 @@
+import hashlib
 import os
 import json
-import textstat as textstat
-from PyQt6.QtCore import QTimer, Qt
+import threading
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 from PyQt6.QtWidgets import QDialog, \
     QTextEdit, \
     QVBoxLayout, \
-    QTableWidget, \
-    QTableWidgetItem, \
+    QTableView, \
     QHeaderView
-from nltk import word_tokenize
-from textblob import TextBlob
 from datetime import datetime
+from QtOllama.ui.table_models import RowTableModel
+from QtOllama.utility.constants import STATS_DEBOUNCE_MS, STATS_MAX_WAIT_MS
 from QtOllama.utility.interpretations import Interpretations
+from QtOllama.utility.chat_statistics import ChatTotals, StatisticsTotal
+from QtOllama.utility.text_analysis import ParagraphMemo, TextCounts, analyze_text
 from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
 
+def compute_statistics(text, memo=None):
+    """
+    Computes the statistics of a text from one shared TextFeatures pass.
+
+    It does not touch any widget, so it can run on a worker thread.
+
+    Args:
+        text (str): The text to analyze.
+        memo (ParagraphMemo, optional): Paragraph statistics of an earlier version of
+            the text; only the paragraphs that changed since are analyzed.
+    Returns:
+        list: The rows of statistics_rows.
+    """
+    if memo is not None:
+        total = memo.update(text)
+        counts = total.counts if total.counts is not None else TextCounts()
+        return statistics_rows(counts, total.total_tokens, total.unique_tokens, total.sentiment)
+    features = analyze_text(text)
+    tokens = features.tokens
+    return statistics_rows(features, len(tokens), len(set(tokens)), features.sentiment)
+
+
+def chat_breakdown_rows(chat_totals):
+    """
+    Returns the statistics of a chat per role and per turn, from its running totals.
+
+    Args:
+        chat_totals (ChatTotals): The chat's per-message statistics.
+    Returns:
+        list: (statistic name, raw value, interpretation) tuples; empty before the
+            first message.
+    """
+    total = chat_totals.total
+    if total.counts is None:
+        return []
+    rows = []
+    for role, role_total in sorted(chat_totals.by_role.items()):
+        name = role.capitalize()
+        reading_ease = role_total.counts.flesch_reading_ease()
+        rows.extend([
+            (f"{name} messages", role_total.messages, ""),
+            (f"{name} words", role_total.counts.words, ""),
+            (f"{name} lexical diversity", role_total.lexical_diversity, ""),
+            (f"{name} Flesch Reading Ease", reading_ease,
+             Interpretations.flesch_reading_ease_interpretation(reading_ease)),
+        ])
+    turns = len(chat_totals.turns)
+    rows.extend([
+        ("Turns", turns, ""),
+        ("Words per turn", round(total.counts.words / turns, 1) if turns else 0, ""),
+    ])
+    return rows
+
+
+def statistics_rows(features, total_tokens, unique_tokens, sentiment):
+    """
+    Builds the statistics of a text from its counts.
+    This function calculates various statistics and readability scores from the counts of a
+    text, or the merged counts of many texts. The statistics include token counts, 
+    lexical diversity, character counts, syllable counts, sentence counts, readability scores, 
+    sentiment analysis, and more.
+    The following statistics are calculated and displayed:
+    - Characters: Total number of characters in the text.
+    - Letters: Total number of letters in the text, ignoring spaces.
+    - Words: Total number of words in the text.
+    - Unique words: Total number of unique words in the text.
+    - Difficult Words: Total number of difficult words in the text.
+    - Syllables: Total number of syllables in the text.
+    - Mono Syllables: Total number of monosyllabic words in the text.
+    - Poly Syllables: Total number of polysyllabic words in the text.
+    - Sentences: Total number of sentences in the text.
+    - Lines: Total number of lines in the text.
+    - Paragraphs: Total number of paragraphs in the text.
+    - Total tokens: Total number of tokens in the text.
+    - Unique tokens: Total number of unique tokens in the text.
+    - Lexical diversity: Ratio of unique tokens to total tokens.
+    - Sentiment Polarity: Sentiment polarity score of the text.
+    - Sentiment Subjectivity: Sentiment subjectivity score of the text.
+    - Flesch Reading Ease: Flesch Reading Ease score of the text.
+    - Flesch-Kincaid Grade Level: Flesch-Kincaid Grade Level score of the text.
+    - Smog Index: SMOG index of the text.
+    - Gunning Fog: Gunning Fog index of the text.
+    - Automated Readability Index: Automated Readability Index of the text.
+    - Text Standards: Text standard score of the text.
+    - Spache Readability Formula: Spache Readability Formula score of the text.
+    - McAlpine EFLAW Readability Score: McAlpine EFLAW Readability Score of the text.
+    - Dale-Chall Readability Score: Dale-Chall Readability Score of the text.
+    - Linsear Write Formula: Linsear Write Formula score of the text.
+    - Coleman-Liau Index: Coleman-Liau Index of the text.
+    - Estimated Reading Time (minutes): Estimated reading time for the text.
+    Args:
+        features (TextCounts): The counts of the text.
+        total_tokens (int): NLTK tokens in the text.
+        unique_tokens (int): Distinct NLTK tokens.
+        sentiment (Sentiment): The text's polarity and subjectivity.
+    Returns:
+        list: One (statistic name, raw value, interpretation) tuple per statistic; the
+            interpretation is an empty string where there is none.
+    """
+    # todo ask coco or chatty for help with a better explanation here
+    lexical_diversity = unique_tokens / total_tokens if total_tokens > 0 else 0
+    # basic MS WORD stats :D
+    characters = features.characters
+    letters = features.letters
+    words = features.words
+    sentences = features.sentences
+    syllables = features.syllables
+    lines = features.lines
+    # Returns the Flesch-Kincaid Grade of the given text. This is a grade formula in that a
+    # score of 9.3 means that a ninth grader would be able to read the document.
+    # https://en.wikipedia.org/wiki/Flesch–Kincaid_readability_tests#Flesch–Kincaid_grade_level
+    flesch_reading_ease = features.flesch_reading_ease()
+    reading_ease_interpretation = Interpretations.flesch_reading_ease_interpretation(
+        flesch_reading_ease)
+    flesch_kincaid_grade = features.flesch_kincaid_grade()
+    flesch_kincaid_grade_interpretation = Interpretations.flesch_kincaid_grade_interpretation(
+        flesch_kincaid_grade)
+
+    # Returns the SMOG index of the given text. This is a grade formula in that a score of 9.3
+    # means that a ninth grader would be able to read the document.
+    # Texts of fewer than 30 sentences are statistically invalid, because the SMOG formula was
+    # normed on 30-sentence samples. textstat requires at least 3 sentences for a result.
+    # https://en.wikipedia.org/wiki/SMOG
+    smog_index = features.smog_index()
+
+    # Returns the FOG index of the given text. This is a grade formula in that a score of 9.3
+    # means that a ninth grader would be able to read the document.
+    # https://en.wikipedia.org/wiki/Gunning_fog_index
+    gunning_fog = features.gunning_fog()
+    gunning_fog_interpretation = Interpretations.gunning_fog_index_interpretation(gunning_fog)
+
+    # Returns the ARI (Automated Readability Index) which outputs a number that approximates
+    # the grade level needed to comprehend the text.
+    # For example if the ARI is 6.5, then the grade level to comprehend the text is 6th to 7th
+    # grade.
+    # https://en.wikipedia.org/wiki/Automated_readability_index
+    automated_readability_index = features.automated_readability_index()
+
+    # Different from other tests, since it uses a lookup table of the most commonly used 3000
+    # English words. Thus it returns the grade level using the New Dale-Chall Formula.
+    # https://en.wikipedia.org/wiki/Dale–Chall_readability_formula
+    dale_chall_readability_score = features.dale_chall_readability_score()
+    difficult_words = features.difficult_words
+    spache_read = features.spache_readability()
+    text_standards = features.text_standard(float_output=False)
+    linsear_write_formula = features.linsear_write_formula()
+    coleman_liau_index = features.coleman_liau_index()
+    coleman_liau_index_interpretation = Interpretations.coleman_liau_index_interpretation(
+        coleman_liau_index)
+    reading_time = features.reading_time(ms_per_char=2)
+    sentiment_polarity = round(sentiment.polarity, 2)
+    sentiment_polarity_interpretation = Interpretations.sentiment_polartiy_interpretation(
+        sentiment_polarity)
+    sentiment_subjectivity = round(sentiment.subjectivity, 2)
+    sentiment_subjectivity_interpretation = Interpretations.sentiment_subjectivity_interpretation(
+        sentiment_subjectivity)
+    unique_words = unique_tokens
+    mono_syl = features.monosyllables
+    poly_syl = features.polysyllables
+    mcalpine = features.mcalpine_eflaw()
+
+    number_of_paragraphs = features.paragraphs
+
+    stats = [
+        ("Characters", characters, ""),
+        ("Letters", letters, ""),
+        ("Words", words, ""),
+        ("Unique words", unique_words, ""),
+        ("Difficult Words", difficult_words, ""),
+        ("Syllables", syllables, ""),
+        ("Mono Syllables", mono_syl, ""),
+        ("Poly Syllables", poly_syl, ""),
+        ("Sentences", sentences, ""),
+        ("Lines", lines, ""),
+        ("Paragraphs", number_of_paragraphs, ""),
+        ("Total tokens", total_tokens, ""),
+        ("Unique tokens", unique_tokens, ""),
+        ("Lexical diversity", lexical_diversity, ""),
+        ("Sentiment Polarity", sentiment_polarity, sentiment_polarity_interpretation),
+        ("Sentiment Subjectivity", sentiment_subjectivity,
+         sentiment_subjectivity_interpretation),
+        ("Flesch Reading Ease", flesch_reading_ease, reading_ease_interpretation),
+        ("Flesch-Kincaid Grade Level", flesch_kincaid_grade,
+         flesch_kincaid_grade_interpretation),
+        ("Smog Index", smog_index, ""),
+        ("Gunning Fog", gunning_fog, gunning_fog_interpretation),
+        ("Automated Readability Index", automated_readability_index, ""),
+        ("Text Standards", text_standards, ""),
+        ("Spache Readability Formula", spache_read, ""),
+        ("McAlpine EFLAW Readability Score", mcalpine, ""),
+        ("Dale-Chall Readability Score", dale_chall_readability_score, ""),
+        ("Linsear Write Formula", linsear_write_formula, ""),
+        ("Coleman-Liau Index", coleman_liau_index, coleman_liau_index_interpretation),
+        ("Estimated Reading Time (minutes)", reading_time, ""),
+    ]
+    return stats
+
+
+class StatisticsWorker(QObject):
+    """
+    Computes text statistics on a background thread, always for the latest submitted text.
+
+    Only one text waits at a time: submitting while a computation runs replaces the
+    waiting text instead of queueing behind it, so a burst of edits costs at most one
+    extra run. The worker keeps a ParagraphMemo of the text it analyzed last, so
+    after an edit only the edited paragraphs are analyzed again, and the ChatTotals
+    of the chat messages submitted with it, so each message is analyzed once.
+    Results are emitted from the worker thread and delivered to receivers in the GUI
+    thread as queued connections.
+
+    Signals:
+        computed (int, list): The generation of the text and its statistics, as
+            returned by compute_statistics, followed by the chat_breakdown_rows.
+    Methods:
+        submit(generation, text, chat=None):
+            Schedules the statistics of a text, replacing any text still waiting.
+    """
+    computed = pyqtSignal(int, list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._pending = None
+        self._memo = ParagraphMemo(StatisticsTotal())
+        self._chat_totals = ChatTotals()
+        self._thread = threading.Thread(target=self._run, name="stats-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, generation, text, chat=None):
+        """
+        Args:
+            generation (int): Passed back with the statistics.
+            text (str): The text to analyze.
+            chat (tuple, optional): A ChatStatistics.snapshot() to break down per role
+                and turn.
+        """
+        with self._condition:
+            self._pending = (generation, text, chat)
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                generation, text, chat = self._pending
+                self._pending = None
+            started = time.perf_counter()
+            try:
+                stats = compute_statistics(text, self._memo)
+                if chat is not None:
+                    self._chat_totals.update(*chat)
+                    stats += chat_breakdown_rows(self._chat_totals)
+            except Exception as e:
+                logger.error(f"Error computing statistics: {e}", exc_info=True)
+                continue
+            logger.debug("Statistics of %d characters took %.3fs", len(text), time.perf_counter() - started)
+            self.computed.emit(generation, stats)
+
+
 class StatsDialog(QDialog):
     """
     A dialog window that displays real-time text statistics for a given QTextEdit widget.
+
+    The statistics are computed by a StatisticsWorker, off the GUI thread, and only
+    when the text has changed: edits to the document restart a short debounce timer
+    (at most STATS_MAX_WAIT_MS apart while the text keeps changing, e.g. during a
+    streamed reply), and a refresh whose text hashes the same as the last one is
+    skipped. While the dialog is hidden nothing is computed; showing it refreshes
+    once if the text changed in the meantime.
+
+    Given a ChatStatistics, the statistics are followed by a breakdown of the chat
+    per role and turn. The worker analyzes each recorded message once, on the first
+    refresh after it was added, so the chat itself never waits for the analysis.
+
     Attributes:
         text_edit_widget (QTextEdit): The text edit widget whose statistics are to be displayed.
-        timer (QTimer): A timer to periodically update the statistics.
-        table (QTableWidget): A table widget to display the statistics.
+        chat_statistics (ChatStatistics): The chat's recorded messages, or None.
+        debounce_timer (QTimer): Single-shot timer that starts a refresh once edits pause.
+        worker (StatisticsWorker): Computes the statistics of the text in the background.
+        model (RowTableModel): The statistics shown, one (statistic, raw value, interpretation) row each.
+        table (QTableView): A table view to display the statistics.
     Methods:
-        __init__(text_edit_widget: QTextEdit, parent=None):
+        __init__(text_edit_widget: QTextEdit, parent=None, chat_statistics=None):
             Initializes the StatsDialog with the given QTextEdit widget and optional parent.
         update_statistics():
-            Updates the statistics displayed in the table based on the current text in the text_edit_widget.
+            Refreshes the statistics if the text or chat changed since the last refresh.
+        show_statistics(stats):
+            Updates the table with computed statistics.
         save_stats():
             Saves the current statistics to a JSON file with a timestamp.
         closeEvent(event):
             Handles the close event by saving the current statistics before closing the dialog.
     """
-    def __init__(self, text_edit_widget: QTextEdit, parent=None):
+    def __init__(self, text_edit_widget: QTextEdit, parent=None, chat_statistics=None):
         """
         Initializes the statistics window for real-time text statistics.
         Args:
             text_edit_widget (QTextEdit): The text edit widget to monitor.
             parent (QWidget, optional): The parent widget. Defaults to None.
-        Attributes:
-            text_edit_widget (QTextEdit): The text edit widget to monitor.
-            table (QTableWidget): The table widget to display statistics.
-            timer (QTimer): Timer to update statistics every second.
+            chat_statistics (ChatStatistics, optional): Also break these chat messages
+                down per role and turn.
         """
         super().__init__(parent)
         
         self.text_edit_widget = text_edit_widget
+        self.chat_statistics = chat_statistics
         
         self.setWindowTitle("Real-Time Text Statistics")
         
@@ -56,184 +335,91 @@ class StatsDialog(QDialog):
         # create layout
         layout = QVBoxLayout()
         
-        # create tableWidget to display stats
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Statistic", "Raw Value", "Interpretation"])
+        # create a table view over the statistics model
+        self.model = RowTableModel(["Statistic", "Raw Value", "Interpretation"], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         
-        # add tableWidget to the layout
+        # add the table to the layout
         layout.addWidget(self.table)
-        
-        # set the layout to the layout which was the QVBoxLayout, fun right? :D
         self.setLayout(layout)
-        
-        # does things I need to ask about cause I didn't make this part of the app I'm modding it
-        # but I assume it's an auto time to update the statistics
-        # I wish the op developer would've maybe(I PROLLY DELETED THEM ACTUALLY) been more clear?
-        # but I admire the fuck out of them anyways so yeah FUCK ME for derping here,
-        # todo better comment here :D
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_statistics)
-        self.timer.start(1000)
-    
+
+        self._generation = 0
+        self._last_digest = None
+        self._changed_since = None
+        self._chat_version = None
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.timeout.connect(self.update_statistics)
+
+        self.worker = StatisticsWorker(self)
+        self.worker.computed.connect(self._on_computed)
+        self.text_edit_widget.document().contentsChange.connect(self._on_contents_change)
+        if self.chat_statistics is not None:
+            self.chat_statistics.changed.connect(self._schedule_refresh)
+
+    def _on_contents_change(self, position, removed, added):
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if not self.isVisible():
+            # showEvent refreshes; the hash tells whether anything changed
+            return
+        now = time.monotonic()
+        if self._changed_since is None:
+            self._changed_since = now
+        waited_ms = (now - self._changed_since) * 1000
+        self.debounce_timer.start(int(max(0, min(STATS_DEBOUNCE_MS, STATS_MAX_WAIT_MS - waited_ms))))
+
     def update_statistics(self):
         """
-        Updates the statistics of the text present in the text edit widget.
-        This method calculates various statistics and readability scores for the text present in the 
-        text edit widget and updates a table with these values. The statistics include token counts, 
-        lexical diversity, character counts, syllable counts, sentence counts, readability scores, 
-        sentiment analysis, and more.
-        The following statistics are calculated and displayed:
-        - Characters: Total number of characters in the text.
-        - Letters: Total number of letters in the text, ignoring spaces.
-        - Words: Total number of words in the text.
-        - Unique words: Total number of unique words in the text.
-        - Difficult Words: Total number of difficult words in the text.
-        - Syllables: Total number of syllables in the text.
-        - Mono Syllables: Total number of monosyllabic words in the text.
-        - Poly Syllables: Total number of polysyllabic words in the text.
-        - Sentences: Total number of sentences in the text.
-        - Lines: Total number of lines in the text.
-        - Paragraphs: Total number of paragraphs in the text.
-        - Total tokens: Total number of tokens in the text.
-        - Unique tokens: Total number of unique tokens in the text.
-        - Lexical diversity: Ratio of unique tokens to total tokens.
-        - Sentiment Polarity: Sentiment polarity score of the text.
-        - Sentiment Subjectivity: Sentiment subjectivity score of the text.
-        - Flesch Reading Ease: Flesch Reading Ease score of the text.
-        - Flesch-Kincaid Grade Level: Flesch-Kincaid Grade Level score of the text.
-        - Smog Index: SMOG index of the text.
-        - Gunning Fog: Gunning Fog index of the text.
-        - Automated Readability Index: Automated Readability Index of the text.
-        - Text Standards: Text standard score of the text.
-        - Spache Readability Formula: Spache Readability Formula score of the text.
-        - McAlpine EFLAW Readability Score: McAlpine EFLAW Readability Score of the text.
-        - Dale-Chall Readability Score: Dale-Chall Readability Score of the text.
-        - Linsear Write Formula: Linsear Write Formula score of the text.
-        - Coleman-Liau Index: Coleman-Liau Index of the text.
-        - Estimated Reading Time (minutes): Estimated reading time for the text.
-        The method updates a table with these statistics, where each row represents a different 
-        statistic, and the columns represent the statistic name, raw value, and interpretation (if 
-        applicable).
+        Sends the current text to the worker, unless it is the text of the last refresh.
+
+        Only reading the text and hashing it happen on the GUI thread; the statistics
+        arrive later through show_statistics.
         """
-        
-        # grabbing the text from the textWidget // chat_window so that them sexy stats can sassy on
+        self.debounce_timer.stop()
+        self._changed_since = None
         text = self.text_edit_widget.toPlainText()
-        
-        # how many tokens in the text?
-        tokens = word_tokenize(text)
-        total_tokens = len(tokens)
-        unique_tokens = len(set(tokens))
-        # todo ask coco or chatty for help with a better explanation here
-        lexical_diversity = unique_tokens / total_tokens if total_tokens > 0 else 0
-        # basic MS WORD stats :D
-        characters = len(text)
-        letters = textstat.letter_count(text, ignore_spaces=True)
-        words = textstat.lexicon_count(text)
-        sentences = textstat.sentence_count(text)
-        syllables = textstat.syllable_count(text)
-        lines = text.count("\n") + 1 if text else 0
-        # Returns the Flesch-Kincaid Grade of the given text. This is a grade formula in that a
-        # score of 9.3 means that a ninth grader would be able to read the document.
-        # https://en.wikipedia.org/wiki/Flesch–Kincaid_readability_tests#Flesch–Kincaid_grade_level
-        flesch_reading_ease = textstat.flesch_reading_ease(text)
-        reading_ease_interpretation = Interpretations.flesch_reading_ease_interpretation(
-            flesch_reading_ease)
-        flesch_kincaid_grade = textstat.flesch_kincaid_grade(text)
-        flesch_kincaid_grade_interpretation = Interpretations.flesch_kincaid_grade_interpretation(
-            flesch_kincaid_grade)
-        
-        # Returns the SMOG index of the given text. This is a grade formula in that a score of 9.3
-        # means that a ninth grader would be able to read the document.
-        # Texts of fewer than 30 sentences are statistically invalid, because the SMOG formula was
-        # normed on 30-sentence samples. textstat requires at least 3 sentences for a result.
-        # https://en.wikipedia.org/wiki/SMOG
-        smog_index = textstat.smog_index(text)
-        
-        # Returns the FOG index of the given text. This is a grade formula in that a score of 9.3
-        # means that a ninth grader would be able to read the document.
-        # https://en.wikipedia.org/wiki/Gunning_fog_index
-        gunning_fog = textstat.gunning_fog(text)
-        gunning_fog_interpretation = Interpretations.gunning_fog_index_interpretation(gunning_fog)
-        
-        # Returns the ARI (Automated Readability Index) which outputs a number that approximates
-        # the grade level needed to comprehend the text.
-        # For example if the ARI is 6.5, then the grade level to comprehend the text is 6th to 7th
-        # grade.
-        # https://en.wikipedia.org/wiki/Automated_readability_index
-        automated_readability_index = textstat.automated_readability_index(text)
-        
-        # Different from other tests, since it uses a lookup table of the most commonly used 3000
-        # English words. Thus it returns the grade level using the New Dale-Chall Formula.
-        # https://en.wikipedia.org/wiki/Dale–Chall_readability_formula
-        dale_chall_readability_score = textstat.dale_chall_readability_score(text)
-        difficult_words = textstat.difficult_words(text)
-        spache_read = textstat.spache_readability(text)
-        text_standards = textstat.text_standard(text, float_output=False)
-        linsear_write_formula = textstat.linsear_write_formula(text)
-        coleman_liau_index = textstat.coleman_liau_index(text)
-        coleman_liau_index_interpretation = Interpretations.coleman_liau_index_interpretation(
-            coleman_liau_index)
-        reading_time = textstat.reading_time(text, ms_per_char=2)
-        blob = TextBlob(text)
-        sentiment_polarity = round(blob.sentiment.polarity, 2)
-        sentiment_polarity_interpretation = Interpretations.sentiment_polartiy_interpretation(
-            sentiment_polarity)
-        sentiment_subjectivity = round(blob.sentiment.subjectivity, 2)
-        sentiment_subjectivity_interpretation = Interpretations.sentiment_subjectivity_interpretation(
-            sentiment_subjectivity)
-        unique_words = len(set(word_tokenize(text)))
-        mono_syl = textstat.monosyllabcount(text)
-        poly_syl = textstat.polysyllabcount(text)
-        mcalpine = textstat.mcalpine_eflaw(text)
-        
-        number_of_paragraphs = text.count("\n\n")
-        
-        stats = [
-            ("Characters", characters, ""),
-            ("Letters", letters, ""),
-            ("Words", words, ""),
-            ("Unique words", unique_words, ""),
-            ("Difficult Words", difficult_words, ""),
-            ("Syllables", syllables, ""),
-            ("Mono Syllables", mono_syl, ""),
-            ("Poly Syllables", poly_syl, ""),
-            ("Sentences", sentences, ""),
-            ("Lines", lines, ""),
-            ("Paragraphs", number_of_paragraphs, ""),
-            ("Total tokens", total_tokens, ""),
-            ("Unique tokens", unique_tokens, ""),
-            ("Lexical diversity", lexical_diversity, ""),
-            ("Sentiment Polarity", sentiment_polarity, sentiment_polarity_interpretation),
-            ("Sentiment Subjectivity", sentiment_subjectivity,
-             sentiment_subjectivity_interpretation),
-            ("Flesch Reading Ease", flesch_reading_ease, reading_ease_interpretation),
-            ("Flesch-Kincaid Grade Level", flesch_kincaid_grade,
-             flesch_kincaid_grade_interpretation),
-            ("Smog Index", smog_index, ""),
-            ("Gunning Fog", gunning_fog, gunning_fog_interpretation),
-            ("Automated Readability Index", automated_readability_index, ""),
-            ("Text Standards", text_standards, ""),
-            ("Spache Readability Formula", spache_read, ""),
-            ("McAlpine EFLAW Readability Score", mcalpine, ""),
-            ("Dale-Chall Readability Score", dale_chall_readability_score, ""),
-            ("Linsear Write Formula", linsear_write_formula, ""),
-            ("Coleman-Liau Index", coleman_liau_index, coleman_liau_index_interpretation),
-            ("Estimated Reading Time (minutes)", reading_time, ""),
-            
-        ]
-        
-        self.table.setRowCount(len(stats))
-        for i, (stat_name, raw_value, interpretation) in enumerate(stats):
-            self.table.setItem(i, 0, QTableWidgetItem(stat_name))
-            self.table.setItem(i, 1, QTableWidgetItem(str(raw_value)))
-            self.table.setItem(i, 2, QTableWidgetItem(interpretation))
-        
-        self.table.horizontalHeader().setSectionResizeMode(0,
-                                                           QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(1,
-                                                           QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        chat_version = self.chat_statistics.version if self.chat_statistics is not None else None
+        if digest == self._last_digest and chat_version == self._chat_version:
+            return
+        self._last_digest = digest
+        self._chat_version = chat_version
+        self._generation += 1
+        chat = self.chat_statistics.snapshot() if self.chat_statistics is not None else None
+        self.worker.submit(self._generation, text, chat)
+
+    def _on_computed(self, generation, stats):
+        # A newer text was submitted in the meantime; its statistics are on the way
+        if generation != self._generation:
+            return
+        self.show_statistics(stats)
+
+    def show_statistics(self, stats):
+        """
+        Updates the table with statistics; only the cells whose values changed are repainted.
+
+        Args:
+            stats (list): (statistic name, raw value, interpretation) tuples, as returned
+                by compute_statistics.
+        """
+        self.model.set_rows(stats)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.debounce_timer.start(0)
+
+    def hideEvent(self, event):
+        self.debounce_timer.stop()
+        self._changed_since = None
+        super().hideEvent(event)
     
     def save_stats(self):
         """
@@ -257,12 +443,14 @@ class StatsDialog(QDialog):
         # Define the filename where the stats will be saved
         stats_file = "./historical_stats.json"
         
-        # Gather all the stats from the table
+        # Nothing to save before the first statistics arrive
+        if not self.model.rowCount():
+            return
+
+        # Gather all the stats from the model
         stats = {}
-        for row in range(self.table.rowCount()):
-            stat_name = self.table.item(row, 0).text()
-            raw_value = self.table.item(row, 1).text()
-            stats[stat_name] = raw_value
+        for stat_name, raw_value, _ in self.model.rows():
+            stats[stat_name] = str(raw_value)
         
         # Add a timestamp to the stats
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,120 @@
+# stream_channel.py
+import queue
+import threading
+import time
+
+from QtOllama.utility.constants import STREAM_QUEUE_SIZE
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+
+class StreamChannel:
+    """
+    A bounded, lossless queue between a network reader and a GUI consumer.
+
+    The producer waits only when the queue is full, i.e. when the consumer really
+    fell behind; nothing is ever dropped. The consumer drains everything available
+    without blocking, typically once per rendered frame.
+
+    Attributes:
+        maxsize (int): The number of chunks the queue holds before the producer waits.
+        bytes (int): UTF-8 bytes of streamed text put into the channel.
+        chunks (int): Number of chunks put into the channel.
+        stall_time (float): Seconds the producer spent waiting for free space.
+    Methods:
+        try_put(chunk):
+            Adds a chunk if there is room, without waiting.
+        add_stall(seconds):
+            Records time a producer spent waiting for room, e.g. in an event loop.
+        close():
+            Marks the end of the stream.
+        drain():
+            Returns every queued chunk and whether the stream has ended.
+        stats():
+            Returns the per-stream counters as a dictionary.
+    """
+    _END = object()
+
+    def __init__(self, maxsize=STREAM_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._closed = threading.Event()
+        self._finished = False
+        self._started = time.perf_counter()
+        self.bytes = 0
+        self.chunks = 0
+        self.stall_time = 0.0
+
+    def try_put(self, chunk):
+        """
+        Adds a chunk only if the queue has room.
+
+        Args:
+            chunk (str): The streamed text.
+
+        Returns:
+            bool: True if the chunk was queued.
+        """
+        try:
+            self._queue.put_nowait(chunk)
+        except queue.Full:
+            return False
+        self._count(chunk)
+        return True
+
+    def add_stall(self, seconds):
+        """
+        Adds producer waiting time measured by the caller.
+        """
+        self.stall_time += seconds
+
+    def _count(self, chunk):
+        self.bytes += len(chunk.encode("utf-8"))
+        self.chunks += 1
+
+    def close(self):
+        """
+        Marks the end of the stream. Already queued chunks remain drainable.
+        """
+        if not self._closed.is_set():
+            self._closed.set()
+            try:
+                self._queue.put_nowait(self._END)
+            except queue.Full:
+                pass
+
+    def drain(self):
+        """
+        Removes and returns everything currently queued without blocking.
+
+        Returns:
+            tuple: (list of str chunks, bool telling whether the stream has ended
+            and every chunk has been drained).
+        """
+        chunks = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is self._END:
+                self._finished = True
+            else:
+                chunks.append(item)
+        if self._closed.is_set() and not self._finished and self._queue.empty():
+            self._finished = True
+        return chunks, self._finished
+
+    def stats(self):
+        """
+        Returns the per-stream counters.
+
+        Returns:
+            dict: bytes, chunks, stall_time (seconds) and elapsed (seconds).
+        """
+        return {
+            "bytes": self.bytes,
+            "chunks": self.chunks,
+            "stall_time": self.stall_time,
+            "elapsed": time.perf_counter() - self._started,
+        }
@@ -0,0 +1,582 @@
+# text_analysis.py
+"""
+One shared analysis pass over a text, from which every statistic of the application is derived.
+
+textstat computes each metric from the raw text: every readability formula splits
+the text into words and sentences again, and counts the syllables of every word
+again through a 128-entry cache that large texts thrash. TextFeatures segments
+and tokenizes the text once, counts the syllables of each distinct word once, and
+derives the readability formulas from those counts. The results are the same as
+textstat's to the last bit; the rules below mirror textstat's word and sentence
+splitting for that reason.
+
+For documents that are edited and analyzed again and again, ParagraphMemo keeps
+the counts of each paragraph and re-analyzes only the paragraphs that changed.
+
+Run
+
+    python -m QtOllama.utility.text_analysis --size 1000000
+
+to compare the pipeline with the per-metric textstat calls on a 1 MB text.
+"""
+import argparse
+import math
+import random
+import re
+import time
+from collections import Counter
+from functools import cached_property, lru_cache
+from typing import NamedTuple
+
+from textstat.backend.utils import get_cmudict, get_grade_suffix, get_lang_cfg, get_lang_easy_words, get_pyphen
+from textstat.backend.utils.constants import RE_NONCONTRACTION_APOSTROPHE
+
+LANGUAGE = "en_US"
+SYLLABLE_CACHE_SIZE = 200000
+ANALYSIS_CACHE_SIZE = 4
+LINSEAR_SAMPLE_WORDS = 100
+
+_NONCONTRACTION_APOSTROPHE = re.compile(RE_NONCONTRACTION_APOSTROPHE)
+_PUNCTUATION = re.compile(r"[^\w\s\']")
+_NON_WORD_CHARACTERS = re.compile(r"\W")
+_WHITESPACE = re.compile(r"\s")
+_WORD_CHARACTER = re.compile(r"\w")
+_SENTENCE = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+# A blank line after a sentence's terminal punctuation: no word, token or sentence
+# runs across it, so the counts of the text on either side add up exactly
+_PARAGRAPH_BREAK = re.compile(r"(?<=[.!?])(?=[^\S\n]*\n)")
+
+
+def split_words(text):
+    """
+    Splits a text into words the way textstat does: punctuation removed except the
+    apostrophes of English contractions, then split on whitespace.
+    """
+    text = _NONCONTRACTION_APOSTROPHE.sub("", text)
+    return _PUNCTUATION.sub("", text).split()
+
+
+def split_paragraphs(text):
+    """
+    Splits a text into paragraphs whose counts add up to the counts of the whole text.
+
+    A paragraph ends at a line end that follows terminal punctuation; the line break
+    and any blank lines start the next paragraph. Each message of the chat display is
+    a line, so it becomes a paragraph of its own. Lines whose last sentence is
+    unfinished are kept together with the next one, since textstat's sentences run
+    across line breaks.
+    """
+    return _PARAGRAPH_BREAK.split(text)
+
+
+def count_sentences(text):
+    """
+    Counts sentences the way textstat does; fragments of two words or fewer are not sentences.
+    """
+    if not text:
+        return 0
+    return max(1, _count_sentence_matches(text))
+
+
+def _count_sentence_matches(text):
+    # Sentences without textstat's minimum of one, so that they add up over paragraphs
+    sentences = _SENTENCE.findall(text)
+    ignored = 0
+    for sentence in sentences:
+        # Removing punctuation never removes whitespace, so a whitespace token
+        # yields a word exactly when it contains a word character
+        words = 0
+        for token in sentence.split():
+            if _WORD_CHARACTER.search(token):
+                words += 1
+                if words > 2:
+                    break
+        if words <= 2:
+            ignored += 1
+    return len(sentences) - ignored
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def syllable_count(word):
+    """
+    Returns the syllables of a lowercase word: its CMU dictionary pronunciation, or Pyphen's hyphenation.
+    """
+    try:
+        return sum(1 for phone in get_cmudict(LANGUAGE)[word][0] if phone[-1].isdigit())
+    except (TypeError, IndexError, KeyError):
+        return len(get_pyphen(LANGUAGE).positions(word)) + 1
+
+
+class Sentiment(NamedTuple):
+    """
+    TextBlob's sentiment of a text, with the number of assessed words and phrases it averages.
+    """
+    polarity: float
+    subjectivity: float
+    weight: int
+
+
+class TextCounts:
+    """
+    The counts of one text, computed in a single pass, and every statistic derived from them.
+
+    Counts add up: `counts += other` merges the counts of another text, so the
+    statistics of many messages can be kept up to date without analyzing any text
+    twice, and `counts -= other` takes a merged text out again. Every count but
+    Linsear Write's sample is exact for merged counts; that formula samples the first
+    100 words, which for merged counts come from the first part that has words.
+
+    Attributes:
+        characters (int): All characters.
+        characters_no_spaces (int): Characters other than whitespace.
+        letters (int): Word characters (letters, digits and underscores).
+        lines (int): Lines, 0 for an empty text.
+        paragraphs (int): Blank-line separators, as counted by the statistics dialog.
+        whitespace_tokens (int): Whitespace-separated tokens, punctuation included.
+        words (int): Words, punctuation removed.
+        word_counts (Counter): Occurrences of each word form, case preserved.
+        syllables (int): Syllables of all words.
+        monosyllables (int): Words of one syllable.
+        polysyllables (int): Words of three or more syllables.
+        miniwords (int): Words of three letters or fewer.
+        difficult_words (int): Distinct word forms outside the Dale-Chall list with two or more syllables.
+        sentences (int): Sentences.
+    Methods:
+        word_frequencies(stopwords=()):
+            Lowercase word frequencies, e.g. for a word cloud.
+        flesch_reading_ease(), flesch_kincaid_grade(), smog_index(), gunning_fog(),
+        automated_readability_index(), dale_chall_readability_score(), spache_readability(),
+        linsear_write_formula(), coleman_liau_index(), mcalpine_eflaw(), text_standard(),
+        reading_time(ms_per_char):
+            The textstat formulas of the same names, from the counts above.
+    """
+    def __init__(self, text=""):
+        self.characters = len(text)
+        self.characters_no_spaces = len(_WHITESPACE.sub("", text))
+        self.letters = len(_NON_WORD_CHARACTERS.sub("", text))
+        self.lines = text.count("\n") + 1 if text else 0
+        self.paragraphs = text.count("\n\n")
+        tokens = text.split()
+        self.whitespace_tokens = len(tokens)
+
+        words = split_words(text)
+        self.words = len(words)
+        self.word_counts = Counter(words)
+        self.sentences = count_sentences(text)
+        self._sentence_matches = _count_sentence_matches(text) if text else 0
+
+        easy_words = get_lang_easy_words(LANGUAGE)
+        self.syllables = self.monosyllables = self.polysyllables = self.miniwords = 0
+        # Occurrences of words outside the easy list by syllable threshold, for the
+        # Spache (2), Gunning fog (3) and Dale-Chall (any) formulas
+        self._unfamiliar = {0: 0, 2: 0, 3: 0}
+        self._difficult_forms = Counter()
+        for word, count in self.word_counts.items():
+            lower = word.lower()
+            syllables = syllable_count(lower)
+            self.syllables += syllables * count
+            if syllables == 1:
+                self.monosyllables += count
+            elif syllables >= 3:
+                self.polysyllables += count
+            if len(word.replace("'", "")) <= 3:
+                self.miniwords += count
+            if lower not in easy_words:
+                for threshold in self._unfamiliar:
+                    if syllables >= threshold:
+                        self._unfamiliar[threshold] += count
+                if syllables >= 2:
+                    self._difficult_forms[word] += count
+
+        self._linsear = self._linsear_counts(tokens, words)
+
+    _ADDITIVE = ("characters", "characters_no_spaces", "letters", "lines", "paragraphs", "whitespace_tokens",
+                 "words", "syllables", "monosyllables", "polysyllables", "miniwords", "sentences", "_sentence_matches")
+
+    def __iadd__(self, other):
+        for name in self._ADDITIVE:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.word_counts.update(other.word_counts)
+        for threshold, count in other._unfamiliar.items():
+            self._unfamiliar[threshold] += count
+        self._difficult_forms.update(other._difficult_forms)
+        if not any(self._linsear):
+            self._linsear = other._linsear
+        return self
+
+    def __isub__(self, other):
+        for name in self._ADDITIVE:
+            setattr(self, name, getattr(self, name) - getattr(other, name))
+        for mine, theirs in ((self.word_counts, other.word_counts),
+                             (self._difficult_forms, other._difficult_forms)):
+            # Counter's own -= would scan every word of the total
+            mine.subtract(theirs)
+            for word in theirs:
+                if mine[word] <= 0:
+                    del mine[word]
+        for threshold, count in other._unfamiliar.items():
+            self._unfamiliar[threshold] -= count
+        return self
+
+    def __add__(self, other):
+        total = TextCounts()
+        total += self
+        total += other
+        return total
+
+    @property
+    def difficult_words(self):
+        return len(self._difficult_forms)
+
+    @staticmethod
+    def _linsear_counts(tokens, words):
+        # Linsear Write samples the first 100 words and the sentences they span
+        if len(tokens) > LINSEAR_SAMPLE_WORDS:
+            sample, consumed = [], 0
+            while consumed < len(tokens) and len(sample) < LINSEAR_SAMPLE_WORDS:
+                word_parts = split_words(tokens[consumed])
+                consumed += 1
+                if word_parts:
+                    sample.append(word_parts[0])
+        else:
+            sample, consumed = words, len(tokens)
+        easy = difficult = 0
+        for word in sample:
+            syllables = syllable_count(word.lower())
+            if syllables >= 3:
+                difficult += 1
+            elif syllables > 0:
+                easy += 1
+        return easy, difficult, count_sentences(" ".join(tokens[:consumed]))
+
+    def word_frequencies(self, stopwords=()):
+        """
+        Returns how often each lowercase word occurs, leaving out stopwords and numbers.
+        """
+        frequencies = Counter()
+        for word, count in self.word_counts.items():
+            lower = word.lower()
+            if lower not in stopwords and not lower.isdigit():
+                frequencies[lower] += count
+        return frequencies
+
+    # /////////////////////////////////////////////////////////////////////////////////////
+    # READABILITY
+    # /////////////////////////////////////////////////////////////////////////////////////
+    @property
+    def words_per_sentence(self):
+        return self.words / self.sentences if self.sentences else 0.0
+
+    @property
+    def syllables_per_word(self):
+        return self.syllables / self.words if self.words else 0.0
+
+    def _percent_unfamiliar(self, threshold):
+        return 100 * self._unfamiliar[threshold] / self.words
+
+    def flesch_reading_ease(self):
+        sentence_length, syllables = self.words_per_sentence, self.syllables_per_word
+        if sentence_length == 0 or syllables == 0:
+            return 0.0
+        return (get_lang_cfg(LANGUAGE, "fre_base")
+                - get_lang_cfg(LANGUAGE, "fre_sentence_length") * sentence_length
+                - get_lang_cfg(LANGUAGE, "fre_syll_per_word") * syllables)
+
+    def flesch_kincaid_grade(self):
+        sentence_length, syllables = self.words_per_sentence, self.syllables_per_word
+        if sentence_length == 0 or syllables == 0:
+            return 0.0
+        return 0.39 * sentence_length + 11.8 * syllables - 15.59
+
+    def smog_index(self):
+        if not self.sentences:
+            return 0.0
+        return 1.043 * (30 * (self.polysyllables / self.sentences)) ** 0.5 + 3.1291
+
+    def gunning_fog(self):
+        if not self.words:
+            return 0.0
+        return 0.4 * (self.words_per_sentence + self._percent_unfamiliar(3))
+
+    def automated_readability_index(self):
+        characters = self.characters_no_spaces / self.whitespace_tokens if self.whitespace_tokens else 0.0
+        sentence_length = self.words_per_sentence
+        if characters == 0 or sentence_length == 0:
+            return 0.0
+        return 4.71 * characters + 0.5 * sentence_length - 21.43
+
+    def dale_chall_readability_score(self):
+        if not self.words:
+            return 0.0
+        percent_difficult = self._percent_unfamiliar(0)
+        score = 0.1579 * percent_difficult + 0.0496 * self.words_per_sentence
+        if percent_difficult > 5:
+            score += 3.6365
+        return score
+
+    def spache_readability(self):
+        if not self.words:
+            return 0.0
+        return 0.141 * self.words_per_sentence + 0.086 * self._percent_unfamiliar(2) + 0.839
+
+    def linsear_write_formula(self):
+        easy, difficult, sentences = self._linsear
+        if not sentences:
+            return 0.0
+        number = float((easy * 1 + difficult * 3) / sentences)
+        if number <= 20:
+            number -= 2
+        return number / 2
+
+    def coleman_liau_index(self):
+        letters = (self.letters / self.words if self.words else 0.0) * 100
+        sentences = (self.sentences / self.words if self.words else 0.0) * 100
+        if letters == 0 or sentences == 0:
+            return 0.0
+        return 0.058 * letters - 0.296 * sentences - 15.8
+
+    def mcalpine_eflaw(self):
+        if not self.sentences:
+            return 0.0
+        return (self.words + self.miniwords) / self.sentences
+
+    def reading_time(self, ms_per_char=14.69):
+        return ms_per_char * self.characters_no_spaces / 1000
+
+    def text_standard(self, float_output=False):
+        """
+        Returns the consensus grade of the other formulas, as textstat.text_standard does.
+        """
+        score = self.flesch_kincaid_grade()
+        grades = [math.floor(score), math.ceil(score), round(score)]
+        ease = self.flesch_reading_ease()
+        if 90 <= ease < 100:
+            grades.append(5)
+        elif 80 <= ease < 90:
+            grades.append(6)
+        elif 70 <= ease < 80:
+            grades.append(7)
+        elif 60 <= ease < 70:
+            grades.extend([8, 9])
+        elif 50 <= ease < 60:
+            grades.append(10)
+        elif 40 <= ease < 50:
+            grades.append(11)
+        elif 30 <= ease < 40:
+            grades.append(12)
+        else:
+            grades.append(13)
+        for score in (self.smog_index(), self.coleman_liau_index(), self.automated_readability_index(),
+                      self.dale_chall_readability_score(), self.linsear_write_formula(), self.gunning_fog()):
+            grades.extend([math.floor(score), math.ceil(score), round(score)])
+        grade = max(1, min(float(Counter(grades).most_common(1)[0][0]), 18))
+        if float_output:
+            return grade
+        lower = int(grade) - 1
+        upper = lower + 1
+        return f"{lower}{get_grade_suffix(lower)} and {upper}{get_grade_suffix(upper)} grade"
+
+
+class TextFeatures(TextCounts):
+    """
+    The counts of a text together with the text, for the statistics that need it whole.
+
+    Attributes:
+        text (str): The analyzed text.
+    Methods:
+        tokens, sentiment:
+            NLTK tokens and TextBlob sentiment, computed on first use.
+    """
+    def __init__(self, text):
+        super().__init__(text)
+        self.text = text
+
+    @cached_property
+    def tokens(self):
+        from nltk import word_tokenize
+        return word_tokenize(self.text)
+
+    @cached_property
+    def sentiment(self) -> Sentiment:
+        # TextBlob's default analyzer; called directly to keep the assessment count
+        from textblob.en import sentiment as pattern_sentiment
+        score = pattern_sentiment(self.text)
+        return Sentiment(score[0], score[1], len(score.assessments))
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def analyze_text(text) -> TextFeatures:
+    """
+    Returns the features of a text, reusing them when the same text was analyzed recently.
+    """
+    return TextFeatures(text)
+
+
+class Paragraph(NamedTuple):
+    """
+    The statistics of one paragraph, kept by ParagraphMemo while the paragraph is unchanged.
+    """
+    counts: TextFeatures
+    token_counts: Counter
+    sentiment: Sentiment
+
+
+class ParagraphMemo:
+    """
+    Statistics of a document that is analyzed again after every edit, re-analyzing only
+    the paragraphs that changed.
+
+    The document is split with split_paragraphs, and each paragraph's statistics are
+    memoized by its text. StatsDialog's worker keeps one for the chat display, so
+    refreshing after a reply analyzes the reply and not the whole transcript. An update takes the paragraphs that disappeared out of the
+    running totals and adds the new ones, so an edit costs the edited paragraphs, not
+    the document. The readability formulas are functions of the totals, and the counts
+    are exactly those of the whole text: lines, the sentence minimum and Linsear
+    Write's sample, which do not add up, are set from the whole text after each
+    update. NLTK tokens and TextBlob sentiment are taken per paragraph, and can differ
+    slightly from those of the whole text at paragraph boundaries.
+
+    Attributes:
+        total: The running totals, e.g. a chat_statistics.StatisticsTotal; anything with
+            `add(entry)`, `remove(entry)` and a `counts` attribute.
+    Methods:
+        update(text):
+            Brings the totals up to date with the document's text and returns them.
+    """
+    def __init__(self, total):
+        self.total = total
+        self._paragraphs = Counter()
+        self._memo = {}
+
+    def update(self, text):
+        paragraphs = [paragraph for paragraph in split_paragraphs(text) if paragraph]
+        occurrences = Counter(paragraphs)
+        memo = {}
+        for paragraph in occurrences:
+            memo[paragraph] = self._memo.get(paragraph) or self._analyze(paragraph)
+        for paragraph, count in (self._paragraphs - occurrences).items():
+            for _ in range(count):
+                self.total.remove(self._memo[paragraph])
+        for paragraph, count in (occurrences - self._paragraphs).items():
+            for _ in range(count):
+                self.total.add(memo[paragraph])
+        self._paragraphs, self._memo = occurrences, memo
+
+        counts = self.total.counts
+        if counts is not None:
+            counts.lines = text.count("\n") + 1 if text else 0
+            counts.sentences = max(1, counts._sentence_matches) if text else 0
+            counts._linsear = self._linsear_counts(paragraphs, memo)
+        return self.total
+
+    @staticmethod
+    def _analyze(paragraph):
+        features = TextFeatures(paragraph)
+        return Paragraph(features, Counter(features.tokens), features.sentiment)
+
+    @staticmethod
+    def _linsear_counts(paragraphs, memo):
+        # Linsear Write only reads the first words, so the leading paragraphs suffice
+        tokens = 0
+        for end, paragraph in enumerate(paragraphs, 1):
+            tokens += memo[paragraph].counts.whitespace_tokens
+            if tokens > LINSEAR_SAMPLE_WORDS:
+                break
+        sample = "".join(paragraphs[:end]) if paragraphs else ""
+        return TextCounts._linsear_counts(sample.split(), split_words(sample))
+
+
+# /////////////////////////////////////////////////////////////////////////////////////////
+# BENCHMARK
+# /////////////////////////////////////////////////////////////////////////////////////////
+def _textstat_metrics(text):
+    import textstat
+    return [
+        textstat.letter_count(text), textstat.lexicon_count(text), textstat.sentence_count(text),
+        textstat.syllable_count(text), textstat.flesch_reading_ease(text), textstat.flesch_kincaid_grade(text),
+        textstat.smog_index(text), textstat.gunning_fog(text), textstat.automated_readability_index(text),
+        textstat.dale_chall_readability_score(text), textstat.difficult_words(text),
+        textstat.spache_readability(text), textstat.text_standard(text, float_output=False),
+        textstat.linsear_write_formula(text), textstat.coleman_liau_index(text),
+        textstat.reading_time(text, ms_per_char=2), textstat.monosyllabcount(text),
+        textstat.polysyllabcount(text), textstat.mcalpine_eflaw(text),
+    ]
+
+
+def _pipeline_metrics(text):
+    features = TextFeatures(text)
+    return [
+        features.letters, features.words, features.sentences, features.syllables,
+        features.flesch_reading_ease(), features.flesch_kincaid_grade(), features.smog_index(),
+        features.gunning_fog(), features.automated_readability_index(),
+        features.dale_chall_readability_score(), features.difficult_words, features.spache_readability(),
+        features.text_standard(), features.linsear_write_formula(), features.coleman_liau_index(),
+        features.reading_time(ms_per_char=2), features.monosyllables, features.polysyllables,
+        features.mcalpine_eflaw(),
+    ]
+
+
+def sample_text(size, seed=0, vocabulary_size=8000):
+    """
+    Returns about `size` characters of English-like prose: a Zipf-distributed vocabulary
+    of common words, contractions and made-up words, with sentences and paragraphs.
+    """
+    rng = random.Random(seed)
+    common = (
+        "the a of and to in is was it that he she they we you for on with as at by this "
+        "don't can't it's we're they'll analysis reading extraordinary understanding"
+    ).split()
+    syllables = "ba co de fi gu ka le mo ni pu ra se ti vo wa ex in ter con tion al ing ly".split()
+    made_up = {"".join(rng.choice(syllables) for _ in range(rng.randint(1, 5))) for _ in range(vocabulary_size)}
+    vocabulary = common + sorted(made_up)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    parts, length = [], 0
+    while length < size:
+        sentence = " ".join(rng.choices(vocabulary, weights, k=rng.randint(3, 24)))
+        sentence = sentence.capitalize() + rng.choice((".", ".", ".", "?", "!", "...", ";"))
+        sentence += "\n\n" if rng.random() < 0.15 else " "
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)[:size]
+
+
+def benchmark(text):
+    """
+    Times the per-metric textstat calls against one TextFeatures pass on the same text.
+
+    Returns:
+        dict: Both timings in seconds, the speedup, and whether every value matched.
+    """
+    syllable_count.cache_clear()
+    started = time.perf_counter()
+    expected = _textstat_metrics(text)
+    textstat_time = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = _pipeline_metrics(text)
+    pipeline_time = time.perf_counter() - started
+    return {
+        "characters": len(text),
+        "textstat_seconds": round(textstat_time, 3),
+        "pipeline_seconds": round(pipeline_time, 3),
+        "speedup": round(textstat_time / pipeline_time, 1) if pipeline_time else None,
+        "identical": expected == actual,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the shared analysis pass with per-metric textstat calls.")
+    parser.add_argument("--size", type=int, default=1_000_000, help="characters of generated text")
+    parser.add_argument("--file", help="analyze this UTF-8 file instead of generated text")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = sample_text(args.size, args.seed)
+    for name, value in benchmark(text).items():
+        print(f"{name:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,26 @@
 
 
 import sys
-import json
-import time
 import pprint
 import platform
 import webbrowser
-import urllib.parse
-import urllib.request
 from threading import Thread
-from typing import Optional, List, Generator
+from typing import Optional, List
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QPushButton, QComboBox, QLineEdit, QTextEdit, QProgressBar, QLabel,
-    QListWidget, QFrame, QScrollArea, QMenuBar, QMenu, QMessageBox,
-    QSplitter, QSizePolicy
+    QListWidget, QFrame, QMenuBar, QMenu, QMessageBox,
+    QSplitter
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QEvent
+from PyQt6.QtCore import Qt, QTimer, QEvent
 from PyQt6.QtGui import QFont, QAction, QCursor, QTextCursor, QClipboard
 
+from QtOllama.utility.async_engine import get_engine
+from QtOllama.utility.request_metrics import format_metrics
+from QtOllama.ui.stream_renderer import StreamRenderer, text_edit_sink
+from QtOllama.ui.transcript_view import TranscriptView
+
 version = "1.2.1"
 
 
@@ -50,167 +51,15 @@ def _system_check() -> Optional[str]:
     return None
 
 
-class ModelWorker(QThread):
-    """Worker thread for model operations"""
-    finished = pyqtSignal()
-    error = pyqtSignal(str)
-    models_fetched = pyqtSignal(list)
-    log_message = pyqtSignal(str)
-
-    def __init__(self, api_url: str, operation: str = "fetch", model_name: str = ""):
-        super().__init__()
-        self.api_url = api_url
-        self.operation = operation
-        self.model_name = model_name
-
-    def run(self):
-        try:
-            if self.operation == "fetch":
-                models = self.fetch_models()
-                self.models_fetched.emit(models)
-            elif self.operation == "download":
-                self.download_model(self.model_name)
-            elif self.operation == "delete":
-                self.delete_model(self.model_name)
-        except Exception as e:
-            self.error.emit(str(e))
-        finally:
-            self.finished.emit()
-
-    def fetch_models(self) -> List[str]:
-        with urllib.request.urlopen(
-                urllib.parse.urljoin(self.api_url, "/api/tags")
-        ) as response:
-            data = json.load(response)
-            models = [model["name"] for model in data["models"]]
-            return models
-
-    def download_model(self, model_name: str, insecure: bool = False):
-        self.log_message.emit("Starting download...")
-        if not model_name:
-            return
-
-        req = urllib.request.Request(
-            urllib.parse.urljoin(self.api_url, "/api/pull"),
-            data=json.dumps(
-                {"name": model_name, "insecure": insecure, "stream": True}
-            ).encode("utf-8"),
-            method="POST",
-        )
-
-        with urllib.request.urlopen(req) as response:
-            for line in response:
-                data = json.loads(line.decode("utf-8"))
-                log = data.get("error") or data.get("status") or "No response"
-                if "status" in data:
-                    total = data.get("total")
-                    completed = data.get("completed", 0)
-                    if total:
-                        log += f" [{completed}/{total}]"
-                self.log_message.emit(log)
-
-    def delete_model(self, model_name: str):
-        if not model_name:
-            return
-
-        req = urllib.request.Request(
-            urllib.parse.urljoin(self.api_url, "/api/delete"),
-            data=json.dumps({"name": model_name}).encode("utf-8"),
-            method="DELETE",
-        )
-
-        with urllib.request.urlopen(req) as response:
-            if response.status == 200:
-                self.log_message.emit("Model deleted successfully.")
-            elif response.status == 404:
-                self.log_message.emit("Model not found.")
-
-
-class ChatWorker(QThread):
-    """Worker thread for chat responses"""
-    response_chunk = pyqtSignal(str)
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-
-    def __init__(self, api_url: str, model: str, chat_history: List[dict]):
-        super().__init__()
-        self.api_url = api_url
-        self.model = model
-        self.chat_history = chat_history
-        self.should_stop = False
-
-    def run(self):
-        try:
-            ai_message = ""
-            for chunk in self.fetch_chat_stream_result():
-                if self.should_stop:
-                    break
-                self.response_chunk.emit(chunk)
-                ai_message += chunk
-            self.finished.emit(ai_message)
-        except Exception as e:
-            self.error.emit(str(e))
-
-    def stop(self):
-        self.should_stop = True
-
-    def fetch_chat_stream_result(self) -> Generator:
-        request = urllib.request.Request(
-            urllib.parse.urljoin(self.api_url, "/api/chat"),
-            data=json.dumps(
-                {
-                    "model": self.model,
-                    "messages": self.chat_history,
-                    "stream": True,
-                }
-            ).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-
-        with urllib.request.urlopen(request) as resp:
-            for line in resp:
-                if self.should_stop:
-                    break
-                data = json.loads(line.decode("utf-8"))
-                if "message" in data:
-                    time.sleep(0.01)
-                    yield data["message"]["content"]
-
-
-class ChatBubble(QLabel):
-    """Custom chat bubble widget"""
-
-    def __init__(self, text: str, is_user: bool = False, parent=None):
-        super().__init__(parent)
-        self.setText(text)
-        self.setWordWrap(True)
-        self.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-        self.setContentsMargins(8, 8, 8, 8)
-
-        if is_user:
-            self.setStyleSheet("""
-                QLabel {
-                    background-color: #48a4f2;
-                    color: white;
-                    border-radius: 10px;
-                    padding: 8px;
-                }
-            """)
-            self.setAlignment(Qt.AlignmentFlag.AlignRight)
-        else:
-            self.setStyleSheet("""
-                QLabel {
-                    background-color: #eaeaea;
-                    color: black;
-                    border-radius: 10px;
-                    padding: 8px;
-                }
-            """)
-            self.setAlignment(Qt.AlignmentFlag.AlignLeft)
-
-        self.setMaximumWidth(400)
-        self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Minimum)
+def pull_log_line(data: dict) -> str:
+    """Formats one /api/pull progress record as a log line"""
+    log = data.get("error") or data.get("status") or "No response"
+    if "status" in data:
+        total = data.get("total")
+        completed = data.get("completed", 0)
+        if total:
+            log += f" [{completed}/{total}]"
+    return log + "\n"
 
 
 class ModelManagementWindow(QWidget):
@@ -300,12 +149,15 @@ class OllamaInterface(QMainWindow):
         super().__init__()
         self.api_url = "http://127.0.0.1:11434"
         self.chat_history = []
-        self.chat_worker = None
-        self.model_worker = None
+        self.chat_request = None
+        self.models_request = None
         self.management_window = None
-        self.current_response_bubble = None
+        self.current_response_row = None
+        self.stream_renderer = StreamRenderer(self.render_response_text, parent=self)
+        self.log_renderer = None
 
         self.init_ui()
+        self.stream_renderer.rate_updated.connect(self.on_stream_rate)
         self.check_system()
 
         # Refresh models after UI initialization
@@ -373,6 +225,9 @@ class OllamaInterface(QMainWindow):
         self.progress_bar.setRange(0, 0)  # Indeterminate progress
         progress_layout.addWidget(self.progress_bar)
 
+        self.stream_rate_label = QLabel()
+        progress_layout.addWidget(self.stream_rate_label)
+
         self.stop_button = QPushButton("Stop")
         self.stop_button.clicked.connect(self.stop_generation)
         progress_layout.addWidget(self.stop_button)
@@ -384,25 +239,14 @@ class OllamaInterface(QMainWindow):
         self.progress_frame = progress_frame
 
     def create_chat_area(self, main_layout):
-        # Create scroll area for chat
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)  # ИСПРАВЛЕНО
-
-        # Chat container
-        self.chat_container = QWidget()
-        self.chat_layout = QVBoxLayout(self.chat_container)
-        self.chat_layout.addStretch()  # Push messages to bottom initially
-
-        scroll_area.setWidget(self.chat_container)
-        main_layout.addWidget(scroll_area)
-
-        self.scroll_area = scroll_area
+        # Virtualized transcript: only visible messages are laid out and painted
+        self.chat_view = TranscriptView()
+        self.transcript = self.chat_view.transcript
+        main_layout.addWidget(self.chat_view)
 
         # Context menu for chat area
-        self.chat_container.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.chat_container.customContextMenuRequested.connect(self.show_chat_context_menu)
+        self.chat_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.chat_view.customContextMenuRequested.connect(self.show_chat_context_menu)
 
     def create_input_area(self, main_layout):
         input_frame = QFrame()
@@ -487,11 +331,17 @@ class OllamaInterface(QMainWindow):
         self.send_button.setEnabled(False)
         self.refresh_button.setEnabled(False)
 
-        self.model_worker = ModelWorker(self.api_url, "fetch")
-        self.model_worker.models_fetched.connect(self.on_models_fetched)
-        self.model_worker.error.connect(self.on_models_error)
-        self.model_worker.finished.connect(self.on_models_finished)
-        self.model_worker.start()
+        self.models_request = get_engine().request(
+            "GET", "/api/tags", host=self.api_url,
+            on_finished=self.on_models_loaded, on_error=self.on_models_failed)
+
+    def on_models_loaded(self, handle):
+        self.on_models_fetched([model["name"] for model in handle.result.get("models", [])])
+        self.on_models_finished()
+
+    def on_models_failed(self, handle, error: str):
+        self.on_models_error(error)
+        self.on_models_finished()
 
     def on_models_fetched(self, models):
         self.model_select.clear()
@@ -529,94 +379,73 @@ class OllamaInterface(QMainWindow):
         # Start AI response
         self.start_ai_response()
 
-    def add_chat_bubble(self, text: str, is_user: bool = False):
-        bubble = ChatBubble(text, is_user)
-
-        # Create container for alignment
-        container = QWidget()
-        container_layout = QHBoxLayout(container)
-        container_layout.setContentsMargins(10, 5, 10, 5)
-
-        if is_user:
-            container_layout.addStretch()
-            container_layout.addWidget(bubble)
-        else:
-            container_layout.addWidget(bubble)
-            container_layout.addStretch()
-
-        # Remove the stretch at the end if it exists
-        if self.chat_layout.count() > 0:
-            last_item = self.chat_layout.itemAt(self.chat_layout.count() - 1)
-            if last_item.spacerItem():
-                self.chat_layout.removeItem(last_item)
-
-        self.chat_layout.addWidget(container)
-        self.chat_layout.addStretch()
-
-        # Scroll to bottom
-        QTimer.singleShot(10, self.scroll_to_bottom)
-
-        return bubble
+    def add_chat_bubble(self, text: str, is_user: bool = False, model_name: str = "") -> int:
+        return self.transcript.append_message("user" if is_user else "assistant", text, model_name)
 
     def scroll_to_bottom(self):
-        scrollbar = self.scroll_area.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        self.chat_view.scrollToBottom()
 
     def start_ai_response(self):
         self.progress_frame.show()
         self.send_button.setEnabled(False)
         self.refresh_button.setEnabled(False)
 
-        # Add model name
+        # Create empty bubble for AI response, headed by the model name
         model_name = self.model_select.currentText()
-        model_label = QLabel(f"<b>{model_name}</b>")
-        model_label.setStyleSheet("color: #ff007b; margin: 5px 10px;")
-        self.chat_layout.insertWidget(self.chat_layout.count() - 1, model_label)
-
-        # Create empty bubble for AI response
-        self.current_response_bubble = self.add_chat_bubble("", is_user=False)
-
-        # Start chat worker
-        self.chat_worker = ChatWorker(self.api_url, model_name, self.chat_history.copy())
-        self.chat_worker.response_chunk.connect(self.on_response_chunk)
-        self.chat_worker.finished.connect(self.on_response_finished)
-        self.chat_worker.error.connect(self.on_response_error)
-        self.chat_worker.start()
-
-    def on_response_chunk(self, chunk: str):
-        if self.current_response_bubble:
-            current_text = self.current_response_bubble.text()
-            self.current_response_bubble.setText(current_text + chunk)
-            self.scroll_to_bottom()
-
-    def on_response_finished(self, full_response: str):
-        self.chat_history.append({"role": "assistant", "content": full_response})
-        self.current_response_bubble = None
+        self.current_response_row = self.add_chat_bubble("", is_user=False, model_name=model_name)
+        self.scroll_to_bottom()
+
+        # Stream the reply on the shared engine; text arrives through the request's channel
+        self.chat_request = get_engine().chat(
+            model_name, self.chat_history.copy(), host=self.api_url,
+            on_finished=self.on_response_finished, on_error=self.on_response_error)
+        self.stream_renderer.attach(self.chat_request.channel)
+
+    def render_response_text(self, text: str):
+        if self.current_response_row is not None:
+            self.transcript.append_text(self.current_response_row, text)
+
+    def on_stream_rate(self, chunks_per_second: float, frames_per_second: float):
+        self.stream_rate_label.setText(self.stream_renderer.rate_text())
+
+    def on_stream_stats(self, stats: dict):
+        self.statusBar().showMessage(
+            f"Last reply: {stats['chunks']} chunks, {stats['bytes']} bytes, "
+            f"UI stall {stats['stall_time']:.2f}s of {stats['elapsed']:.1f}s"
+        )
+
+    def on_response_finished(self, handle):
+        if handle is not self.chat_request:
+            return
+        self.chat_request = None
+        self.stream_renderer.finish()
+        self.on_stream_stats(handle.channel.stats())
+        if handle.metrics is not None:
+            self.stream_rate_label.setText(format_metrics(handle.metrics))
+        self.chat_history.append({"role": "assistant", "content": handle.text})
+        self.current_response_row = None
 
         self.progress_frame.hide()
         self.send_button.setEnabled(True)
         self.refresh_button.setEnabled(True)
 
-    def on_response_error(self, error: str):
-        if self.current_response_bubble:
-            self.current_response_bubble.setText(f"AI error: {error}")
-            self.current_response_bubble.setStyleSheet("""
-                QLabel {
-                    background-color: #ffebee;
-                    color: red;
-                    border-radius: 10px;
-                    padding: 8px;
-                }
-            """)
+    def on_response_error(self, handle, error: str):
+        if handle is not self.chat_request:
+            return
+        self.chat_request = None
+        self.stream_renderer.finish()
+        if self.current_response_row is not None:
+            self.transcript.set_error(self.current_response_row, f"AI error: {error}")
+            self.current_response_row = None
 
         self.progress_frame.hide()
         self.send_button.setEnabled(True)
         self.refresh_button.setEnabled(True)
 
     def stop_generation(self):
-        if self.chat_worker:
-            self.chat_worker.stop()
-            self.chat_worker.wait()
+        # Closes the connection so the server stops; the partial reply is still delivered
+        if self.chat_request:
+            self.chat_request.cancel()
 
     def show_model_management(self):
         if self.management_window is None:
@@ -631,18 +460,36 @@ class OllamaInterface(QMainWindow):
         self.management_window.update_models_list(models)
 
     def download_model_async(self, model_name: str):
-        worker = ModelWorker(self.api_url, "download", model_name)
-        worker.log_message.connect(self.management_window.append_log)
-        worker.finished.connect(self.on_model_operation_finished)
-        worker.start()
+        self.management_window.append_log("Starting download...")
+        if self.log_renderer is None:
+            self.log_renderer = StreamRenderer(text_edit_sink(self.management_window.log_textbox), parent=self)
+        request = get_engine().stream(
+            "/api/pull", {"name": model_name, "insecure": False}, host=self.api_url,
+            text_of=pull_log_line,
+            on_finished=self.on_model_operation_finished, on_error=self.on_model_operation_error)
+        self.log_renderer.attach(request.channel)
 
     def delete_model_async(self, model_name: str):
-        worker = ModelWorker(self.api_url, "delete", model_name)
-        worker.log_message.connect(self.management_window.append_log)
-        worker.finished.connect(self.on_model_operation_finished)
-        worker.start()
+        get_engine().request(
+            "DELETE", "/api/delete", {"name": model_name}, host=self.api_url,
+            on_finished=self.on_model_deleted, on_error=self.on_model_operation_error)
+
+    def on_model_deleted(self, handle):
+        self.management_window.append_log("Model deleted successfully.")
+        self.on_model_operation_finished(handle)
+
+    def on_model_operation_error(self, handle, error: str):
+        if self.log_renderer is not None:
+            self.log_renderer.finish()
+        if handle.status == 404:
+            self.management_window.append_log("Model not found.")
+        else:
+            self.management_window.append_log(error)
+        self.on_model_operation_finished(handle)
 
-    def on_model_operation_finished(self):
+    def on_model_operation_finished(self, handle=None):
+        if self.log_renderer is not None:
+            self.log_renderer.finish()
         if self.management_window:
             self.management_window.enable_download_button()
         self.refresh_models()
@@ -650,6 +497,11 @@ class OllamaInterface(QMainWindow):
     def show_chat_context_menu(self, position):
         context_menu = QMenu(self)
 
+        message = self.chat_view.message_at(position)
+        if message:
+            copy_message_action = context_menu.addAction("Copy Message")
+            copy_message_action.triggered.connect(lambda: QApplication.clipboard().setText(message))
+
         copy_all_action = context_menu.addAction("Copy All")
         copy_all_action.triggered.connect(self.copy_all)
 
@@ -658,25 +510,16 @@ class OllamaInterface(QMainWindow):
         clear_chat_action = context_menu.addAction("Clear Chat")
         clear_chat_action.triggered.connect(self.clear_chat)
 
-        context_menu.exec(self.chat_container.mapToGlobal(position))
+        context_menu.exec(self.chat_view.viewport().mapToGlobal(position))
 
     def copy_all(self):
         clipboard = QApplication.clipboard()
         clipboard.setText(pprint.pformat(self.chat_history))
 
     def clear_chat(self):
-        # Clear layout
-        while self.chat_layout.count() > 1:  # Keep the stretch
-            child = self.chat_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # Clear history
+        self.transcript.clear()
         self.chat_history.clear()
 
-        # Add stretch back
-        self.chat_layout.addStretch()
-
     @staticmethod
     def open_homepage():
         webbrowser.open("")
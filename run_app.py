@@ -1,10 +1,10 @@
 import sys
 
+from QtOllama.utility.lazy_imports import mark_startup
 from PyQt6.QtWidgets import QApplication, QStyleFactory
 
 from QtOllama.quilLlama import MainWindow
 from QtOllama.ui.wrap_style import stylesheet
-from QtOllama.utility.simulation import SimulationDialog
 
 
 from QtOllama.utility.logger_setup import create_logger
@@ -21,6 +21,7 @@ def run_app():
         except Exception as style_error:
             logger.error(f"{style_error}")
         window.show()
+        mark_startup("window shown")
         sys.exit(app.exec())
     except Exception as main_error:
         logger.error(f"Critical error: {str(main_error)}")
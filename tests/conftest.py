@@ -0,0 +1,34 @@
+# conftest.py
+import os
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """
+    The QApplication the widgets and queued signals of a test need.
+    """
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def process_events_until(qapp):
+    """
+    Returns a function that processes Qt events until a condition holds or a timeout expires.
+    """
+    def wait(condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            qapp.processEvents()
+            time.sleep(0.005)
+        return True
+    return wait
@@ -0,0 +1,93 @@
+# test_async_engine.py
+import time
+
+import pytest
+
+from QtOllama.utility import request_metrics
+from QtOllama.utility.async_engine import AsyncStreamingEngine
+from QtOllama.utility.fake_ollama import DEFAULT_MODELS, FakeOllamaServer, FakeOllamaSettings
+
+MODEL = DEFAULT_MODELS[0]
+MESSAGES = [{"role": "user", "content": "Tell me about the weather."}]
+REPLY_TOKENS = 200
+
+
+@pytest.fixture
+def server():
+    server = FakeOllamaServer(settings=FakeOllamaSettings(token_rate=100, latency=0.0,
+                                                          reply_tokens=REPLY_TOKENS)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def engine(qapp, tmp_path, monkeypatch):
+    store = request_metrics.MetricsStore(path=str(tmp_path / "request_metrics.jsonl"))
+    monkeypatch.setattr(request_metrics, "_store", store)
+    engine = AsyncStreamingEngine()
+    yield engine
+    engine.shutdown()
+    store.close()
+
+
+def chat(engine, server, finished, **kwargs):
+    # Nothing drains a channel here, so the text is only collected on the handle
+    return engine.chat(MODEL, MESSAGES, host=server.url, render=False, on_finished=finished.append,
+                       on_error=lambda handle, message: finished.append(handle), **kwargs)
+
+
+def test_a_stream_runs_to_completion(engine, server, process_events_until):
+    server.state.settings.token_rate = 0
+    finished = []
+    handle = chat(engine, server, finished)
+    assert process_events_until(lambda: finished)
+
+    assert finished == [handle]
+    assert not handle.cancelled and handle.error is None
+    assert len(handle.text.split()) == REPLY_TOKENS
+    assert handle.final["done"] and handle.final["eval_count"] == REPLY_TOKENS
+    assert engine.active_count() == 0
+
+
+def test_cancelling_a_stream_keeps_the_partial_text(engine, server, process_events_until):
+    finished = []
+    handle = chat(engine, server, finished)
+    assert process_events_until(lambda: handle.first_chunk_at is not None)
+    time.sleep(0.1)
+    handle.cancel()
+    cancelled_at = time.perf_counter()
+    assert process_events_until(lambda: finished)
+
+    assert finished == [handle]
+    assert handle.cancelled and handle.error is None
+    assert 0 < len(handle.text.split()) < REPLY_TOKENS
+    assert handle.final == {}
+    # The stream stops at once rather than when the reply would have ended
+    assert handle.finished_at - cancelled_at < 0.5
+    assert engine.active_count() == 0
+
+
+def test_cancelling_before_the_request_starts(engine, server, process_events_until):
+    finished = []
+    handle = chat(engine, server, finished)
+    handle.cancel()
+    handle.cancel()
+    assert process_events_until(lambda: finished)
+
+    assert finished == [handle]
+    assert handle.cancelled
+    assert len(handle.text.split()) < REPLY_TOKENS
+
+
+def test_the_engine_keeps_working_after_a_cancellation(engine, server, process_events_until):
+    finished = []
+    cancelled = chat(engine, server, finished)
+    assert process_events_until(lambda: cancelled.first_chunk_at is not None)
+    cancelled.cancel()
+    assert process_events_until(lambda: finished)
+
+    server.state.settings.token_rate = 0
+    handle = chat(engine, server, finished)
+    assert process_events_until(lambda: len(finished) == 2)
+    assert not handle.cancelled and handle.error is None
+    assert len(handle.text.split()) == REPLY_TOKENS
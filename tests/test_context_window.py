@@ -0,0 +1,107 @@
+# test_context_window.py
+from QtOllama.utility.context_window import ContextWindow
+
+
+def message(role, content="..."):
+    return {"role": role, "content": content}
+
+
+def filled_window(limit=1000, reserve=200, count=6, tokens=100):
+    window = ContextWindow(limit=limit, reserve=reserve)
+    window.append(message("system", "Be brief."), tokens=50)
+    messages = [message("user" if index % 2 == 0 else "assistant", f"message {index}")
+                for index in range(count)]
+    for item in messages:
+        window.append(item, tokens=tokens)
+    return window, messages
+
+
+def test_trim_drops_the_oldest_messages_until_the_window_fits():
+    window, messages = filled_window(count=10)
+    assert window.total_tokens == 1050
+
+    dropped = window.trim()
+    assert dropped == messages[:3]
+    assert window.total_tokens == 750 <= window.budget
+    assert window.window()[0]["role"] == "system"
+    assert window.window()[1:] == messages[3:]
+
+
+def test_trim_keeps_the_newest_message_even_if_it_does_not_fit():
+    window = ContextWindow(limit=1000, reserve=200)
+    window.append(message("user"), tokens=300)
+    window.append(message("user"), tokens=5000)
+    assert len(window.trim()) == 1
+    assert len(window) == 1
+    assert window.total_tokens == 5000
+
+
+def test_calibrate_charges_the_difference_to_the_newest_message():
+    window, _ = filled_window()
+    window.calibrate(prompt_tokens=700)
+    assert window.total_tokens == 700
+
+    # The next turn is calibrated on its own; earlier corrections stay
+    window.append(message("user"), tokens=100)
+    window.calibrate(prompt_tokens=820)
+    assert window.total_tokens == 820
+
+
+def test_calibrate_never_makes_a_message_empty():
+    window, _ = filled_window()
+    window.calibrate(prompt_tokens=10)
+    assert window.total_tokens == 650 - 100 + 1
+
+
+def test_calibrate_ignores_a_compaction_during_the_turn():
+    window, messages = filled_window()
+    sent_tokens = window.total_tokens
+    oldest = window.oldest(2)
+
+    # The summary of the two oldest messages lands while the reply streams
+    assert window.compact(oldest, message("system", "summary"), tokens=30)
+    assert window.total_tokens == sent_tokens - 200 + 30
+
+    window.calibrate(prompt_tokens=sent_tokens + 20, sent_tokens=sent_tokens)
+    assert window.total_tokens == sent_tokens - 200 + 30 + 20
+
+
+def test_compact_replaces_the_oldest_messages_with_a_summary():
+    window, messages = filled_window()
+    summary = message("system", "Summary of the first turns.")
+    assert window.compact(window.oldest(4), summary, tokens=40)
+
+    assert window.summary is summary
+    assert window.window() == [message("system", "Be brief."), summary] + messages[4:]
+    assert window.total_tokens == 50 + 40 + 200
+
+    newer = message("system", "Summary of every turn so far.")
+    assert window.compact(window.oldest(1), newer, tokens=60)
+    assert window.window()[1:] == [newer] + messages[5:]
+    assert window.total_tokens == 50 + 60 + 100
+
+
+def test_compact_refuses_messages_that_were_trimmed_meanwhile():
+    window, _ = filled_window(count=10)
+    oldest = window.oldest(4)
+    window.trim()
+    before = window.window()
+    assert not window.compact(oldest, message("system", "stale summary"))
+    assert window.window() == before
+    assert window.summary is None
+
+
+def test_compact_always_keeps_a_recent_message():
+    window, _ = filled_window(count=3)
+    assert not window.compact(window.oldest(3), message("system", "summary"))
+    assert window.unpinned_count == 3
+
+
+def test_trim_counts_the_summary():
+    window, messages = filled_window(limit=600, reserve=100)
+    assert window.compact(window.oldest(2), message("system", "summary"), tokens=250)
+    assert window.total_tokens == 50 + 250 + 400
+
+    dropped = window.trim()
+    assert dropped == messages[2:4]
+    assert window.total_tokens == 500 == window.budget
@@ -0,0 +1,66 @@
+# test_main_window.py
+import pytest
+
+from QtOllama import quilLlama
+from QtOllama.utility import request_metrics
+from QtOllama.utility.fake_ollama import FakeOllamaServer, FakeOllamaSettings
+from QtOllama.utility.model_catalog import ModelCatalog
+from QtOllama.utility.response_cache import ResponseCache
+
+
+@pytest.fixture
+def server():
+    server = FakeOllamaServer(settings=FakeOllamaSettings(token_rate=0, latency=0.0, reply_tokens=5)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def window(qapp, server, tmp_path, monkeypatch):
+    monkeypatch.setenv("OLLAMA_HOST", server.url)
+    cache = ResponseCache(str(tmp_path / "response_cache"))
+    monkeypatch.setattr(quilLlama, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(quilLlama, "ModelCatalog", lambda: ModelCatalog(path=str(tmp_path / "models.json")))
+    store = request_metrics.MetricsStore(path=str(tmp_path / "request_metrics.jsonl"))
+    monkeypatch.setattr(request_metrics, "_store", store)
+    window = quilLlama.MainWindow()
+    yield window
+    window.restart_chat()
+    window.deleteLater()
+    store.close()
+
+
+def send(window, process_events_until, text):
+    assert process_events_until(lambda: window.selected_model)
+    window.input_field.setText(text)
+    window.send_message()
+
+
+def test_repeating_an_analysis_without_a_selection_hits_the_cache(window, process_events_until):
+    send(window, process_events_until, "The weather is lovely today.")
+    assert process_events_until(lambda: len(window.messages) == 2)
+
+    for turn in range(1, 3):
+        window.perform_ai_analysis("Sentiment Analysis")
+        assert process_events_until(lambda: len(window.messages) == 2 + 2 * turn)
+
+    first_prompt, second_prompt = window.messages[2]["content"], window.messages[4]["content"]
+    assert first_prompt == second_prompt
+    assert "The weather is lovely today." in first_prompt
+    assert window.get_last_user_message() == "The weather is lovely today."
+    stats = window.response_cache.stats()
+    assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 1, 1)
+
+
+def test_stopping_before_the_first_token_adds_no_reply(window, server, process_events_until):
+    server.state.settings.latency = 2.0
+    send(window, process_events_until, "Tell me about the weather.")
+    assert process_events_until(lambda: window.active_request is not None)
+    handle = window.active_request
+    window.stop_chat()
+    assert process_events_until(lambda: window.active_request is None)
+
+    assert handle.cancelled and not handle.text
+    assert window.messages == [{"role": "user", "content": "Tell me about the weather."}]
+    assert window.chat_statistics.messages == [("user", "Tell me about the weather.")]
+    assert [message["role"] for message in window.context.window()] == ["user"]
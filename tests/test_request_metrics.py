@@ -0,0 +1,41 @@
+# test_request_metrics.py
+import json
+
+from QtOllama.utility.request_metrics import MetricsStore
+
+
+def metrics(index, model="llama3:8b"):
+    return {"time": index, "model": model, "capability": "chat", "cancelled": False, "ttft": 0.1,
+            "total_time": 1.0, "load_time": None, "prompt_tps": 100.0, "gen_tps": float(index)}
+
+
+def test_records_are_written_in_the_background(tmp_path):
+    path = tmp_path / "metrics" / "request_metrics.jsonl"
+    store = MetricsStore(path=str(path))
+    for index in range(3):
+        store.record(metrics(index))
+    assert len(store.records) == 3
+    store.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["time"] for line in lines] == [0, 1, 2]
+    store.record(metrics(3))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_the_file_is_rotated_and_read_back_newest_last(tmp_path):
+    path = tmp_path / "request_metrics.jsonl"
+    record_size = len(json.dumps(metrics(10))) + 1
+    store = MetricsStore(path=str(path), max_bytes=record_size * 10, backup_count=1)
+    for index in range(10, 45):
+        store.record(metrics(index))
+    store.close()
+
+    files = sorted(tmp_path.iterdir())
+    assert [file.name for file in files] == ["request_metrics.jsonl", "request_metrics.jsonl.1"]
+    assert all(file.stat().st_size <= record_size * 10 for file in files)
+
+    reopened = MetricsStore(path=str(path), history=15, max_bytes=record_size * 10, backup_count=1)
+    reopened.close()
+    assert [record["time"] for record in reopened.records] == list(range(30, 45))
+    assert reopened.summary()["llama3:8b"]["count"] == 15
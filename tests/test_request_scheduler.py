@@ -0,0 +1,137 @@
+# test_request_scheduler.py
+import itertools
+
+import pytest
+
+from QtOllama.utility.async_engine import StreamBridge
+from QtOllama.utility.constants import SCHEDULER_INTERACTIVE_RESERVE
+from QtOllama.utility.request_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RequestScheduler,
+)
+
+
+class StubHandle:
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class StubEngine:
+    """
+    Stands in for the AsyncStreamingEngine: requests start at once and end when the test says so.
+    """
+    def __init__(self):
+        self.bridge = StreamBridge()
+        self.started = []
+        self.handles = {}
+        self._ids = itertools.count(1)
+
+    def starter(self, label):
+        def start():
+            handle = StubHandle(next(self._ids))
+            self.started.append(label)
+            self.handles[label] = handle
+            return handle
+        return start
+
+    def finish(self, label):
+        self.bridge.finished.emit(self.handles[label].request_id)
+
+
+@pytest.fixture
+def engine(qapp):
+    return StubEngine()
+
+
+def submit(scheduler, engine, label, priority=PRIORITY_BACKGROUND, lane=None):
+    return scheduler.submit(engine.starter(label), priority=priority, label=label, lane=lane)
+
+
+def test_interactive_requests_start_before_queued_background_ones(engine):
+    scheduler = RequestScheduler(engine, max_concurrent=1)
+    submit(scheduler, engine, "blocker")
+    for label in ("background 1", "background 2"):
+        submit(scheduler, engine, label)
+    submit(scheduler, engine, "interactive 1", PRIORITY_INTERACTIVE)
+    assert engine.started == ["blocker", "interactive 1"]
+
+    submit(scheduler, engine, "interactive 2", PRIORITY_INTERACTIVE)
+    assert engine.started == ["blocker", "interactive 1"]
+
+    engine.finish("interactive 1")
+    assert engine.started[-1] == "interactive 2"
+    engine.finish("blocker")
+    engine.finish("interactive 2")
+    engine.finish("background 1")
+    assert engine.started == ["blocker", "interactive 1", "interactive 2", "background 1", "background 2"]
+
+
+def test_background_requests_keep_arrival_order(engine):
+    scheduler = RequestScheduler(engine, max_concurrent=1)
+    labels = [f"background {index}" for index in range(5)]
+    for label in labels:
+        submit(scheduler, engine, label)
+    for label in labels[:-1]:
+        engine.finish(label)
+    assert engine.started == labels
+
+
+def test_interactive_requests_use_the_reserve_beyond_the_limit(engine):
+    scheduler = RequestScheduler(engine, max_concurrent=2)
+    for index in range(3):
+        submit(scheduler, engine, f"background {index}")
+    assert scheduler.stats()["running"] == 2
+
+    for index in range(SCHEDULER_INTERACTIVE_RESERVE + 1):
+        submit(scheduler, engine, f"interactive {index}", PRIORITY_INTERACTIVE)
+    stats = scheduler.stats()
+    assert stats["running"] == 2 + SCHEDULER_INTERACTIVE_RESERVE
+    assert stats["queued"] == 2
+    assert "background 2" not in engine.started
+
+
+def test_a_lane_runs_one_request_at_a_time(engine):
+    scheduler = RequestScheduler(engine, max_concurrent=4)
+    submit(scheduler, engine, "turn 1", PRIORITY_INTERACTIVE, lane="chat")
+    submit(scheduler, engine, "turn 2", PRIORITY_INTERACTIVE, lane="chat")
+    submit(scheduler, engine, "analysis", lane="analysis")
+    assert engine.started == ["turn 1", "analysis"]
+
+    engine.finish("turn 1")
+    assert engine.started == ["turn 1", "analysis", "turn 2"]
+
+
+def test_cancelling_a_queued_request_drops_it(engine):
+    scheduler = RequestScheduler(engine, max_concurrent=1)
+    submit(scheduler, engine, "running")
+    queued = submit(scheduler, engine, "queued")
+    submit(scheduler, engine, "next")
+    queued.cancel()
+    engine.finish("running")
+    assert engine.started == ["running", "next"]
+
+
+def test_cancel_lane_cancels_queued_and_running_requests(engine):
+    scheduler = RequestScheduler(engine, max_concurrent=1)
+    running = submit(scheduler, engine, "turn 1", lane="chat")
+    submit(scheduler, engine, "turn 2", lane="chat")
+    submit(scheduler, engine, "other")
+    scheduler.cancel_lane("chat")
+    assert running.handle.cancelled
+
+    engine.finish("turn 1")
+    assert engine.started == ["turn 1", "other"]
+    assert scheduler.stats()["queued"] == 0
+
+
+def test_a_request_that_does_not_start_frees_its_slot(engine):
+    scheduler = RequestScheduler(engine, max_concurrent=1)
+    scheduler.submit(lambda: None, label="skipped")
+    submit(scheduler, engine, "next")
+    assert engine.started == ["next"]
+    assert scheduler.stats()["started"] == 2
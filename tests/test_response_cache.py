@@ -0,0 +1,74 @@
+# test_response_cache.py
+import os
+
+from QtOllama.utility import response_cache
+from QtOllama.utility.response_cache import ResponseCache
+
+
+def entry_size(tmp_path, response):
+    probe = ResponseCache(str(tmp_path / "probe"))
+    probe.put("probe", response)
+    return probe.stats()["bytes"]
+
+
+def test_count_limit_evicts_the_least_recently_used_entry(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.put(key, f"response {key}")
+    assert cache.get("a") == "response a"
+
+    cache.put("d", "response d")
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["response a", "response c", "response d"]
+    assert not os.path.exists(tmp_path / "b.json")
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["evictions"] == 1
+
+
+def test_byte_limit_evicts_until_the_entries_fit(tmp_path):
+    response = "x" * 1000
+    size = entry_size(tmp_path, response)
+    cache = ResponseCache(str(tmp_path / "cache"), max_entries=100, max_bytes=int(size * 2.5))
+    for key in ("a", "b", "c"):
+        cache.put(key, response)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= cache.max_bytes
+    assert cache.get("a") is None
+
+
+def test_replacing_an_entry_does_not_count_it_twice(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put("a", "short")
+    cache.put("a", "a longer response")
+    size = os.path.getsize(tmp_path / "a.json")
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == size
+    assert cache.get("a") == "a longer response"
+
+
+def test_reopening_keeps_the_usage_order_and_applies_the_limits(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    for age, key in enumerate(("old", "middle", "new")):
+        cache.put(key, key)
+        # Modification times order the entries across sessions
+        os.utime(tmp_path / f"{key}.json", (1000 + age, 1000 + age))
+
+    reopened = ResponseCache(str(tmp_path), max_entries=2)
+    assert reopened.get("old") is None
+    assert reopened.get("middle") == "middle"
+    assert reopened.get("new") == "new"
+
+
+def test_key_for_separates_the_seed_and_ignores_option_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "_model_digests", {})
+    cache = ResponseCache(str(tmp_path))
+    key = cache.key_for("llama3:8b", "prompt", {"temperature": 0.1, "top_k": 20, "seed": 7})
+    assert key == cache.key_for("llama3:8b", "prompt", {"seed": 7, "top_k": 20, "temperature": 0.1})
+    assert key == cache.make_key("name:llama3:8b", "prompt", {"temperature": 0.1, "top_k": 20}, 7)
+    assert key != cache.key_for("llama3:8b", "prompt", {"temperature": 0.1, "top_k": 20, "seed": 8})
+
+    response_cache.set_model_digests([{"name": "llama3:8b", "digest": "sha256:abc"}])
+    assert key != cache.key_for("llama3:8b", "prompt", {"temperature": 0.1, "top_k": 20, "seed": 7})
@@ -0,0 +1,74 @@
+# test_table_models.py
+import pytest
+from PyQt6.QtCore import Qt
+
+from QtOllama.ui.table_models import RowTableModel
+
+
+class ModelEvents:
+    """
+    Records the change notifications of a model.
+    """
+    def __init__(self, model):
+        self.events = []
+        model.modelReset.connect(lambda: self.events.append(("reset",)))
+        model.rowsInserted.connect(lambda parent, first, last: self.events.append(("inserted", first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: self.events.append(("removed", first, last)))
+        model.dataChanged.connect(lambda top_left, bottom_right, roles: self.events.append(
+            ("changed", top_left.row(), top_left.column(), bottom_right.row(), bottom_right.column())))
+
+    def take(self):
+        events, self.events = self.events, []
+        return events
+
+
+@pytest.fixture
+def model(qapp):
+    model = RowTableModel(["Statistic", "Raw Value", "Interpretation"])
+    model.set_rows([("Words", 10, ""), ("Sentences", 2, ""), ("Flesch", 80.0, "Easy")])
+    return model
+
+
+def cells(model):
+    return [[model.data(model.index(row, column)) for column in range(model.columnCount())]
+            for row in range(model.rowCount())]
+
+
+def test_equal_rows_emit_nothing(model):
+    events = ModelEvents(model)
+    model.set_rows([("Words", 10, ""), ("Sentences", 2, ""), ("Flesch", 80.0, "Easy")])
+    assert events.take() == []
+
+
+def test_only_the_changed_cells_of_a_row_are_reported(model):
+    events = ModelEvents(model)
+    model.set_rows([("Words", 12, ""), ("Sentences", 2, ""), ("Flesch", 65.0, "Standard")])
+    assert events.take() == [("changed", 0, 1, 0, 1), ("changed", 2, 1, 2, 2)]
+    assert cells(model) == [["Words", "12", ""], ["Sentences", "2", ""], ["Flesch", "65.0", "Standard"]]
+
+
+def test_rows_are_added_and_removed_at_the_end(model):
+    events = ModelEvents(model)
+    model.set_rows([("Words", 10, ""), ("Sentences", 2, ""), ("Flesch", 80.0, "Easy"),
+                    ("Turns", 1, ""), ("Words per turn", 10.0, "")])
+    assert events.take() == [("inserted", 3, 4)]
+
+    model.set_rows([("Words", 11, "")])
+    assert events.take() == [("removed", 1, 4), ("changed", 0, 1, 0, 1)]
+    assert cells(model) == [["Words", "11", ""]]
+
+
+def test_replacing_an_empty_or_emptied_table_resets_it(qapp):
+    model = RowTableModel(["Key", "Value"])
+    events = ModelEvents(model)
+    model.set_rows([("a", 1), ("b", 2)])
+    model.set_rows([])
+    assert events.take() == [("reset",), ("reset",)]
+    assert model.rowCount() == 0
+
+
+def test_headers_and_rows(model):
+    assert model.headerData(1, Qt.Orientation.Horizontal) == "Raw Value"
+    assert model.headerData(0, Qt.Orientation.Vertical) == "1"
+    assert model.rows()[2] == ("Flesch", 80.0, "Easy")
+    assert model.data(model.index(0, 1), Qt.ItemDataRole.EditRole) is None
@@ -0,0 +1,152 @@
+# test_text_analysis.py
+import random
+from collections import Counter
+
+import pytest
+
+nltk = pytest.importorskip("nltk")
+pytest.importorskip("textstat")
+
+
+def nltk_data(resource):
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        return False
+    return True
+
+
+# Syllables come from the CMU dictionary; it is never downloaded by the tests
+pytestmark = pytest.mark.skipif(not nltk_data("corpora/cmudict"), reason="needs the NLTK cmudict corpus")
+needs_punkt = pytest.mark.skipif(not nltk_data("tokenizers/punkt_tab"),
+                                 reason="needs the NLTK punkt_tab tokenizer")
+
+from QtOllama.utility.chat_statistics import StatisticsTotal  # noqa: E402
+from QtOllama.utility.text_analysis import (  # noqa: E402
+    ParagraphMemo,
+    TextCounts,
+    _pipeline_metrics,
+    _textstat_metrics,
+    sample_text,
+    split_paragraphs,
+)
+
+EXACT = [name for name in TextCounts._ADDITIVE if name not in ("lines", "sentences")]
+
+
+def assert_same_counts(merged, expected, names=EXACT):
+    for name in names:
+        assert getattr(merged, name) == getattr(expected, name), name
+    assert merged.word_counts == expected.word_counts
+    assert merged._difficult_forms == expected._difficult_forms
+    assert merged._unfamiliar == expected._unfamiliar
+    assert merged.difficult_words == expected.difficult_words
+
+
+def assert_no_empty_entries(counts):
+    assert all(count > 0 for count in counts.word_counts.values())
+    assert all(count > 0 for count in counts._difficult_forms.values())
+
+
+@pytest.fixture(scope="module")
+def text():
+    return sample_text(20_000, seed=3)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_the_shared_pass_matches_textstat(seed):
+    text = sample_text(3_000, seed=seed)
+    assert _pipeline_metrics(text) == _textstat_metrics(text)
+
+
+def test_paragraph_counts_add_up_to_the_counts_of_the_text(text):
+    paragraphs = split_paragraphs(text)
+    assert len(paragraphs) > 10
+    assert "".join(paragraphs) == text
+
+    merged = TextCounts()
+    for paragraph in paragraphs:
+        merged += TextCounts(paragraph)
+    assert_same_counts(merged, TextCounts(text))
+
+
+def test_unfinished_sentences_stay_with_the_next_line():
+    text = "The first line has no full stop\nso it runs on here. Then a new\n\nsentence begins.\nDone."
+    assert split_paragraphs(text) == [
+        "The first line has no full stop\nso it runs on here. Then a new\n\nsentence begins.",
+        "\nDone.",
+    ]
+    merged = TextCounts()
+    for paragraph in split_paragraphs(text):
+        merged += TextCounts(paragraph)
+    whole = TextCounts(text)
+    assert_same_counts(merged, whole)
+    assert merged._sentence_matches == whole._sentence_matches
+
+
+def test_subtracting_a_merged_text_restores_the_counts(text):
+    parts = [TextCounts(paragraph) for paragraph in split_paragraphs(text)[:12]]
+    total = TextCounts()
+    for part in parts:
+        total += part
+    for part in parts[::2]:
+        total -= part
+
+    expected = TextCounts()
+    for part in parts[1::2]:
+        expected += part
+    assert_same_counts(total, expected, TextCounts._ADDITIVE)
+    assert_no_empty_entries(total)
+
+    for part in parts[1::2]:
+        total -= part
+    assert_same_counts(total, TextCounts(), TextCounts._ADDITIVE)
+    assert not total.word_counts and not total._difficult_forms
+
+
+def test_merging_does_not_change_the_parts():
+    first, second = TextCounts("One short sentence."), TextCounts("Another extraordinary sentence.")
+    before = dict(first.word_counts)
+    total = first + second
+    assert total.words == first.words + second.words
+    assert dict(first.word_counts) == before
+
+
+@needs_punkt
+def test_paragraph_memo_matches_the_whole_text_after_edits(text):
+    memo = ParagraphMemo(StatisticsTotal())
+    rng = random.Random(0)
+    for _ in range(15):
+        position = rng.randrange(len(text))
+        edit = rng.choice(["insert", "delete", "line break"])
+        if edit == "insert":
+            text = text[:position] + rng.choice(["word ", "x. ", "\n\n", "don't "]) + text[position:]
+        elif edit == "delete":
+            text = text[:position] + text[position + rng.randint(1, 200):]
+        else:
+            text = text[:position] + rng.choice([".\n", "\n", "!\n\n"]) + text[position:]
+
+        counts = memo.update(text).counts
+        whole = TextCounts(text)
+        assert_same_counts(counts, whole, TextCounts._ADDITIVE)
+        assert_no_empty_entries(counts)
+        assert counts.text_standard() == whole.text_standard()
+        assert counts.linsear_write_formula() == whole.linsear_write_formula()
+        assert counts.flesch_reading_ease() == whole.flesch_reading_ease()
+
+
+@needs_punkt
+def test_paragraph_memo_only_analyzes_changed_paragraphs(monkeypatch):
+    memo = ParagraphMemo(StatisticsTotal())
+    lines = [f"Message number {index} is here." for index in range(20)]
+    memo.update("\n".join(lines))
+
+    analyzed = []
+    analyze = ParagraphMemo._analyze
+    monkeypatch.setattr(ParagraphMemo, "_analyze", staticmethod(lambda paragraph: analyzed.append(paragraph)
+                                                                or analyze(paragraph)))
+    total = memo.update("\n".join(lines + ["A new reply arrives."]))
+    assert analyzed == ["\nA new reply arrives."]
+    assert total.messages == 21
+    assert total.token_counts == Counter(
+        token for line in lines + ["A new reply arrives."] for token in nltk.word_tokenize(line))